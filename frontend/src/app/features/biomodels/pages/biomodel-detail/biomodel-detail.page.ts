@@ -150,7 +150,10 @@ export class BiomodelDetailPage {
   ]);
 
   biomodelResource = httpResource<Biomodel>(() => `${this.apiUrl}/biomodels/${this.id()}`);
-  passagesResource = httpResource<Passage[]>(() => `${this.apiUrl}/passages`, { defaultValue: [] });
+  passagesResource = httpResource<Passage[]>(
+    () => ({ url: `${this.apiUrl}/passages`, params: { biomodel_id: this.id() } }),
+    { defaultValue: [] },
+  );
 
   filteredPassages = computed(
     () => this.passagesResource.value()?.filter((p) => p.biomodel_id === this.id()) ?? [],
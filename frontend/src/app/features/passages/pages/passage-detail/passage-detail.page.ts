@@ -124,7 +124,10 @@ export class PassageDetailPage {
   ]);
 
   passageResource = httpResource<Passage>(() => `${this.apiUrl}/passages/${this.id()}`);
-  trialsResource = httpResource<Trial[]>(() => `${this.apiUrl}/trials`, { defaultValue: [] });
+  trialsResource = httpResource<Trial[]>(
+    () => ({ url: `${this.apiUrl}/trials`, params: { passage_id: this.id() } }),
+    { defaultValue: [] },
+  );
 
   filteredTrials = computed(
     () => this.trialsResource.value()?.filter((t) => t.passage_id === this.id()) ?? [],
@@ -130,9 +130,10 @@ export class PatientDetailPage {
 
   patientResource = httpResource<Patient>(() => `${this.apiUrl}/patients/${this.nhc()}`);
 
-  tumorsResource = httpResource<Tumor[]>(() => `${this.apiUrl}/tumors`, {
-    defaultValue: [],
-  });
+  tumorsResource = httpResource<Tumor[]>(
+    () => ({ url: `${this.apiUrl}/tumors`, params: { patient_nhc: this.nhc() } }),
+    { defaultValue: [] },
+  );
 
   filteredTumors = computed(
     () => this.tumorsResource.value()?.filter((t) => t.patient_nhc === this.nhc()) ?? [],
@@ -360,16 +360,32 @@ export class TrialDetailPage {
   pdoTrialResource = httpResource<PDOTrial>(() => `${this.apiUrl}/pdo-trials/${this.id()}`);
   lcTrialResource = httpResource<LCTrial>(() => `${this.apiUrl}/lc-trials/${this.id()}`);
 
-  // Child entity resources
-  implantsResource = httpResource<Implant[]>(() => `${this.apiUrl}/implants`, { defaultValue: [] });
-  mouseResource = httpResource<Mouse[]>(() => `${this.apiUrl}/mice`, { defaultValue: [] });
-  usageResource = httpResource<UsageRecord[]>(() => `${this.apiUrl}/usage-records`, {
-    defaultValue: [],
-  });
-  imagesResource = httpResource<TrialImage[]>(() => `${this.apiUrl}/images`, { defaultValue: [] });
-  cryoResource = httpResource<Cryopreservation[]>(() => `${this.apiUrl}/cryopreservations`, {
-    defaultValue: [],
-  });
+  // Child entity resources, filtered server-side by foreign key
+  implantsResource = httpResource<Implant[]>(
+    () => {
+      const mouseIds = this.filteredMice().map((m) => m.id);
+      return mouseIds.length
+        ? { url: `${this.apiUrl}/implants`, params: { mouse_id: mouseIds } }
+        : undefined;
+    },
+    { defaultValue: [] },
+  );
+  mouseResource = httpResource<Mouse[]>(
+    () => ({ url: `${this.apiUrl}/mice`, params: { pdx_trial_id: this.id() } }),
+    { defaultValue: [] },
+  );
+  usageResource = httpResource<UsageRecord[]>(
+    () => ({ url: `${this.apiUrl}/usage-records`, params: { trial_id: this.id() } }),
+    { defaultValue: [] },
+  );
+  imagesResource = httpResource<TrialImage[]>(
+    () => ({ url: `${this.apiUrl}/images`, params: { trial_id: this.id() } }),
+    { defaultValue: [] },
+  );
+  cryoResource = httpResource<Cryopreservation[]>(
+    () => ({ url: `${this.apiUrl}/cryopreservations`, params: { trial_id: this.id() } }),
+    { defaultValue: [] },
+  );
 
   filteredMice = computed(
     () => this.mouseResource.value()?.filter((m) => m.pdx_trial_id === this.id()) ?? [],
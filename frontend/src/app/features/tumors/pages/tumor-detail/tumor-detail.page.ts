@@ -182,10 +182,20 @@ export class TumorDetailPage {
   ]);
 
   tumorResource = httpResource<Tumor>(() => `${this.apiUrl}/tumors/${this.biobank_code()}`);
-  biomodelsResource = httpResource<Biomodel[]>(() => `${this.apiUrl}/biomodels`, {
-    defaultValue: [],
-  });
-  samplesResource = httpResource<Sample[]>(() => `${this.apiUrl}/samples`, { defaultValue: [] });
+  biomodelsResource = httpResource<Biomodel[]>(
+    () => ({
+      url: `${this.apiUrl}/biomodels`,
+      params: { tumor_biobank_code: this.biobank_code() },
+    }),
+    { defaultValue: [] },
+  );
+  samplesResource = httpResource<Sample[]>(
+    () => ({
+      url: `${this.apiUrl}/samples`,
+      params: { tumor_biobank_code: this.biobank_code() },
+    }),
+    { defaultValue: [] },
+  );
 
   filteredBiomodels = computed(
     () =>
@@ -1 +1,5 @@
 # TechConnect Backend
+import time
+
+# Reference point for the "import" phase of the startup profile.
+IMPORT_STARTED = time.perf_counter()
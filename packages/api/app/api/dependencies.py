@@ -4,8 +4,9 @@ from typing import Annotated
 
 from fastapi import Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import get_session
+from app.core.database import get_async_session, get_session
 
 SessionDep = Annotated[Session, Depends(get_session)]
-
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
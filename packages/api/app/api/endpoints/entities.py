@@ -1,131 +1,453 @@
 """Entity CRUD endpoints."""
 
-from typing import TypeVar
-
-from fastapi import APIRouter, Query
-from models import (
-    FACS,
-    Biomodel,
-    Cryopreservation,
-    Image,
-    Implant,
-    LCTrial,
-    Sample,
-    Mouse,
-    Passage,
-    Patient,
-    PDOTrial,
-    PDXTrial,
-    Trial,
-    Tumor,
-    UsageRecord,
-    Measure,
-    TrialGenomicSequencing,
-    TrialMolecularData,
-    TumorGenomicSequencing,
-    TumorMolecularData,
-)
+import inspect
+from collections.abc import Callable
+from typing import Annotated, Any, TypeVar
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlmodel import SQLModel
 
-from app.api.dependencies import SessionDep
-from app.services.crud import create_item, delete_item, get_item_or_404, list_items, update_item
+from app.api.dependencies import AsyncSessionDep, SessionDep
+from app.core.config import get_settings
+from app.services.batch import (
+    MAX_BATCH_IDS,
+    MISSING_IDS_HEADER,
+    BatchGetRequest,
+    batch_result_model,
+    parse_ids,
+)
+from app.services.bulk import NDJSON_MEDIA_TYPE, BulkResult, OnConflict, bulk_write, parse_bulk_body
+from app.services.cache import (
+    cache_response,
+    cached_response,
+    etag_response,
+    response_cache_key,
+)
+from app.services.crud import (
+    count_items,
+    count_items_async,
+    create_item,
+    create_item_async,
+    delete_item,
+    delete_item_async,
+    get_item_or_404,
+    get_item_or_404_async,
+    get_items_by_ids,
+    get_items_by_ids_async,
+    get_rows_by_ids,
+    get_rows_by_ids_async,
+    list_items,
+    list_items_async,
+    list_rows,
+    list_rows_async,
+    update_item,
+    update_item_async,
+)
+from app.services.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    ensure_format_available,
+    export_statement,
+    iter_export,
+)
+from app.services.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.registry import ENTITIES, model_info
+from app.services.serialization import RowResponse, RowsResponse, dumps
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 
 router = APIRouter()
 
 
-def build_entity_router(model: type[ModelType], *, prefix: str, tag: str) -> APIRouter:
-    """Build CRUD endpoints for a model."""
+def build_filter_dependency(model: type[SQLModel]) -> Callable[..., dict[str, list[str]]]:
+    """Build a dependency exposing one query filter per foreign-key column of a model.
+
+    Repeating a parameter (``?trial_id=a&trial_id=b``) filters with ``IN``.
+    """
+
+    def filters(**values: list[str] | None) -> dict[str, list[str]]:
+        return {name: value for name, value in values.items() if value}
+
+    filters.__signature__ = inspect.Signature(
+        [
+            inspect.Parameter(
+                name,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=Query(
+                    default=None,
+                    description=f"Filter by {name}. Repeat the parameter to match any value.",
+                ),
+                annotation=list[str] | None,
+            )
+            for name in model_info(model).filterable
+        ]
+    )
+    return filters
+
+
+def build_entity_router(
+    model: type[ModelType],
+    *,
+    prefix: str,
+    tag: str,
+    async_session: bool = False,
+    fast_serialization: bool = False,
+    cache_responses: bool = False,
+) -> APIRouter:
+    """Build CRUD endpoints for a model.
+
+    With ``async_session`` the list/get/create/update/delete handlers are coroutines
+    that use the async engine, so they run on the event loop instead of the threadpool.
+    With ``fast_serialization`` the list handler reads raw column rows and encodes them
+    with orjson instead of building and re-validating one model per row; the
+    documented response schema is unchanged. Single-item GET and PATCH responses
+    always carry the ETag of the encoded body, and the GET replies 304 to a matching
+    ``If-None-Match``. With ``cache_responses`` the GET handlers answer from the
+    response cache, dropped on every write to the model.
+    """
     model_name = model.__name__
     operation_slug = prefix.replace("-", "_")
     entity_router = APIRouter(prefix=f"/{prefix}", tags=[tag])
+    info = model_info(model)
+    pk_name = info.pk_name
+    FiltersDep = Annotated[dict[str, list[str]], Depends(build_filter_dependency(model))]
+    OffsetQuery = Annotated[int, Query(ge=0)]
+    LimitQuery = Annotated[int, Query(ge=1, le=100)]
+    CursorQuery = Annotated[
+        str | None,
+        Query(description="Opaque cursor from a previous page; replaces offset."),
+    ]
+    IncludeTotalQuery = Annotated[
+        bool,
+        Query(description=f"Add an `{TOTAL_COUNT_HEADER}` header with the filtered row count."),
+    ]
+    IdsQuery = Annotated[
+        list[str] | None,
+        Query(
+            description=(
+                f"Comma-separated or repeated primary keys (at most {MAX_BATCH_IDS}); returns "
+                f"those items in request order instead of a page."
+            )
+        ),
+    ]
+    IfMatchHeader = Annotated[
+        str | None,
+        Header(description="ETag from a previous read; the update fails with 412 if stale."),
+    ]
 
-    @entity_router.get(
+    def page_start(offset: int, cursor: str | None) -> str | None:
+        if cursor is not None and offset:
+            raise HTTPException(status_code=422, detail="Use either offset or cursor, not both")
+        return decode_cursor(cursor) if cursor is not None else None
+
+    def page_headers(items: list[Any], limit: int, total: int | None) -> dict[str, str]:
+        headers = {}
+        if items and len(items) == limit:
+            last = items[-1]
+            last_key = last[pk_name] if fast_serialization else getattr(last, pk_name)
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(last_key)
+        if total is not None:
+            headers[TOTAL_COUNT_HEADER] = str(total)
+        return headers
+
+    def updated_response(row: dict[str, Any]) -> Any:
+        # Always send the encoded row so the ETag is the hash of the bytes sent.
+        return RowResponse(row)
+
+    def cache_lookup(request: Request) -> tuple[str | None, Response | None]:
+        if not cache_responses:
+            return None, None
+        key = response_cache_key(model, request)
+        return key, cached_response(request, key)
+
+    def item_response(item: Any, request: Request, key: str | None) -> Response:
+        body = dumps(info.row(item))
+        if key is not None:
+            return cache_response(request, key, body)
+        return etag_response(request, body)
+
+    def missing_headers(missing: list[str]) -> dict[str, str]:
+        return {MISSING_IDS_HEADER: ",".join(missing)} if missing else {}
+
+    def batch_response(items: list[Any], missing: list[str]) -> Any:
+        if fast_serialization:
+            return Response(
+                dumps({"items": items, "missing": missing}), media_type="application/json"
+            )
+        return {"items": items, "missing": missing}
+
+    def rows_response(
+        items: list[Any],
+        request: Request,
+        response: Response,
+        key: str | None,
+        headers: dict[str, str],
+    ) -> Any:
+        if key is not None:
+            rows = items if fast_serialization else [info.row(item) for item in items]
+            return cache_response(request, key, dumps(rows), headers)
+        if fast_serialization:
+            return RowsResponse(items, headers=headers)
+        response.headers.update(headers)
+        return items
+
+    if async_session:
+
+        async def read_items(
+            session: AsyncSessionDep,
+            filters: FiltersDep,
+            request: Request,
+            response: Response,
+            offset: OffsetQuery = 0,
+            limit: LimitQuery = 100,
+            cursor: CursorQuery = None,
+            include_total: IncludeTotalQuery = False,
+            ids: IdsQuery = None,
+        ):
+            """List all items."""
+            after = page_start(offset, cursor)
+            key, cached = cache_lookup(request)
+            if cached is not None:
+                return cached
+            if ids:
+                fetch_ids = get_rows_by_ids_async if fast_serialization else get_items_by_ids_async
+                items, missing = await fetch_ids(session, model, parse_ids(ids), filters=filters)
+                return rows_response(items, request, response, key, missing_headers(missing))
+            fetch = list_rows_async if fast_serialization else list_items_async
+            items = await fetch(
+                session, model, offset=offset, limit=limit, filters=filters, after=after
+            )
+            total = (
+                await count_items_async(session, model, filters=filters) if include_total else None
+            )
+            headers = page_headers(items, limit, total)
+            return rows_response(items, request, response, key, headers)
+
+        async def read_item(item_id: str, session: AsyncSessionDep, request: Request):
+            """Get an item by ID."""
+            key, cached = cache_lookup(request)
+            if cached is not None:
+                return cached
+            item = await get_item_or_404_async(session, model, item_id)
+            return item_response(item, request, key)
+
+        async def batch_get_entities(batch: BatchGetRequest, session: AsyncSessionDep):
+            """Get many items by ID."""
+            fetch_ids = get_rows_by_ids_async if fast_serialization else get_items_by_ids_async
+            return batch_response(*await fetch_ids(session, model, batch.ids))
+
+        async def create_entity(item: model, session: AsyncSessionDep):
+            """Create a new item."""
+            return await create_item_async(session, model, item)
+
+        async def update_entity(
+            item_id: str,
+            item: model,
+            session: AsyncSessionDep,
+            if_match: IfMatchHeader = None,
+        ):
+            """Update an existing item."""
+            row = await update_item_async(session, model, item_id, item, if_match=if_match)
+            return updated_response(row)
+
+        async def delete_entity(item_id: str, session: AsyncSessionDep):
+            """Delete an item."""
+            return await delete_item_async(session, model, item_id)
+
+    else:
+
+        def read_items(
+            session: SessionDep,
+            filters: FiltersDep,
+            request: Request,
+            response: Response,
+            offset: OffsetQuery = 0,
+            limit: LimitQuery = 100,
+            cursor: CursorQuery = None,
+            include_total: IncludeTotalQuery = False,
+            ids: IdsQuery = None,
+        ):
+            """List all items."""
+            after = page_start(offset, cursor)
+            key, cached = cache_lookup(request)
+            if cached is not None:
+                return cached
+            if ids:
+                fetch_ids = get_rows_by_ids if fast_serialization else get_items_by_ids
+                items, missing = fetch_ids(session, model, parse_ids(ids), filters=filters)
+                return rows_response(items, request, response, key, missing_headers(missing))
+            fetch = list_rows if fast_serialization else list_items
+            items = fetch(session, model, offset=offset, limit=limit, filters=filters, after=after)
+            total = count_items(session, model, filters=filters) if include_total else None
+            headers = page_headers(items, limit, total)
+            return rows_response(items, request, response, key, headers)
+
+        def read_item(item_id: str, session: SessionDep, request: Request):
+            """Get an item by ID."""
+            key, cached = cache_lookup(request)
+            if cached is not None:
+                return cached
+            item = get_item_or_404(session, model, item_id)
+            return item_response(item, request, key)
+
+        def batch_get_entities(batch: BatchGetRequest, session: SessionDep):
+            """Get many items by ID."""
+            fetch_ids = get_rows_by_ids if fast_serialization else get_items_by_ids
+            return batch_response(*fetch_ids(session, model, batch.ids))
+
+        def create_entity(item: model, session: SessionDep):
+            """Create a new item."""
+            return create_item(session, model, item)
+
+        def update_entity(
+            item_id: str,
+            item: model,
+            session: SessionDep,
+            if_match: IfMatchHeader = None,
+        ):
+            """Update an existing item."""
+            row = update_item(session, model, item_id, item, if_match=if_match)
+            return updated_response(row)
+
+        def delete_entity(item_id: str, session: SessionDep):
+            """Delete an item."""
+            return delete_item(session, model, item_id)
+
+    entity_router.get(
         "",
         response_model=list[model],
         operation_id=f"get_{operation_slug}",
         summary=f"List {tag}",
-        description=f"Retrieve a list of {tag} with pagination support.",
-    )
-    def read_items(
-        session: SessionDep,
-        offset: int = 0,
-        limit: int = Query(default=100, ge=1, le=100),
-    ):
-        """List all items."""
-        return list_items(session, model, offset=offset, limit=limit)
+        description=(
+            f"Retrieve a list of {tag} ordered by primary key, with offset or cursor "
+            f"pagination and foreign-key filter support. Full pages carry an "
+            f"`{NEXT_CURSOR_HEADER}` header to pass back as `cursor` for the next page; "
+            f"`include_total=true` adds a cached `{TOTAL_COUNT_HEADER}` header. With `ids` the "
+            f"listed records are returned in request order and unknown ids are named in an "
+            f"`{MISSING_IDS_HEADER}` header."
+        ),
+    )(read_items)
 
     @entity_router.get(
+        "/export",
+        operation_id=f"export_{operation_slug}",
+        summary=f"Export {tag}",
+        description=(
+            f"Stream every {model_name} record matching the foreign-key filters as NDJSON, "
+            f"CSV or Parquet. Rows are read through a server-side cursor, so memory use "
+            f"does not grow with table size."
+        ),
+        response_class=StreamingResponse,
+        responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+    )
+    def export_entities(filters: FiltersDep, format: ExportFormat = "ndjson"):
+        """Stream all matching items."""
+        ensure_format_available(format)
+        statement = export_statement(model, filters)
+        return StreamingResponse(
+            iter_export(model, statement, format),
+            media_type=MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{prefix}.{format}"'},
+        )
+
+    entity_router.get(
         "/{item_id}",
         response_model=model,
         operation_id=f"get_{operation_slug}_by_id",
         summary=f"Get {model_name}",
-        description=f"Retrieve a specific {model_name} by its ID.",
-    )
-    def read_item(item_id: str, session: SessionDep):
-        """Get an item by ID."""
-        return get_item_or_404(session, model, item_id)
+        description=f"Retrieve a specific {model_name} by its ID, with its `ETag`.",
+    )(read_item)
 
-    @entity_router.post(
+    entity_router.post(
         "",
         response_model=model,
         operation_id=f"create_{operation_slug}",
         summary=f"Create {model_name}",
         description=f"Create a new {model_name} record.",
+    )(create_entity)
+
+    entity_router.post(
+        "/batch-get",
+        response_model=batch_result_model(model),
+        operation_id=f"batch_get_{operation_slug}",
+        summary=f"Batch Get {tag}",
+        description=(
+            f"Fetch up to {MAX_BATCH_IDS} {model_name} records by ID with one query. Found "
+            f"records come back in request order and unknown ids are listed in `missing`."
+        ),
+    )(batch_get_entities)
+
+    @entity_router.post(
+        "/bulk",
+        response_model=BulkResult,
+        operation_id=f"bulk_create_{operation_slug}",
+        summary=f"Bulk Create {tag}",
+        description=(
+            f"Create many {model_name} records from a JSON array or NDJSON body in one "
+            f"transaction. Invalid rows are reported by index without aborting the batch; "
+            f"`on_conflict` selects whether duplicate keys fail, update or are skipped."
+        ),
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "array",
+                            "items": {"$ref": f"#/components/schemas/{model_name}"},
+                        }
+                    },
+                    NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+                },
+            }
+        },
     )
-    def create_entity(item: model, session: SessionDep):
-        """Create a new item."""
-        return create_item(session, model, item)
+    async def bulk_create_entities(
+        request: Request,
+        session: SessionDep,
+        on_conflict: OnConflict = "error",
+    ):
+        """Create or upsert many items."""
+        rows = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+        return await run_in_threadpool(bulk_write, session, model, rows, on_conflict=on_conflict)
 
-    @entity_router.patch(
+    entity_router.patch(
         "/{item_id}",
         response_model=model,
         operation_id=f"update_{operation_slug}",
         summary=f"Update {model_name}",
-        description=f"Update an existing {model_name} record by its ID.",
-    )
-    def update_entity(item_id: str, item: model, session: SessionDep):
-        """Update an existing item."""
-        return update_item(session, model, item_id, item)
+        description=(
+            f"Update an existing {model_name} record by its ID. Only the fields sent are "
+            f"validated and written, in one `UPDATE ... RETURNING` round trip. Send the "
+            f"`ETag` of a previous read as `If-Match` to reject concurrent edits with 412."
+        ),
+    )(update_entity)
 
-    @entity_router.delete(
+    entity_router.delete(
         "/{item_id}",
         operation_id=f"delete_{operation_slug}",
         summary=f"Delete {model_name}",
         description=f"Remove a specific {model_name} record by its ID.",
-    )
-    def delete_entity(item_id: str, session: SessionDep):
-        """Delete an item."""
-        return delete_item(session, model, item_id)
+    )(delete_entity)
 
     return entity_router
 
 
-ENTITY_ROUTERS: tuple[tuple[type[SQLModel], str, str], ...] = (
-    (Patient, "patients", "Patients"),
-    (Tumor, "tumors", "Tumors"),
-    (Sample, "samples", "Samples"),
-    (Biomodel, "biomodels", "Biomodels"),
-    (Passage, "passages", "Passages"),
-    (Trial, "trials", "Trials"),
-    (PDXTrial, "pdx-trials", "PDX Trials"),
-    (PDOTrial, "pdo-trials", "PDO Trials"),
-    (LCTrial, "lc-trials", "LC Trials"),
-    (Implant, "implants", "Implants"),
-    (Measure, "measures", "Measures"),
-    (Mouse, "mice", "Mice"),
-    (FACS, "facs", "FACS"),
-    (UsageRecord, "usage-records", "Usage Records"),
-    (Image, "images", "Images"),
-    (Cryopreservation, "cryopreservations", "Cryopreservations"),
-    (TrialGenomicSequencing, "trial-genomic-sequencings", "Trial Genomic Sequencings"),
-    (TrialMolecularData, "trial-molecular-data", "Trial Molecular Data"),
-    (TumorGenomicSequencing, "tumor-genomic-sequencings", "Tumor Genomic Sequencings"),
-    (TumorMolecularData, "tumor-molecular-data", "Tumor Molecular Data"),
-)
-
-for entity_model, entity_prefix, entity_tag in ENTITY_ROUTERS:
+for entity_model, entity_prefix, entity_tag in ENTITIES:
     router.include_router(
-        build_entity_router(entity_model, prefix=entity_prefix, tag=entity_tag),
+        build_entity_router(
+            entity_model,
+            prefix=entity_prefix,
+            tag=entity_tag,
+            async_session=get_settings().async_database,
+            fast_serialization=get_settings().fast_serialization,
+            cache_responses=get_settings().response_cache_size > 0,
+        ),
     )
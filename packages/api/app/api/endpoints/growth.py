@@ -0,0 +1,78 @@
+"""Tumor growth series endpoints."""
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import SessionDep
+from app.services.growth import (
+    DEFAULT_LATENCY_THRESHOLD,
+    Aggregate,
+    GrowthSeries,
+    LatencyEstimate,
+    estimate_latency,
+    growth_series,
+    growth_statement,
+)
+from app.services.serialization import RowsResponse
+
+router = APIRouter(prefix="/growth", tags=["Growth"])
+
+
+@router.get(
+    "",
+    response_model=list[GrowthSeries],
+    operation_id="get_growth_series",
+    summary="Get Growth Series",
+    description=(
+        "Return the measures of every implant selected by implant, mouse or PDX trial, "
+        "grouped per implant and sorted by date, with a log-linear doubling time and a "
+        "latency estimate. `aggregate=week` averages each series per week since its "
+        "first measure and `max_points` downsamples long series evenly."
+    ),
+)
+def read_growth_series(
+    session: SessionDep,
+    implant_id: list[str] | None = Query(default=None, description="Implants to include."),
+    mouse_id: list[str] | None = Query(default=None, description="Include all their implants."),
+    pdx_trial_id: list[str] | None = Query(
+        default=None, description="Include the implants of all their mice."
+    ),
+    aggregate: Aggregate = "none",
+    max_points: int | None = Query(default=None, ge=2, description="Points kept per series."),
+    latency_threshold: float = Query(
+        default=DEFAULT_LATENCY_THRESHOLD,
+        gt=0,
+        description="Measure value that marks the end of the latency period.",
+    ),
+):
+    """Compute growth series for the selected implants."""
+    statement = growth_statement(
+        implant_ids=implant_id or (), mouse_ids=mouse_id or (), pdx_trial_ids=pdx_trial_id or ()
+    )
+    series = growth_series(
+        session,
+        statement,
+        aggregate=aggregate,
+        max_points=max_points,
+        latency_threshold=latency_threshold,
+    )
+    return RowsResponse(series)
+
+
+@router.post(
+    "/pdx-trials/{pdx_trial_id}/latency",
+    response_model=LatencyEstimate,
+    operation_id="estimate_pdx_trial_latency",
+    summary="Estimate PDX Trial Latency",
+    description=(
+        "Estimate the latency of a PDX trial as the shortest time, in weeks from the "
+        "trial creation date, for one of its implants to reach `threshold`, and store it "
+        "in `latency_weeks`. Nothing is stored while no implant has reached it."
+    ),
+)
+def update_pdx_trial_latency(
+    pdx_trial_id: str,
+    session: SessionDep,
+    threshold: float = Query(default=DEFAULT_LATENCY_THRESHOLD, gt=0),
+):
+    """Estimate and persist the latency of one PDX trial."""
+    return estimate_latency(session, pdx_trial_id, threshold=threshold)
@@ -1,6 +1,8 @@
 """System health endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+
+from app.core.database import get_async_engine, get_engine, pool_status
 
 router = APIRouter(tags=["System"])
 
@@ -10,3 +12,17 @@ def health():
     """Health check endpoint for monitoring."""
     return {"status": "healthy"}
 
+
+@router.get("/health/db-pool", summary="Database Pool Metrics")
+def db_pool():
+    """Report live connection pool usage for the sync and (if started) async engines."""
+    pools = {"sync": pool_status(get_engine())}
+    if get_async_engine.cache_info().currsize:
+        pools["async"] = pool_status(get_async_engine().sync_engine)
+    return pools
+
+
+@router.get("/health/startup", summary="Startup Profile")
+def startup_profile(request: Request):
+    """Report the milliseconds this worker spent in each startup phase."""
+    return request.app.state.startup.phases
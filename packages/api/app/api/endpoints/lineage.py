@@ -0,0 +1,35 @@
+"""Lineage endpoints."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import SessionDep
+from app.services.lineage import DEFAULT_LINEAGE_DEPTH, Direction, Lineage, lineage
+
+router = APIRouter(prefix="/lineage", tags=["Lineage"])
+
+
+@router.get(
+    "/{root}/{item_id}/{direction}",
+    response_model=Lineage,
+    operation_id="get_lineage",
+    summary="Get Lineage",
+    description=(
+        "Return every ancestor (up to the tumor and patient) or every descendant "
+        "(biomodels, passages, trials and mice across derived generations) of an entity, "
+        "each with its distance in hops, resolved with one recursive query. `depth` is the "
+        "distance to the farthest node: for ancestors, the generation depth of the entity."
+    ),
+)
+def read_lineage(
+    root: Literal["patients", "tumors", "biomodels", "passages", "trials", "mice"],
+    item_id: str,
+    direction: Direction,
+    session: SessionDep,
+    max_depth: int = Query(
+        default=DEFAULT_LINEAGE_DEPTH, ge=1, le=256, description="Hops to follow at most."
+    ),
+):
+    """Walk the lineage graph from one entity."""
+    return lineage(session, root, item_id, direction, max_depth=max_depth)
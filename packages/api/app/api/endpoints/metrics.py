@@ -0,0 +1,13 @@
+"""Prometheus metrics endpoint, mounted when instrumentation is enabled."""
+
+from fastapi import APIRouter, Request, Response
+
+from app.services.metrics import PROMETHEUS_MEDIA_TYPE
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/metrics", summary="Request Metrics", response_class=Response)
+def metrics(request: Request):
+    """Per-route latency and query histograms in the Prometheus text format."""
+    return Response(request.app.state.metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
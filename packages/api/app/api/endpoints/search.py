@@ -0,0 +1,31 @@
+"""Full-text search endpoint."""
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import SessionDep
+from app.services.search import DEFAULT_SEARCH_LIMIT, SearchEntity, SearchHit, search
+from app.services.serialization import RowsResponse
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get(
+    "",
+    response_model=list[SearchHit],
+    operation_id="search_entities",
+    summary="Search Entities",
+    description=(
+        "Search the free-text fields of tumors, biomodels, passages, trials and their "
+        "genomic and molecular data. Every word of `q` must match, the last one as a "
+        "prefix; results are ranked by relevance and carry a snippet with the matches "
+        "wrapped in `<mark>`."
+    ),
+)
+def search_entities(
+    session: SessionDep,
+    q: str = Query(min_length=1, max_length=200, description="Words to search for."),
+    entity: list[SearchEntity] | None = Query(default=None, description="Restrict to entities."),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=100),
+):
+    """Rank the search documents matching a query."""
+    return RowsResponse(search(session, q, entities=entity or (), limit=limit))
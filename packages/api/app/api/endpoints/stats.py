@@ -0,0 +1,29 @@
+"""Dashboard statistics endpoint."""
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import SessionDep
+from app.services.serialization import RowResponse
+from app.services.stats import METRICS, StatsMetric, read_stats
+
+router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+
+@router.get(
+    "",
+    response_model=dict[str, StatsMetric],
+    operation_id="get_stats",
+    summary="Get Statistics",
+    description=(
+        "Return grouped dashboard statistics from rollup tables, so the cost depends on "
+        "the number of groups, not rows. A rollup is recomputed on the first read after "
+        "a write to one of its tables. Available metrics: "
+        + ", ".join(f"`{name}` ({metric.description})" for name, metric in METRICS.items())
+    ),
+)
+def read_statistics(
+    session: SessionDep,
+    metric: list[str] | None = Query(default=None, description="Metrics to return (all)."),
+):
+    """Read the requested dashboard metrics."""
+    return RowResponse(read_stats(session, metric or ()))
@@ -0,0 +1,52 @@
+"""Hierarchical tree endpoints."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import SessionDep
+from app.services.serialization import RowResponse
+from app.services.tree import (
+    MAX_TREE_GENERATIONS,
+    MAX_TREE_RELATIONSHIPS,
+    TREE_ROOTS,
+    build_tree_plan,
+    load_tree,
+    tree_document,
+)
+
+router = APIRouter(prefix="/tree", tags=["Tree"])
+
+
+@router.get(
+    "/{root}/{item_id}",
+    operation_id="get_tree",
+    summary="Get Hierarchical Tree",
+    description=(
+        "Return a patient, passage or mouse with its descendants as one nested JSON "
+        "document. Each relationship level is loaded with a single batched query, so "
+        "the query count depends on the requested branches and depth, not on fan-out. "
+        f"Derived biomodels and passages are followed for {MAX_TREE_GENERATIONS} "
+        f"generations; plans loading more than {MAX_TREE_RELATIONSHIPS} relationships "
+        "are rejected."
+    ),
+    responses={200: {"content": {"application/json": {}}}},
+)
+def read_tree(
+    root: Literal["patients", "passages", "mice"],
+    item_id: str,
+    session: SessionDep,
+    depth: int = Query(default=8, ge=0, le=16, description="Relationship levels to descend."),
+    include: list[str] | None = Query(
+        default=None, description="Only follow these relationships (e.g. tumors, trials)."
+    ),
+    exclude: list[str] | None = Query(
+        default=None, description="Never follow these relationships (e.g. measures)."
+    ),
+):
+    """Return the subtree below one entity."""
+    plan = build_tree_plan(
+        TREE_ROOTS[root], depth=depth, include=include or (), exclude=exclude or ()
+    )
+    item = load_tree(session, plan, item_id)
+    return RowResponse(tree_document(item, plan))
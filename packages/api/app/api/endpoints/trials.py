@@ -0,0 +1,101 @@
+"""Trial detail endpoints: trials with their subtype in one request."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from models import Trial
+
+from app.api.dependencies import SessionDep
+from app.api.endpoints.entities import build_filter_dependency
+from app.services.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.services.serialization import RowResponse, RowsResponse
+from app.services.trials import (
+    TrialDetail,
+    TrialDetailCreate,
+    TrialGraph,
+    TrialGraphCreate,
+    TrialType,
+    create_trial_detail,
+    create_trial_graph,
+    get_trial_detail,
+    list_trial_details,
+)
+
+router = APIRouter(prefix="/trial-details", tags=["Trial Details"])
+
+TrialFiltersDep = Annotated[dict[str, list[str]], Depends(build_filter_dependency(Trial))]
+
+
+@router.get(
+    "",
+    response_model=list[TrialDetail],
+    operation_id="list_trial_details",
+    summary="List Trial Details",
+    description=(
+        "List trials with their PDX, PDO or LC subtype row (and the PDX mouse or LC FACS "
+        "row) nested, read with one joined query. `type` keeps only trials of one subtype. "
+        f"Pages are ordered by id; follow `{NEXT_CURSOR_HEADER}` for the next one."
+    ),
+)
+def read_trial_details(
+    session: SessionDep,
+    filters: TrialFiltersDep,
+    type: TrialType | None = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Cursor from a previous page."),
+):
+    """List trials with their subtypes."""
+    if cursor is not None and offset:
+        raise HTTPException(status_code=422, detail="Use either offset or cursor, not both")
+    after = decode_cursor(cursor) if cursor is not None else None
+    items = list_trial_details(
+        session, limit=limit, offset=offset, filters=filters, trial_type=type, after=after
+    )
+    headers = {}
+    if len(items) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1]["id"])
+    return RowsResponse(items, headers=headers)
+
+
+@router.get(
+    "/{item_id}",
+    response_model=TrialDetail,
+    operation_id="get_trial_detail",
+    summary="Get Trial Detail",
+)
+def read_trial_detail(item_id: str, session: SessionDep):
+    """Get one trial with its subtype."""
+    return RowResponse(get_trial_detail(session, item_id))
+
+
+@router.post(
+    "",
+    response_model=TrialDetail,
+    operation_id="create_trial_detail",
+    summary="Create Trial Detail",
+    description=(
+        "Create a trial and, optionally, one of `pdx_trial`, `pdo_trial` or `lc_trial` "
+        "in a single transaction; the subtype shares the trial id."
+    ),
+)
+def create_trial(item: TrialDetailCreate, session: SessionDep):
+    """Create a trial together with its subtype."""
+    return RowResponse(create_trial_detail(session, item))
+
+
+@router.post(
+    "/graph",
+    response_model=TrialGraph,
+    operation_id="create_trial_graph",
+    summary="Create Trial Graph",
+    description=(
+        "Create a trial with its subtype, PDX mouse, implants and measures, LC FACS row, "
+        "images, cryopreservations and usage records from one nested document, in a single "
+        "transaction. Ids may be given by the client or are generated; foreign keys to the "
+        "enclosing row are filled in. Returns the created graph."
+    ),
+)
+def create_graph(item: TrialGraphCreate, session: SessionDep):
+    """Create a trial together with every row nested under it."""
+    return RowResponse(create_trial_graph(session, item))
@@ -3,8 +3,20 @@
 from fastapi import APIRouter
 
 from app.api.endpoints.entities import router as entities_router
+from app.api.endpoints.growth import router as growth_router
 from app.api.endpoints.health import router as health_router
+from app.api.endpoints.lineage import router as lineage_router
+from app.api.endpoints.search import router as search_router
+from app.api.endpoints.stats import router as stats_router
+from app.api.endpoints.tree import router as tree_router
+from app.api.endpoints.trials import router as trials_router
 
 api_router = APIRouter()
 api_router.include_router(health_router)
 api_router.include_router(entities_router)
+api_router.include_router(trials_router)
+api_router.include_router(tree_router)
+api_router.include_router(growth_router)
+api_router.include_router(lineage_router)
+api_router.include_router(search_router)
+api_router.include_router(stats_router)
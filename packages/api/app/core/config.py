@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 
+from database import JournalMode, SynchronousMode
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,6 +20,67 @@ class Settings(BaseSettings):
         default="sqlite:///techconnect.db",
         validation_alias="DATABASE_URL",
     )
+    async_database: bool = Field(
+        default=False,
+        description="Serve the generated CRUD routes with the async engine and session.",
+    )
+    fast_serialization: bool = Field(
+        default=True,
+        description="Serve list endpoints from raw column rows encoded with orjson.",
+    )
+    count_cache_size: int = Field(
+        default=1024, ge=0, description="Cached list counts kept (0 disables the cache)."
+    )
+    count_cache_ttl: float = Field(default=30.0, gt=0, description="Seconds a count stays cached.")
+    response_cache_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Cached GET responses kept (0 disables the cache). Writes are only seen by the "
+            "process that made them, so enable it for a single API process only."
+        ),
+    )
+    response_cache_ttl: float = Field(
+        default=60.0, gt=0, description="Seconds a GET response stays cached."
+    )
+    lineage_cache_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Cached lineage walks kept (0 disables the cache). Writes are only seen by the "
+            "process that made them, so enable it for a single API process only."
+        ),
+    )
+    lineage_cache_ttl: float = Field(
+        default=60.0, gt=0, description="Seconds a lineage walk stays cached."
+    )
+    metrics_enabled: bool = Field(
+        default=False,
+        description="Record per-route timings and query counts, served at /api/metrics.",
+    )
+    n_plus_one_threshold: int = Field(
+        default=10, ge=2, description="Flag requests that run one statement this many times."
+    )
+    openapi_cache_dir: str | None = Field(
+        default=None,
+        description="Directory where the generated OpenAPI document is cached across restarts.",
+    )
+    db_pool_size: int = Field(default=5, ge=1, description="Persistent connections per engine.")
+    db_max_overflow: int = Field(default=10, ge=0, description="Extra connections under load.")
+    db_pool_timeout: float = Field(
+        default=30.0, gt=0, description="Seconds to wait for a connection."
+    )
+    db_pool_recycle: int = Field(
+        default=1800, description="Recycle connections older than this many seconds (-1 disables)."
+    )
+    db_pool_pre_ping: bool = Field(default=True, description="Test connections on checkout.")
+    db_statement_timeout_ms: int | None = Field(
+        default=None, ge=1, description="Server-side statement timeout (PostgreSQL, MySQL)."
+    )
+    sqlite_journal_mode: JournalMode = "WAL"
+    sqlite_synchronous: SynchronousMode = "NORMAL"
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
     api_prefix: str = "/api"
     cors_origins: tuple[str, ...] = ("http://localhost:5173", "http://localhost:3000")
 
@@ -27,4 +89,3 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     """Return a cached settings object for the process lifetime."""
     return Settings()
-
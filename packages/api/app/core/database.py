@@ -1,32 +1,164 @@
 """Database engine and session dependencies."""
 
+import hashlib
 import importlib
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from functools import lru_cache
+from typing import Any
 
-from sqlmodel import SQLModel, Session, create_engine
+from database import EngineTuning, configure_sqlite_pragmas, get_engine_options
+from sqlalchemy import Column, Engine, MetaData, String, Table, delete, insert, select
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.services.search import ensure_search_index
+from app.services.stats import ensure_stats_tables
 
 # Import models for SQLModel metadata registration.
 importlib.import_module("models")
 
+# Async DBAPI driver used for each backend when DATABASE_URL names a sync one.
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+# One-row table holding the fingerprint of the schema the tables were created from.
+# Kept out of SQLModel.metadata so it never appears in exports or migrations.
+SCHEMA_VERSION_TABLE = Table(
+    "techconnect_schema_version",
+    MetaData(),
+    Column("fingerprint", String(64), primary_key=True),
+)
+
 
 @lru_cache
 def get_engine():
     """Create a single shared engine for the process lifetime."""
     settings = get_settings()
-    connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-    return create_engine(settings.database_url, connect_args=connect_args)
+    tuning = engine_tuning(settings)
+    engine = create_engine(
+        settings.database_url, **get_engine_options(settings.database_url, tuning)
+    )
+    configure_sqlite_pragmas(engine, tuning)
+    return engine
+
+
+def engine_tuning(settings: Settings) -> EngineTuning:
+    """Map the DB_* and SQLITE_* settings onto the schemas package's engine tuning."""
+    return EngineTuning(
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        statement_timeout_ms=settings.db_statement_timeout_ms,
+        sqlite_journal_mode=settings.sqlite_journal_mode,
+        sqlite_synchronous=settings.sqlite_synchronous,
+        sqlite_busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+        sqlite_mmap_size=settings.sqlite_mmap_size,
+    )
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """Report live connection pool metrics for an engine."""
+    pool = engine.pool
+    status: dict[str, Any] = {"pool": type(pool).__name__}
+    for metric in ("size", "checkedin", "checkedout", "overflow"):
+        reader = getattr(pool, metric, None)
+        if callable(reader):
+            status[metric] = reader()
+    return status
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Rewrite a database URL to use the async driver for its backend."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    if url.get_driver_name() == ASYNC_DRIVERS[backend]:
+        return database_url
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Create a single shared async engine for the process lifetime."""
+    settings = get_settings()
+    database_url = get_async_database_url(settings.database_url)
+    tuning = engine_tuning(settings)
+    engine = create_async_engine(database_url, **get_engine_options(database_url, tuning))
+    configure_sqlite_pragmas(engine.sync_engine, tuning)
+    return engine
+
+
+@lru_cache
+def schema_fingerprint() -> str:
+    """Hash every table, column, foreign key and index of the SQLModel metadata."""
+    lines = []
+    for table in SQLModel.metadata.sorted_tables:
+        lines.append(f"table {table.name}")
+        lines += [
+            f"column {column.name} {column.type!r} nullable={column.nullable} "
+            f"pk={column.primary_key} unique={column.unique} "
+            f"fk={sorted(key.target_fullname for key in column.foreign_keys)}"
+            for column in table.columns
+        ]
+        lines += [
+            f"index {index.name} {[column.name for column in index.columns]} unique={index.unique}"
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        ]
+    return hashlib.blake2b("\n".join(lines).encode(), digest_size=16).hexdigest()
 
 
-def create_db_and_tables() -> None:
-    """Create all SQLModel tables."""
-    SQLModel.metadata.create_all(get_engine())
+def stored_schema_fingerprint(connection: Connection) -> str | None:
+    """Return the fingerprint recorded by the last ``create_db_and_tables`` run."""
+    try:
+        return connection.execute(select(SCHEMA_VERSION_TABLE.c.fingerprint)).scalar()
+    except DBAPIError:
+        return None
 
 
-def get_session() -> Generator[Session, None, None]:
+def create_db_and_tables() -> bool:
+    """Create all SQLModel tables unless the schema version marker is current.
+
+    Checking the marker is a single query, where ``create_all`` inspects every
+    table; workers of an already migrated database therefore boot without DDL.
+    The full-text search index is created (and filled) when it is missing, and so
+    are the statistics rollup tables.
+    Returns whether ``create_all`` ran. Delete the marker row to force it.
+    """
+    engine = get_engine()
+    fingerprint = schema_fingerprint()
+    with engine.connect() as connection:
+        current = stored_schema_fingerprint(connection) == fingerprint
+    if not current:
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as connection:
+            SCHEMA_VERSION_TABLE.create(connection, checkfirst=True)
+            connection.execute(delete(SCHEMA_VERSION_TABLE))
+            connection.execute(insert(SCHEMA_VERSION_TABLE).values(fingerprint=fingerprint))
+    ensure_search_index(engine)
+    ensure_stats_tables(engine)
+    return not current
+
+
+def get_session() -> Generator[Session]:
     """Yield a per-request database session."""
     with Session(get_engine()) as session:
         yield session
 
+
+async def get_async_session() -> AsyncGenerator[AsyncSession]:
+    """Yield a per-request async database session."""
+    async with AsyncSession(get_async_engine()) as session:
+        yield session
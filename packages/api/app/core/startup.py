@@ -0,0 +1,88 @@
+"""Worker startup profiling and the cached OpenAPI document."""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+
+from app.core.database import schema_fingerprint
+
+
+class StartupProfile:
+    """Milliseconds spent in each named startup phase, in the order they ran."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, started: float) -> None:
+        self.phases[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+
+def openapi_cache_key(app: FastAPI) -> str:
+    """Hash what the OpenAPI document is generated from.
+
+    That is the source of every loaded ``app`` and ``models`` module, the schema
+    fingerprint and the FastAPI/Pydantic versions, so any deploy that could change
+    the document gets a new key.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for package in ("fastapi", "pydantic"):
+        digest.update(importlib.metadata.version(package).encode())
+    digest.update(f"{app.title} {app.version} {schema_fingerprint()}".encode())
+    for name in sorted(sys.modules):
+        path = getattr(sys.modules[name], "__file__", None)
+        if path and (name == "app" or name.startswith(("app.", "models"))):
+            digest.update(name.encode())
+            digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def install_openapi_cache(app: FastAPI, cache_dir: str | None, profile: StartupProfile) -> None:
+    """Build the OpenAPI document on first use only, reusing a copy cached on disk.
+
+    FastAPI generates the document for every worker on its first ``/openapi.json``
+    or ``/docs`` request. With ``cache_dir`` set, the first worker writes it to
+    ``openapi-<key>.json`` and every later worker or restart reads it back.
+    """
+    generate = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+        with profile.phase("openapi"):
+            path = Path(cache_dir) / f"openapi-{openapi_cache_key(app)}.json" if cache_dir else None
+            if path is not None and path.exists():
+                app.openapi_schema = json.loads(path.read_bytes())
+            else:
+                app.openapi_schema = generate()
+                if path is not None:
+                    _write_atomically(path, json.dumps(app.openapi_schema).encode())
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def _write_atomically(path: Path, content: bytes) -> None:
+    """Write through a temporary file so concurrent workers never read half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(handle, "wb") as file:
+        file.write(content)
+    os.replace(temporary, path)
@@ -0,0 +1,345 @@
+"""Load historical biobank exports (CSV, Excel, Parquet) into the database.
+
+Usage:
+    import-data patients.csv tumor.xlsx measures.parquet
+    import-data passage=legacy_passages.csv --on-conflict update
+
+Each file is matched to a table by its name (table name such as ``measure`` or API
+prefix such as ``measures``) unless given as ``TABLE=PATH``. Files are loaded in
+foreign-key order whatever the order on the command line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Annotated, Any
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Column, bindparam, select, update
+from sqlmodel import Session, SQLModel
+
+from app.core.database import create_db_and_tables, get_engine
+from app.services.bulk import BulkRowError, OnConflict, insert_statement, write_rows
+from app.services.cache import invalidate_model
+from app.services.registry import ENTITIES, ModelInfo, model_info
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+MODELS_BY_NAME: dict[str, type[SQLModel]] = {
+    name: entity_model
+    for entity_model, prefix, _ in ENTITIES
+    for name in (entity_model.__tablename__, prefix)
+}
+
+
+@dataclass
+class TableReport:
+    table: str
+    read: int = 0
+    written: int = 0
+    seconds: float = 0.0
+    errors: list[BulkRowError] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+
+def read_chunks(path: Path, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[list[dict[str, Any]]]:
+    """Yield the rows of a CSV, Excel or Parquet file as lists of dicts."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as handle:
+            yield from _batched(csv.DictReader(handle), chunk_size)
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SystemExit("Parquet import requires the 'parquet' extra (pyarrow)") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    elif suffix in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as exc:
+            raise SystemExit("Excel import requires the 'excel' extra (openpyxl)") from exc
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(name) for name in next(rows, ())]
+            yield from _batched((dict(zip(header, row, strict=False)) for row in rows), chunk_size)
+        finally:
+            workbook.close()
+    else:
+        raise SystemExit(f"Unsupported file type: {path.name} (use .csv, .xlsx or .parquet)")
+
+
+def _batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@cache
+def _column_adapter(model: type[SQLModel], name: str) -> TypeAdapter:
+    """Validate a whole column of values in one call."""
+    field_info = model.model_fields[name]
+    annotation = field_info.annotation
+    if field_info.metadata:
+        annotation = Annotated[(annotation, *field_info.metadata)]
+    return TypeAdapter(list[annotation])
+
+
+def _deferred_columns(info: ModelInfo) -> tuple[Column, ...]:
+    """Foreign keys created with ``use_alter``: they point at tables loaded later."""
+    return tuple(
+        column
+        for column in info.fk_columns
+        if any(foreign_key.use_alter for foreign_key in column.foreign_keys)
+    )
+
+
+def check_columns(info: ModelInfo, names: Iterable[str]) -> None:
+    """Fail before loading when a file has unknown or misses required columns."""
+    names = set(names)
+    unknown = names - set(info.column_names)
+    missing = {
+        name
+        for name in info.column_names
+        if name not in names and info.model.model_fields[name].is_required()
+    }
+    if unknown or missing:
+        problems = [f"unknown columns {sorted(unknown)}"] if unknown else []
+        problems += [f"missing required columns {sorted(missing)}"] if missing else []
+        raise SystemExit(f"{info.table.name}: {'; '.join(problems)}")
+
+
+def validate_chunk(
+    info: ModelInfo, rows: list[dict[str, Any]], offset: int
+) -> tuple[list[tuple[int, dict[str, Any]]], list[BulkRowError]]:
+    """Validate a chunk column by column and fill in defaults for absent columns.
+
+    Each column is validated with one call, whose errors name every offending row;
+    only a column with errors is converted again cell by cell. Empty cells are read
+    as NULL.
+    """
+    errors: dict[int, list[str]] = {}
+    columns: dict[str, list[Any]] = {}
+    present = [name for name in info.column_names if name in rows[0]]
+    for name in present:
+        values = [None if row.get(name) == "" else row.get(name) for row in rows]
+        adapter = _column_adapter(info.model, name)
+        try:
+            columns[name] = adapter.validate_python(values)
+        except ValidationError as exc:
+            failed = set()
+            for error in exc.errors(include_url=False, include_input=False):
+                failed.add(error["loc"][0])
+                errors.setdefault(error["loc"][0], []).append(f"{name}: {error['msg']}")
+            # Convert the cells that did pass one by one; the failed rows are dropped.
+            columns[name] = [
+                None if position in failed else adapter.validate_python([value])[0]
+                for position, value in enumerate(values)
+            ]
+
+    valid = []
+    for position in range(len(rows)):
+        if position in errors:
+            continue
+        values = {name: columns[name][position] for name in present}
+        for name in info.column_names:
+            if name not in values:
+                values[name] = info.model.model_fields[name].get_default(call_default_factory=True)
+        valid.append((offset + position, values))
+    return valid, [
+        BulkRowError(index=offset + position, detail="; ".join(messages))
+        for position, messages in sorted(errors.items())
+    ]
+
+
+def resolve_references(
+    session: Session,
+    columns: Sequence[Column],
+    rows: list[tuple[int, dict[str, Any]]],
+) -> tuple[list[tuple[int, dict[str, Any]]], list[BulkRowError]]:
+    """Drop rows whose foreign keys point at missing parents, one query per column."""
+    rejected: dict[int, str] = {}
+    for column in columns:
+        wanted = {values[column.key] for _, values in rows if values[column.key] is not None}
+        if not wanted:
+            continue
+        target = next(iter(column.foreign_keys)).column
+        found = set(session.execute(select(target).where(target.in_(wanted))).scalars())
+        for index, values in rows:
+            value = values[column.key]
+            if value is not None and value not in found and index not in rejected:
+                rejected[index] = f"{column.key}: unknown reference {value}"
+    kept = [(index, values) for index, values in rows if index not in rejected]
+    return kept, [BulkRowError(index=index, detail=detail) for index, detail in rejected.items()]
+
+
+def import_file(
+    session: Session,
+    model: type[SQLModel],
+    path: Path,
+    *,
+    on_conflict: OnConflict = "error",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    deferred: list[tuple[ModelInfo, Column, Any, Any]] | None = None,
+) -> TableReport:
+    """Load one file into its table, committing chunk by chunk.
+
+    Values of ``use_alter`` foreign keys are written as NULL and appended to
+    ``deferred`` so they can be set once their target table has been loaded. With
+    ``on_conflict="update"`` existing rows only get the columns present in the file.
+    """
+    info = model_info(model)
+    deferred_columns = _deferred_columns(info)
+    checked_columns = [column for column in info.fk_columns if column not in deferred_columns]
+    report = TableReport(info.table.name)
+    started = time.perf_counter()
+
+    for chunk in read_chunks(path, chunk_size):
+        if report.read == 0:
+            header = set(chunk[0].keys())
+            check_columns(info, header)
+            # Deferred keys are set by apply_deferred, never by the upsert.
+            statement = insert_statement(
+                session,
+                model,
+                on_conflict,
+                update_columns=header - {column.key for column in deferred_columns},
+            )
+            loaded_deferred = [column for column in deferred_columns if column.key in header]
+        valid, errors = validate_chunk(info, chunk, report.read)
+        report.read += len(chunk)
+        valid, rejected = resolve_references(session, checked_columns, valid)
+        for _, values in valid:
+            for column in loaded_deferred:
+                # An empty cell clears the key of an updated row, so it is applied too.
+                if deferred is not None and (
+                    values[column.key] is not None or on_conflict == "update"
+                ):
+                    deferred.append((info, column, values[info.pk_name], values[column.key]))
+            for column in deferred_columns:
+                values[column.key] = None
+        written, failed = write_rows(session, statement, valid, chunk_size=chunk_size)
+        session.commit()
+        report.written += written
+        report.errors += errors + rejected + failed
+
+    report.seconds = time.perf_counter() - started
+    invalidate_model(model)
+    report.errors.sort(key=lambda error: error.index)
+    return report
+
+
+def apply_deferred(
+    session: Session, deferred: list[tuple[ModelInfo, Column, Any, Any]]
+) -> list[str]:
+    """Set the postponed ``use_alter`` foreign keys with one UPDATE per column."""
+    problems = []
+    groups: dict[tuple[ModelInfo, Column], list[tuple[Any, Any]]] = {}
+    for info, column, pk, value in deferred:
+        groups.setdefault((info, column), []).append((pk, value))
+    for (info, column), pairs in groups.items():
+        target = next(iter(column.foreign_keys)).column
+        wanted = {value for _, value in pairs if value is not None}
+        found = set(session.execute(select(target).where(target.in_(wanted))).scalars())
+        found.add(None)
+        problems += [
+            f"{info.table.name} {pk}: {column.key}: unknown reference {value}"
+            for pk, value in pairs
+            if value not in found
+        ]
+        statement = (
+            update(info.table)
+            .where(info.pk_column == bindparam("row_pk"))
+            .values({column.key: bindparam("row_value")})
+        )
+        params = [{"row_pk": pk, "row_value": value} for pk, value in pairs if value in found]
+        if params:
+            session.connection().execute(statement, params)
+            invalidate_model(info.model)
+    session.commit()
+    return problems
+
+
+def import_files(
+    files: Sequence[tuple[type[SQLModel], Path]],
+    *,
+    on_conflict: OnConflict = "error",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> tuple[list[TableReport], list[str]]:
+    """Import files in foreign-key order, then resolve the ``use_alter`` cycles."""
+    order = {table.name: position for position, table in enumerate(SQLModel.metadata.sorted_tables)}
+    files = sorted(files, key=lambda item: order[item[0].__tablename__])
+    deferred: list[tuple[ModelInfo, Column, Any, Any]] = []
+    reports = []
+    with Session(get_engine()) as session:
+        for model, path in files:
+            reports.append(
+                import_file(
+                    session,
+                    model,
+                    path,
+                    on_conflict=on_conflict,
+                    chunk_size=chunk_size,
+                    deferred=deferred,
+                )
+            )
+        problems = apply_deferred(session, deferred)
+    return reports, problems
+
+
+def _parse_file_argument(argument: str) -> tuple[type[SQLModel], Path]:
+    name, _, path = argument.rpartition("=")
+    path = Path(path)
+    name = name or path.stem
+    if name not in MODELS_BY_NAME:
+        raise SystemExit(f"Cannot match {argument!r} to a table; name it as TABLE=PATH")
+    return MODELS_BY_NAME[name], path
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Import CSV, Excel or Parquet exports")
+    parser.add_argument("files", nargs="+", metavar="[TABLE=]PATH")
+    parser.add_argument(
+        "--on-conflict",
+        choices=["error", "update", "ignore"],
+        default="error",
+        help="What to do with rows whose primary key already exists (default: error)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    files = [_parse_file_argument(argument) for argument in args.files]
+    create_db_and_tables()
+    reports, problems = import_files(
+        files, on_conflict=args.on_conflict, chunk_size=args.chunk_size
+    )
+    for report in reports:
+        print(
+            f"{report.table}: read={report.read} written={report.written} "
+            f"rejected={len(report.errors)} ({report.rows_per_second:,.0f} rows/s)"
+        )
+        for error in report.errors[:MAX_REPORTED_ERRORS]:
+            print(f"  row {error.index + 1}: {error.detail}")
+    for problem in problems[:MAX_REPORTED_ERRORS]:
+        print(f"  {problem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,40 @@
 """TechConnect FastAPI backend application."""
 
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import IMPORT_STARTED
+from app.api.endpoints.metrics import router as metrics_router
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.core.database import create_db_and_tables
+from app.core.database import create_db_and_tables, get_async_engine, get_engine
+from app.core.startup import StartupProfile, install_openapi_cache
+from app.services.batch import MISSING_IDS_HEADER
+from app.services.metrics import (
+    SERVER_TIMING_HEADER,
+    InstrumentationMiddleware,
+    MetricsRegistry,
+    instrument_engine,
+)
+from app.services.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
     """Handle startup and shutdown events for shared resources."""
-    create_db_and_tables()
+    with app.state.startup.phase("create_tables"):
+        create_db_and_tables()
     yield
 
 
 def create_application() -> FastAPI:
     """Build and configure the FastAPI app instance."""
+    started = time.perf_counter()
+    profile = StartupProfile()
+    profile.record("import", IMPORT_STARTED)
     settings = get_settings()
 
     app = FastAPI(
@@ -34,14 +50,36 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER,
+            TOTAL_COUNT_HEADER,
+            MISSING_IDS_HEADER,
+            SERVER_TIMING_HEADER,
+            "ETag",
+        ],
     )
 
+    if settings.metrics_enabled:
+        instrument_engine(get_engine())
+        if settings.async_database:
+            instrument_engine(get_async_engine().sync_engine)
+        app.state.metrics = MetricsRegistry(settings.n_plus_one_threshold)
+        app.add_middleware(
+            InstrumentationMiddleware,
+            registry=app.state.metrics,
+            skip_paths=(f"{settings.api_prefix}/metrics",),
+        )
+        app.include_router(metrics_router, prefix=settings.api_prefix)
+
     @app.get("/", summary="Root Endpoint", tags=["System"])
     def root():
         """Health check endpoint."""
         return {"status": "ok", "message": "TechConnect API is running"}
 
     app.include_router(api_router, prefix=settings.api_prefix)
+    app.state.startup = profile
+    install_openapi_cache(app, settings.openapi_cache_dir, profile)
+    profile.record("application", started)
     return app
 
 
@@ -9,6 +9,8 @@ from uuid import UUID
 from sqlmodel import SQLModel, Session
 
 from app.core.database import create_db_and_tables, get_engine
+from app.services.search import rebuild_search_index
+from app.services.stats import STATS_SOURCE_TABLES, mark_stale
 from models import (
     FACS,
     Biomodel,
@@ -435,6 +437,8 @@ def seed_database() -> SeedStats:
             stats,
         )
 
+        rebuild_search_index(session)
+        mark_stale(session, *STATS_SOURCE_TABLES)
         session.commit()
 
     return stats
@@ -0,0 +1,35 @@
+"""Request and response shapes for fetching many entities by primary key."""
+
+from collections.abc import Iterable
+
+from fastapi import HTTPException
+from pydantic import create_model
+from sqlmodel import Field, SQLModel
+
+MAX_BATCH_IDS = 500
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+
+class BatchGetRequest(SQLModel):
+    """Primary keys to fetch, in the order the results should come back."""
+
+    ids: list[str] = Field(max_length=MAX_BATCH_IDS)
+
+
+def parse_ids(values: Iterable[str]) -> list[str]:
+    """Split comma-separated and repeated ``ids`` query values, enforcing the batch limit."""
+    ids = [part.strip() for value in values for part in value.split(",") if part.strip()]
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
+
+def batch_result_model(model: type[SQLModel]) -> type[SQLModel]:
+    """Build the documented response model of a batch get for one entity."""
+    return create_model(
+        f"{model.__name__}BatchResult",
+        __base__=SQLModel,
+        __doc__=f"{model.__name__} records found, in request order, and the ids not found.",
+        items=(list[model], ...),
+        missing=(list[str], Field(description="Requested ids with no matching record")),
+    )
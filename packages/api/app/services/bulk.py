@@ -0,0 +1,184 @@
+"""Batched multi-row writes for SQLModel entities."""
+
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Literal, TypeVar
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Field, Session, SQLModel
+
+from app.services.cache import invalidate_model
+from app.services.crud import commit_or_400
+from app.services.registry import model_info
+from app.services.search import reindex_rows
+from app.services.stats import mark_stale
+
+ModelType = TypeVar("ModelType", bound=SQLModel)
+
+OnConflict = Literal["error", "update", "ignore"]
+
+BULK_CHUNK_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class BulkRowError(SQLModel):
+    """A row rejected by validation or by the database."""
+
+    index: int = Field(description="Zero-based position of the row in the request")
+    detail: Any
+
+
+class BulkResult(SQLModel):
+    """Outcome of a bulk write."""
+
+    accepted: int = Field(default=0, description="Rows written, updated or skipped")
+    errors: list[BulkRowError] = Field(default_factory=list)
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> list[Any]:
+    """Decode a JSON array or newline-delimited JSON request body."""
+    try:
+        if content_type.split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        rows = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed request body: {exc}") from exc
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of objects")
+    return rows
+
+
+def bulk_write(
+    session: Session,
+    model: type[ModelType],
+    rows: Sequence[Any],
+    *,
+    on_conflict: OnConflict = "error",
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> BulkResult:
+    """Validate rows in one pass and insert them in chunks within one transaction.
+
+    Rows that fail validation or hit a database error (see :func:`write_rows`) are
+    reported while the rest of the batch is still committed.
+    """
+    result = BulkResult()
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            result.errors.append(BulkRowError(index=index, detail="Expected a JSON object"))
+            continue
+        try:
+            valid.append((index, model.model_validate(row).model_dump()))
+        except ValidationError as exc:
+            result.errors.append(
+                BulkRowError(index=index, detail=exc.errors(include_url=False, include_input=False))
+            )
+
+    statement = insert_statement(session, model, on_conflict)
+    accepted, errors = write_rows(session, statement, valid, chunk_size=chunk_size)
+    result.accepted += accepted
+    result.errors.extend(errors)
+
+    commit_or_400(session)
+    invalidate_model(model)
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
+
+def write_rows(
+    session: Session,
+    statement: Any,
+    rows: Sequence[tuple[int, dict[str, Any]]],
+    *,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> tuple[int, list[BulkRowError]]:
+    """Execute a statement for indexed rows in chunks, isolating the rows that fail.
+
+    Each chunk is sent as a single multi-row statement inside a savepoint. If a
+    chunk fails, its rows are retried one by one so that only the offending rows
+    are reported. The search documents of the written rows are refreshed and the
+    statistics reading the table are marked stale in the same transaction. Returns
+    the number of rows written and the row errors.
+    """
+    table = statement.table
+    pk_name = next(iter(table.primary_key.columns)).key
+    accepted = 0
+    errors = []
+    for chunk in _chunks(rows, chunk_size):
+        written = []
+        try:
+            with session.begin_nested():
+                session.execute(statement, [values for _, values in chunk])
+            written = [values for _, values in chunk]
+        except SQLAlchemyError:
+            for index, values in chunk:
+                try:
+                    with session.begin_nested():
+                        session.execute(statement, [values])
+                    written.append(values)
+                except SQLAlchemyError as exc:
+                    errors.append(BulkRowError(index=index, detail=str(getattr(exc, "orig", exc))))
+        accepted += len(written)
+        reindex_rows(
+            session, table.name, [values[pk_name] for values in written if pk_name in values]
+        )
+    if accepted:
+        mark_stale(session, table.name)
+    return accepted, errors
+
+
+def insert_statement(
+    session: Session,
+    model: type[ModelType],
+    on_conflict: OnConflict,
+    *,
+    update_columns: Iterable[str] | None = None,
+) -> Any:
+    """Build a multi-row INSERT with the dialect's native conflict clause.
+
+    With ``on_conflict="update"`` an existing row gets the values of
+    ``update_columns`` (default: every column); its other columns are kept.
+    """
+    info = model_info(model)
+    table = info.table
+    if on_conflict == "error":
+        return insert(table)
+
+    dialect = session.get_bind().dialect.name
+    pk_names = [info.pk_name]
+    update_columns = info.column_names if update_columns is None else set(update_columns)
+    update_names = [
+        name for name in info.column_names if name != info.pk_name and name in update_columns
+    ]
+    if not update_names:
+        # Nothing to update: an existing row is left as it is.
+        on_conflict = "ignore"
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_module = postgresql if dialect == "postgresql" else sqlite
+        statement = dialect_module.insert(table)
+        if on_conflict == "ignore":
+            return statement.on_conflict_do_nothing(index_elements=pk_names)
+        return statement.on_conflict_do_update(
+            index_elements=pk_names,
+            set_={name: statement.excluded[name] for name in update_names},
+        )
+    if dialect in ("mysql", "mariadb"):
+        statement = mysql.insert(table)
+        if on_conflict == "ignore":
+            return statement.prefix_with("IGNORE")
+        return statement.on_duplicate_key_update(
+            {name: statement.inserted[name] for name in update_names}
+        )
+    raise HTTPException(
+        status_code=400, detail=f"on_conflict={on_conflict} is not supported on {dialect}"
+    )
+
+
+def _chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -0,0 +1,153 @@
+"""In-process caches for read paths, invalidated by the CRUD write paths."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Protocol
+
+from fastapi import Request, Response
+from sqlalchemy import Engine
+from sqlmodel import SQLModel
+
+from app.core.config import get_settings
+from app.services.serialization import body_etag
+
+
+class CacheStore(Protocol):
+    """Backend of the response cache; a shared store (e.g. Redis) can implement it."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a live entry and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones beyond maxsize."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def database_key(engine: Engine) -> str:
+    """Key per-database process state; the sync and async engines of one URL share it."""
+    url = engine.url
+    return url.set(drivername=url.get_backend_name()).render_as_string(hide_password=True)
+
+
+_generations: dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+
+def model_generation(model: type[SQLModel]) -> int:
+    """Return the write generation of a model; part of every cache key for it."""
+    return _generations.get(model.__tablename__, 0)
+
+
+def invalidate_model(model: type[SQLModel]) -> None:
+    """Make every cached entry for a model unreachable after one of its rows changes.
+
+    Entries are keyed by generation, so bumping it invalidates in O(1); the stale
+    entries are evicted by LRU/TTL without scanning the cache.
+    """
+    with _generations_lock:
+        _generations[model.__tablename__] = model_generation(model) + 1
+
+
+_settings = get_settings()
+count_cache = TTLCache(maxsize=_settings.count_cache_size, ttl=_settings.count_cache_ttl)
+lineage_cache = TTLCache(maxsize=_settings.lineage_cache_size, ttl=_settings.lineage_cache_ttl)
+_response_store: CacheStore = TTLCache(
+    maxsize=_settings.response_cache_size, ttl=_settings.response_cache_ttl
+)
+
+
+def get_response_store() -> CacheStore:
+    return _response_store
+
+
+def set_response_store(store: CacheStore) -> None:
+    """Replace the in-process response cache, e.g. with a store shared by all workers.
+
+    Write generations stay per process, so with a shared store other workers see a
+    write only once their entries expire; keep the store's TTL short.
+    """
+    global _response_store
+    _response_store = store
+
+
+def response_cache_key(model: type[SQLModel], request: Request) -> str:
+    """Key a GET response by table, write generation, path and normalized query."""
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+    )
+    return f"{model.__tablename__}:{model_generation(model)}:{request.url.path}?{query}"
+
+
+def cached_response(request: Request, key: str) -> Response | None:
+    """Answer a GET from the cache, with 304 when the client already has the body."""
+    entry = _response_store.get(key)
+    if entry is None:
+        return None
+    body, headers = entry
+    return _conditional_response(request, body, headers)
+
+
+def cache_response(
+    request: Request, key: str, body: bytes, headers: dict[str, str] | None = None
+) -> Response:
+    """Store an encoded GET response under key and answer the request with it."""
+    headers = _etag_headers(body, headers)
+    _response_store.set(key, (body, headers))
+    return _conditional_response(request, body, headers)
+
+
+def etag_response(request: Request, body: bytes, headers: dict[str, str] | None = None) -> Response:
+    """Answer a GET with an encoded body tagged by its ETag, without caching it."""
+    return _conditional_response(request, body, _etag_headers(body, headers))
+
+
+def _etag_headers(body: bytes, headers: dict[str, str] | None) -> dict[str, str]:
+    return {**(headers or {}), "ETag": body_etag(body), "Cache-Control": "no-cache"}
+
+
+def _conditional_response(request: Request, body: bytes, headers: dict[str, str]) -> Response:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,24 +1,67 @@
 """Shared CRUD operations for SQLModel entities."""
 
-from typing import Any, TypeVar
-from uuid import UUID
+from collections.abc import Mapping, Sequence
+from functools import cache
+from typing import Annotated, Any, NoReturn, TypeVar
 
 from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import SQLModel, Session, select
+from sqlmodel import Session, SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.services.cache import count_cache, invalidate_model, model_generation
+from app.services.registry import model_info
+from app.services.search import SEARCH_FIELDS, index_rows, unindex_rows
+from app.services.serialization import row_etag
+from app.services.stats import mark_stale
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 
 
-def _coerce_pk(model: type[ModelType], item_id: str) -> Any:
-    """Convert item_id to the expected primary key type (e.g. UUID)."""
-    pk_fields = [f for f in model.model_fields.values() if getattr(f, "primary_key", False)]
-    if pk_fields and pk_fields[0].annotation is UUID:
-        try:
-            return UUID(item_id)
-        except ValueError as exc:
-            raise HTTPException(status_code=422, detail=f"Invalid UUID: {item_id}") from exc
-    return item_id
+def apply_filters(
+    statement: Any, model: type[ModelType], filters: Mapping[str, Sequence[str]] | None
+) -> Any:
+    """Add column filters to a statement.
+
+    Each filter maps a column name to one or more raw values: a single value
+    becomes an equality predicate and several values become an ``IN`` predicate.
+    """
+    info = model_info(model)
+    for name, values in (filters or {}).items():
+        if not values:
+            continue
+        column = info.table.columns[name]
+        coerced = [info.coerce(name, value) for value in values]
+        if len(coerced) == 1:
+            statement = statement.where(column == coerced[0])
+        else:
+            statement = statement.where(column.in_(coerced))
+    return statement
+
+
+def _list_statement(
+    model: type[ModelType],
+    *,
+    offset: int,
+    limit: int,
+    filters: Mapping[str, Sequence[str]] | None,
+    after: str | None,
+    raw_columns: bool = False,
+) -> Any:
+    """Build the SELECT shared by the sync and async list operations.
+
+    With ``raw_columns`` the table columns are selected directly instead of the
+    ORM entity, so rows come back as plain tuples without model instantiation.
+    """
+    info = model_info(model)
+    base = select(*info.columns) if raw_columns else select(model)
+    statement = apply_filters(base.order_by(info.pk_column), model, filters)
+    if after is not None:
+        statement = statement.where(info.pk_column > info.coerce_pk(after))
+    return statement.offset(offset).limit(limit)
 
 
 def list_items(
@@ -27,15 +70,123 @@ def list_items(
     *,
     offset: int,
     limit: int,
+    filters: Mapping[str, Sequence[str]] | None = None,
+    after: str | None = None,
 ) -> list[ModelType]:
-    """List entities with offset/limit pagination."""
-    statement = select(model).offset(offset).limit(limit)
+    """List entities ordered by primary key with optional column filters.
+
+    Filters are applied as in :func:`apply_filters`. When ``after`` is given, rows are
+    fetched with keyset pagination starting after that primary key instead of skipping
+    ``offset`` rows.
+    """
+    statement = _list_statement(model, offset=offset, limit=limit, filters=filters, after=after)
     return list(session.exec(statement))
 
 
+def list_rows(
+    session: Session,
+    model: type[ModelType],
+    *,
+    offset: int,
+    limit: int,
+    filters: Mapping[str, Sequence[str]] | None = None,
+    after: str | None = None,
+) -> list[dict[str, Any]]:
+    """Same as :func:`list_items` but return column mappings instead of models."""
+    statement = _list_statement(
+        model, offset=offset, limit=limit, filters=filters, after=after, raw_columns=True
+    )
+    return [dict(row) for row in session.execute(statement).mappings()]
+
+
+def _count_statement(model: type[ModelType], filters: Mapping[str, Sequence[str]] | None) -> Any:
+    statement = select(func.count()).select_from(model_info(model).table)
+    return apply_filters(statement, model, filters)
+
+
+def _count_key(model: type[ModelType], filters: Mapping[str, Sequence[str]] | None) -> Any:
+    normalized = tuple(sorted((name, tuple(values)) for name, values in (filters or {}).items()))
+    return (model.__tablename__, model_generation(model), normalized)
+
+
+def count_items(
+    session: Session,
+    model: type[ModelType],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> int:
+    """Count the rows matching the list filters, cached until the model is written."""
+    key = _count_key(model, filters)
+    total = count_cache.get(key)
+    if total is None:
+        total = session.execute(_count_statement(model, filters)).scalar_one()
+        count_cache.set(key, total)
+    return total
+
+
+def _coerce_pks(model: type[ModelType], ids: Sequence[str]) -> list[Any]:
+    """Coerce requested ids to primary-key values, dropping repeats but keeping order."""
+    info = model_info(model)
+    return list(dict.fromkeys(info.coerce_pk(item_id) for item_id in ids))
+
+
+def _ids_statement(
+    model: type[ModelType],
+    pks: Sequence[Any],
+    filters: Mapping[str, Sequence[str]] | None,
+    *,
+    raw_columns: bool = False,
+) -> Any:
+    info = model_info(model)
+    statement = select(*info.columns) if raw_columns else select(model)
+    return apply_filters(statement.where(info.pk_column.in_(pks)), model, filters)
+
+
+def _in_request_order(pks: Sequence[Any], found: Mapping[Any, Any]) -> tuple[list[Any], list[str]]:
+    items = [found[pk] for pk in pks if pk in found]
+    missing = [str(pk) for pk in pks if pk not in found]
+    return items, missing
+
+
+def get_items_by_ids(
+    session: Session,
+    model: type[ModelType],
+    ids: Sequence[str],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> tuple[list[ModelType], list[str]]:
+    """Fetch many entities with one ``IN`` query.
+
+    Returns the entities found, in the order their ids were requested, and the
+    requested ids that matched nothing.
+    """
+    pks = _coerce_pks(model, ids)
+    if not pks:
+        return [], []
+    pk_name = model_info(model).pk_name
+    items = session.exec(_ids_statement(model, pks, filters))
+    return _in_request_order(pks, {getattr(item, pk_name): item for item in items})
+
+
+def get_rows_by_ids(
+    session: Session,
+    model: type[ModelType],
+    ids: Sequence[str],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Same as :func:`get_items_by_ids` but return column mappings instead of models."""
+    pks = _coerce_pks(model, ids)
+    if not pks:
+        return [], []
+    pk_name = model_info(model).pk_name
+    result = session.execute(_ids_statement(model, pks, filters, raw_columns=True))
+    return _in_request_order(pks, {row[pk_name]: dict(row) for row in result.mappings()})
+
+
 def get_item_or_404(session: Session, model: type[ModelType], item_id: str) -> ModelType:
     """Fetch one entity or raise 404."""
-    pk = _coerce_pk(model, item_id)
+    pk = model_info(model).coerce_pk(item_id)
     item = session.get(model, pk)
     if item is None:
         raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
@@ -46,7 +197,10 @@ def create_item(session: Session, model: type[ModelType], payload: ModelType) ->
     """Create and persist one entity."""
     validated = model.model_validate(payload.model_dump())
     session.add(validated)
-    _commit_or_400(session)
+    index_rows(session, model, [validated.model_dump()])
+    mark_stale(session, model.__tablename__)
+    commit_or_400(session)
+    invalidate_model(model)
     session.refresh(validated)
     return validated
 
@@ -56,35 +210,116 @@ def update_item(
     model: type[ModelType],
     item_id: str,
     payload: ModelType,
-) -> ModelType:
-    """Update a persisted entity with PATCH semantics."""
-    db_item = get_item_or_404(session, model, item_id)
-    payload_data = payload.model_dump(exclude_unset=True)
+    *,
+    if_match: str | None = None,
+) -> dict[str, Any]:
+    """Update a persisted entity with PATCH semantics and return the stored row.
+
+    Only the fields set in payload are validated, and they are written with a single
+    ``UPDATE ... RETURNING`` statement. When ``if_match`` is given the current row is
+    locked and compared against it first; a stale ETag raises 412.
+    """
+    pk = model_info(model).coerce_pk(item_id)
+    values = _patch_values(model, payload)
+
+    current = None
+    if if_match is not None or not values:
+        current = session.execute(_row_statement(model, pk, lock=True)).mappings().one_or_none()
+        if current is None:
+            _raise_not_found(model)
+        _check_etag(current, if_match)
+        if not values:
+            return dict(current)
+
+    try:
+        if session.get_bind().dialect.update_returning:
+            statement = _update_statement(model, pk, values).returning(*model_info(model).columns)
+            row = session.execute(statement).mappings().one_or_none()
+        else:
+            result = session.execute(_update_statement(model, pk, values))
+            row = None
+            if result.rowcount:
+                row = session.execute(_row_statement(model, pk)).mappings().one()
+    except SQLAlchemyError as exc:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=str(getattr(exc, "orig", exc))) from exc
+
+    if row is None:
+        session.rollback()
+        _raise_not_found(model)
+    row = dict(row)
+    if _touches_search_fields(model, values):
+        index_rows(session, model, [row])
+    mark_stale(session, model.__tablename__)
+    commit_or_400(session)
+    invalidate_model(model)
+    return row
+
+
+@cache
+def _field_adapter(model: type[ModelType], name: str) -> TypeAdapter:
+    """Return a validator for one model field, including its constraints."""
+    field = model.model_fields[name]
+    if field.metadata:
+        return TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+    return TypeAdapter(field.annotation)
+
+
+def _patch_values(model: type[ModelType], payload: ModelType) -> dict[str, Any]:
+    """Validate the fields set in a PATCH payload and key them by column name.
+
+    Table models are not validated when FastAPI builds them, so each changed field
+    is checked on its own instead of re-validating the whole merged entity.
+    """
+    values = {}
+    for name, value in payload.model_dump(exclude_unset=True).items():
+        try:
+            values[name] = _field_adapter(model, name).validate_python(value)
+        except ValidationError as exc:
+            errors = [{**error, "loc": ("body", name, *error["loc"])} for error in exc.errors()]
+            raise RequestValidationError(errors) from exc
+    return values
+
 
-    if not payload_data:
-        return db_item
+def _touches_search_fields(model: type[ModelType], values: Mapping[str, Any]) -> bool:
+    return not values.keys().isdisjoint(SEARCH_FIELDS.get(model, ()))
 
-    merged_data = {**db_item.model_dump(), **payload_data}
-    validated_item = model.model_validate(merged_data)
-    validated_data = validated_item.model_dump()
-    clean_data = {field: validated_data[field] for field in payload_data}
 
-    db_item.sqlmodel_update(clean_data)
-    session.add(db_item)
-    _commit_or_400(session)
-    session.refresh(db_item)
-    return db_item
+def _row_statement(model: type[ModelType], pk: Any, *, lock: bool = False) -> Any:
+    info = model_info(model)
+    statement = select(*info.columns).where(info.pk_column == pk)
+    return statement.with_for_update() if lock else statement
+
+
+def _update_statement(model: type[ModelType], pk: Any, values: dict[str, Any]) -> Any:
+    info = model_info(model)
+    return update(info.table).where(info.pk_column == pk).values(values)
+
+
+def _check_etag(row: Mapping[str, Any], if_match: str | None) -> None:
+    """Raise 412 unless an If-Match header matches the row's current ETag."""
+    if if_match is None or if_match.strip() == "*":
+        return
+    if row_etag(row) not in {tag.strip() for tag in if_match.split(",")}:
+        raise HTTPException(status_code=412, detail="Precondition Failed")
+
+
+def _raise_not_found(model: type[ModelType]) -> NoReturn:
+    raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
 
 
 def delete_item(session: Session, model: type[ModelType], item_id: str) -> dict[str, bool]:
     """Delete one entity by id."""
     db_item = get_item_or_404(session, model, item_id)
     session.delete(db_item)
-    _commit_or_400(session)
+    unindex_rows(session, model, [model_info(model).coerce_pk(item_id)])
+    mark_stale(session, model.__tablename__)
+    commit_or_400(session)
+    invalidate_model(model)
     return {"ok": True}
 
 
-def _commit_or_400(session: Session) -> None:
+def commit_or_400(session: Session) -> None:
     """Commit a transaction and map database errors to HTTP 400."""
     try:
         session.commit()
@@ -92,3 +327,177 @@ def _commit_or_400(session: Session) -> None:
         session.rollback()
         detail = str(getattr(exc, "orig", exc))
         raise HTTPException(status_code=400, detail=detail) from exc
+
+
+async def list_items_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    *,
+    offset: int,
+    limit: int,
+    filters: Mapping[str, Sequence[str]] | None = None,
+    after: str | None = None,
+) -> list[ModelType]:
+    """Async variant of :func:`list_items`."""
+    statement = _list_statement(model, offset=offset, limit=limit, filters=filters, after=after)
+    return list(await session.exec(statement))
+
+
+async def list_rows_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    *,
+    offset: int,
+    limit: int,
+    filters: Mapping[str, Sequence[str]] | None = None,
+    after: str | None = None,
+) -> list[dict[str, Any]]:
+    """Async variant of :func:`list_rows`."""
+    statement = _list_statement(
+        model, offset=offset, limit=limit, filters=filters, after=after, raw_columns=True
+    )
+    result = await session.execute(statement)
+    return [dict(row) for row in result.mappings()]
+
+
+async def count_items_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> int:
+    """Async variant of :func:`count_items`."""
+    key = _count_key(model, filters)
+    total = count_cache.get(key)
+    if total is None:
+        result = await session.execute(_count_statement(model, filters))
+        total = result.scalar_one()
+        count_cache.set(key, total)
+    return total
+
+
+async def get_item_or_404_async(
+    session: AsyncSession, model: type[ModelType], item_id: str
+) -> ModelType:
+    """Async variant of :func:`get_item_or_404`."""
+    pk = model_info(model).coerce_pk(item_id)
+    item = await session.get(model, pk)
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    return item
+
+
+async def get_items_by_ids_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    ids: Sequence[str],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> tuple[list[ModelType], list[str]]:
+    """Async variant of :func:`get_items_by_ids`."""
+    pks = _coerce_pks(model, ids)
+    if not pks:
+        return [], []
+    pk_name = model_info(model).pk_name
+    items = await session.exec(_ids_statement(model, pks, filters))
+    return _in_request_order(pks, {getattr(item, pk_name): item for item in items})
+
+
+async def get_rows_by_ids_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    ids: Sequence[str],
+    *,
+    filters: Mapping[str, Sequence[str]] | None = None,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Async variant of :func:`get_rows_by_ids`."""
+    pks = _coerce_pks(model, ids)
+    if not pks:
+        return [], []
+    pk_name = model_info(model).pk_name
+    result = await session.execute(_ids_statement(model, pks, filters, raw_columns=True))
+    return _in_request_order(pks, {row[pk_name]: dict(row) for row in result.mappings()})
+
+
+async def create_item_async(
+    session: AsyncSession, model: type[ModelType], payload: ModelType
+) -> ModelType:
+    """Async variant of :func:`create_item`."""
+    validated = model.model_validate(payload.model_dump())
+    session.add(validated)
+    await session.run_sync(index_rows, model, [validated.model_dump()])
+    await session.run_sync(mark_stale, model.__tablename__)
+    await commit_or_400_async(session)
+    invalidate_model(model)
+    await session.refresh(validated)
+    return validated
+
+
+async def update_item_async(
+    session: AsyncSession,
+    model: type[ModelType],
+    item_id: str,
+    payload: ModelType,
+    *,
+    if_match: str | None = None,
+) -> dict[str, Any]:
+    """Async variant of :func:`update_item`."""
+    pk = model_info(model).coerce_pk(item_id)
+    values = _patch_values(model, payload)
+
+    current = None
+    if if_match is not None or not values:
+        result = await session.execute(_row_statement(model, pk, lock=True))
+        current = result.mappings().one_or_none()
+        if current is None:
+            _raise_not_found(model)
+        _check_etag(current, if_match)
+        if not values:
+            return dict(current)
+
+    try:
+        if session.bind.dialect.update_returning:
+            statement = _update_statement(model, pk, values).returning(*model_info(model).columns)
+            row = (await session.execute(statement)).mappings().one_or_none()
+        else:
+            result = await session.execute(_update_statement(model, pk, values))
+            row = None
+            if result.rowcount:
+                row = (await session.execute(_row_statement(model, pk))).mappings().one()
+    except SQLAlchemyError as exc:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(getattr(exc, "orig", exc))) from exc
+
+    if row is None:
+        await session.rollback()
+        _raise_not_found(model)
+    row = dict(row)
+    if _touches_search_fields(model, values):
+        await session.run_sync(index_rows, model, [row])
+    await session.run_sync(mark_stale, model.__tablename__)
+    await commit_or_400_async(session)
+    invalidate_model(model)
+    return row
+
+
+async def delete_item_async(
+    session: AsyncSession, model: type[ModelType], item_id: str
+) -> dict[str, bool]:
+    """Async variant of :func:`delete_item`."""
+    db_item = await get_item_or_404_async(session, model, item_id)
+    await session.delete(db_item)
+    await session.run_sync(unindex_rows, model, [model_info(model).coerce_pk(item_id)])
+    await session.run_sync(mark_stale, model.__tablename__)
+    await commit_or_400_async(session)
+    invalidate_model(model)
+    return {"ok": True}
+
+
+async def commit_or_400_async(session: AsyncSession) -> None:
+    """Async variant of :func:`commit_or_400`."""
+    try:
+        await session.commit()
+    except SQLAlchemyError as exc:
+        await session.rollback()
+        detail = str(getattr(exc, "orig", exc))
+        raise HTTPException(status_code=400, detail=detail) from exc
@@ -0,0 +1,246 @@
+"""Tumor growth series computed from measure columns with NumPy."""
+
+from collections.abc import Sequence
+from typing import Any, Literal
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException
+from models import Implant, Measure, Mouse, PDXTrial, Trial
+from sqlalchemy import or_, select, update
+from sqlmodel import Session, SQLModel
+
+from app.services.cache import invalidate_model
+from app.services.crud import commit_or_400
+from app.services.registry import model_info
+from app.services.stats import mark_stale
+
+Aggregate = Literal["none", "week"]
+
+DEFAULT_LATENCY_THRESHOLD = 100.0
+
+
+class GrowthSeries(SQLModel):
+    """Date-ordered measures of one implant with its fitted growth figures."""
+
+    implant_id: UUID
+    mouse_id: UUID
+    pdx_trial_id: UUID
+    dates: list[str]
+    values: list[float]
+    doubling_time_days: float | None = None
+    latency_weeks: float | None = None
+
+
+class LatencyEstimate(SQLModel):
+    """Latency of a PDX trial estimated from its measures."""
+
+    pdx_trial_id: UUID
+    latency_weeks: float | None = None
+    updated: bool
+
+
+def growth_statement(
+    *,
+    implant_ids: Sequence[str] = (),
+    mouse_ids: Sequence[str] = (),
+    pdx_trial_ids: Sequence[str] = (),
+) -> Any:
+    """Select the dated measures of every implant matching any of the given ids.
+
+    Rows come back ordered by implant and date, so each series is a contiguous run
+    and the ``(implant_id, measure_date)`` index serves the sort.
+    """
+    selectors = [
+        (model_info(Measure), "implant_id", implant_ids),
+        (model_info(Implant), "mouse_id", mouse_ids),
+        (model_info(Mouse), "pdx_trial_id", pdx_trial_ids),
+    ]
+    conditions = [
+        info.table.c[name].in_([info.coerce(name, value) for value in values])
+        for info, name, values in selectors
+        if values
+    ]
+    if not conditions:
+        raise HTTPException(
+            status_code=422, detail="Pass at least one implant_id, mouse_id or pdx_trial_id"
+        )
+
+    measure, implant, mouse, trial = (model.__table__ for model in (Measure, Implant, Mouse, Trial))
+    return (
+        select(
+            measure.c.implant_id,
+            implant.c.mouse_id,
+            mouse.c.pdx_trial_id,
+            trial.c.creation_date,
+            measure.c.measure_date,
+            measure.c.measure_value,
+        )
+        .join(implant, implant.c.id == measure.c.implant_id)
+        .join(mouse, mouse.c.id == implant.c.mouse_id)
+        .join(trial, trial.c.id == mouse.c.pdx_trial_id)
+        .where(or_(*conditions))
+        .where(measure.c.measure_date.is_not(None), measure.c.measure_value.is_not(None))
+        .order_by(measure.c.implant_id, measure.c.measure_date)
+    )
+
+
+def growth_series(
+    session: Session,
+    statement: Any,
+    *,
+    aggregate: Aggregate = "none",
+    max_points: int | None = None,
+    latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Group measure rows into per-implant series and fit growth figures.
+
+    The rows are turned into column arrays once and every statistic is computed for
+    all implants at the same time with ``reduceat`` over the contiguous runs.
+    """
+    rows = session.execute(statement).all()
+    if not rows:
+        return []
+    implant_ids, mouse_ids, trial_ids, origins, dates, values = (
+        np.array(column, dtype=object) for column in zip(*rows, strict=True)
+    )
+    dates = dates.astype("datetime64[D]")
+    values = values.astype(float)
+
+    starts = np.flatnonzero(np.r_[True, implant_ids[1:] != implant_ids[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(dates)]))
+    days = (dates - dates[starts][group]).astype(float)
+
+    doubling = _doubling_time_days(days, values, starts)
+    latency = _latency_weeks(dates, values, origins, starts, latency_threshold)
+    series_ids = implant_ids[starts], mouse_ids[starts], trial_ids[starts]
+    if aggregate == "week":
+        dates, values, starts = _weekly_means(dates, values, days, group, starts)
+
+    ends = np.r_[starts[1:], len(dates)]
+    series = []
+    for index, (start, end) in enumerate(zip(starts, ends, strict=True)):
+        picked = start + _downsample(end - start, max_points)
+        series.append(
+            {
+                "implant_id": series_ids[0][index],
+                "mouse_id": series_ids[1][index],
+                "pdx_trial_id": series_ids[2][index],
+                "dates": dates[picked].astype(str).tolist(),
+                "values": values[picked].tolist(),
+                "doubling_time_days": _optional(doubling[index]),
+                "latency_weeks": _optional(latency[index]),
+            }
+        )
+    return series
+
+
+def estimate_latency(
+    session: Session,
+    pdx_trial_id: str,
+    *,
+    threshold: float = DEFAULT_LATENCY_THRESHOLD,
+) -> dict[str, Any]:
+    """Estimate a PDX trial's latency and store it in ``PDXTrial.latency_weeks``.
+
+    The trial latency is the shortest latency among its implants. When no implant
+    has reached the threshold yet, the stored value is left untouched.
+    """
+    pk = model_info(PDXTrial).coerce_pk(pdx_trial_id)
+    if session.get(PDXTrial, pk) is None:
+        raise HTTPException(status_code=404, detail="PDXTrial not found")
+
+    statement = growth_statement(pdx_trial_ids=[pdx_trial_id])
+    latencies = [
+        item["latency_weeks"]
+        for item in growth_series(session, statement, latency_threshold=threshold)
+        if item["latency_weeks"] is not None
+    ]
+    if not latencies:
+        return {"pdx_trial_id": pk, "latency_weeks": None, "updated": False}
+
+    latency_weeks = min(latencies)
+    session.execute(
+        update(PDXTrial.__table__)
+        .where(PDXTrial.__table__.c.id == pk)
+        .values(latency_weeks=latency_weeks)
+    )
+    mark_stale(session, PDXTrial.__tablename__)
+    commit_or_400(session)
+    invalidate_model(PDXTrial)
+    return {"pdx_trial_id": pk, "latency_weeks": latency_weeks, "updated": True}
+
+
+def _doubling_time_days(days: np.ndarray, values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Fit ``log(value) = a + b * day`` per series and return ``ln 2 / b``.
+
+    Non-positive values cannot be log-transformed and are left out of the fit;
+    series without growth (or fewer than two usable points) get NaN.
+    """
+    usable = values > 0
+    weight = usable.astype(float)
+    log_values = np.log(np.where(usable, values, 1.0))
+    n = np.add.reduceat(weight, starts)
+    sx = np.add.reduceat(weight * days, starts)
+    sy = np.add.reduceat(weight * log_values, starts)
+    sxx = np.add.reduceat(weight * days * days, starts)
+    sxy = np.add.reduceat(weight * days * log_values, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        return np.where((n >= 2) & (slope > 0), np.log(2) / slope, np.nan)
+
+
+def _latency_weeks(
+    dates: np.ndarray,
+    values: np.ndarray,
+    origins: np.ndarray,
+    starts: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """Weeks from the trial start to the first measure reaching ``threshold``.
+
+    The trial creation date stands in for the implantation date, which is not
+    recorded; without it the first measure of the series is used.
+    """
+    positions = np.arange(len(values))
+    first_reached = np.minimum.reduceat(
+        np.where(values >= threshold, positions, len(values)), starts
+    )
+    reached = first_reached < len(values)
+    series_origin = origins[starts]
+    has_origin = np.not_equal(series_origin, None)
+    origin = dates[starts].copy()
+    origin[has_origin] = series_origin[has_origin].astype("datetime64[D]")
+    elapsed = (dates[np.where(reached, first_reached, starts)] - origin).astype(float)
+    return np.where(reached, elapsed / 7, np.nan)
+
+
+def _weekly_means(
+    dates: np.ndarray,
+    values: np.ndarray,
+    days: np.ndarray,
+    group: np.ndarray,
+    starts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Average each series per week since its first measure."""
+    week = (days // 7).astype(np.int64)
+    keys, inverse = np.unique(group * (int(week.max()) + 1) + week, return_inverse=True)
+    means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+    key_group = np.zeros(len(keys), dtype=np.int64)
+    key_group[inverse] = group
+    key_week = np.zeros(len(keys), dtype=np.int64)
+    key_week[inverse] = week
+    week_dates = dates[starts][key_group] + (key_week * 7).astype("timedelta64[D]")
+    new_starts = np.flatnonzero(np.r_[True, key_group[1:] != key_group[:-1]])
+    return week_dates, means, new_starts
+
+
+def _downsample(length: int, max_points: int | None) -> np.ndarray:
+    """Return evenly spaced offsets into a series, always keeping both ends."""
+    if max_points is None or length <= max_points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, max_points).round().astype(np.int64))
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
@@ -0,0 +1,214 @@
+"""Ancestor and descendant lineage resolved with one recursive CTE per request.
+
+Passages and biomodels can derive from a trial (``parent_trial_id``), and trials run
+on a passage, so the lineage below a tumor is a graph of biomodels, passages, trials
+and mice of arbitrary depth. :func:`lineage` walks it with a ``WITH RECURSIVE`` query
+over the indexed foreign keys of those tables, joins tumors and patients at the top,
+and returns every reached node with its shortest distance in hops. Results are cached
+per node and dropped whenever one of the lineage tables is written.
+"""
+
+from typing import Any, Literal
+from uuid import UUID
+
+from fastapi import HTTPException
+from models import Biomodel, Mouse, Passage, Patient, Trial, Tumor
+from sqlalchemy import Integer, String, and_, cast, func, literal_column, select, union_all
+from sqlmodel import Session, SQLModel
+
+from app.services.cache import lineage_cache, model_generation
+from app.services.registry import model_info
+
+DEFAULT_LINEAGE_DEPTH = 64
+
+Direction = Literal["ancestors", "descendants"]
+
+LINEAGE_ROOTS: dict[str, type[SQLModel]] = {
+    "patients": Patient,
+    "tumors": Tumor,
+    "biomodels": Biomodel,
+    "passages": Passage,
+    "trials": Trial,
+    "mice": Mouse,
+}
+LINEAGE_MODELS = tuple(LINEAGE_ROOTS.values())
+
+# Nodes of the recursive walk, all keyed by UUID.
+_WALKED = {Biomodel, Passage, Trial, Mouse}
+
+
+class LineageNode(SQLModel):
+    """An entity reached from the requested one, ``depth`` hops away."""
+
+    kind: str
+    id: str
+    depth: int
+
+
+class Lineage(SQLModel):
+    """The ancestors or descendants of one entity, nearest first."""
+
+    kind: str
+    id: str
+    depth: int
+    nodes: list[LineageNode]
+
+
+def _kind(model: type[SQLModel]) -> Any:
+    return cast(literal_column(f"'{model.__tablename__}'"), String)
+
+
+def _depth(value: int) -> Any:
+    return cast(literal_column(str(value)), Integer)
+
+
+def _edges() -> Any:
+    """Every child -> parent link between walked nodes, one row per foreign key."""
+    return union_all(
+        select(
+            _kind(Passage).label("child_kind"),
+            Passage.id.label("child_id"),
+            _kind(Biomodel).label("parent_kind"),
+            Passage.biomodel_id.label("parent_id"),
+        ),
+        select(_kind(Passage), Passage.id, _kind(Trial), Passage.parent_trial_id).where(
+            Passage.parent_trial_id.is_not(None)
+        ),
+        select(_kind(Biomodel), Biomodel.id, _kind(Trial), Biomodel.parent_trial_id).where(
+            Biomodel.parent_trial_id.is_not(None)
+        ),
+        select(_kind(Trial), Trial.id, _kind(Passage), Trial.passage_id),
+        select(_kind(Mouse), Mouse.id, _kind(Trial), Mouse.pdx_trial_id),
+    ).subquery("lineage_edge")
+
+
+def _walk(anchor: Any, direction: Direction, max_depth: int) -> Any:
+    """Recursive CTE of (kind, id, depth) rows reachable from the anchor rows."""
+    walk = anchor.cte("lineage_walk", recursive=True)
+    previous = walk.alias("previous")
+    edge = _edges()
+    if direction == "ancestors":
+        source, target = (
+            (edge.c.child_kind, edge.c.child_id),
+            (edge.c.parent_kind, edge.c.parent_id),
+        )
+    else:
+        source, target = (
+            (edge.c.parent_kind, edge.c.parent_id),
+            (edge.c.child_kind, edge.c.child_id),
+        )
+    step = (
+        select(target[0], target[1], previous.c.depth + 1)
+        .select_from(previous)
+        .join(edge, and_(source[0] == previous.c.kind, source[1] == previous.c.id))
+        .where(previous.c.depth < max_depth)
+    )
+    return walk.union(step)
+
+
+def _walked_nodes(walk: Any) -> Any:
+    return select(walk.c.kind, cast(walk.c.id, String), func.min(walk.c.depth)).group_by(
+        walk.c.kind, walk.c.id
+    )
+
+
+def _root(model: type[SQLModel], pk: Any) -> Any:
+    info = model_info(model)
+    return select(_kind(model), cast(info.pk_column, String), _depth(0)).where(info.pk_column == pk)
+
+
+def lineage_statement(
+    model: type[SQLModel], pk: Any, direction: Direction, max_depth: int = DEFAULT_LINEAGE_DEPTH
+) -> Any:
+    """Build the single query returning (kind, id, depth) for the root and its lineage."""
+    if model in _WALKED:
+        anchor = select(_kind(model).label("kind"), model.id.label("id"), _depth(0).label("depth"))
+        walk = _walk(anchor.where(model.id == pk), direction, max_depth)
+        parts = [_walked_nodes(walk)]
+        if direction == "ancestors":
+            from_biomodels = walk.join(
+                Biomodel, and_(walk.c.kind == Biomodel.__tablename__, Biomodel.id == walk.c.id)
+            )
+            parts.append(
+                select(_kind(Tumor), Biomodel.tumor_biobank_code, func.min(walk.c.depth) + 1)
+                .select_from(from_biomodels)
+                .group_by(Biomodel.tumor_biobank_code)
+            )
+            parts.append(
+                select(_kind(Patient), Tumor.patient_nhc, func.min(walk.c.depth) + 2)
+                .select_from(
+                    from_biomodels.join(Tumor, Tumor.biobank_code == Biomodel.tumor_biobank_code)
+                )
+                .group_by(Tumor.patient_nhc)
+            )
+        return union_all(*parts)
+
+    parts = [_root(model, pk)]
+    if direction == "ancestors":
+        if model is Tumor:
+            parts.append(
+                select(_kind(Patient), Tumor.patient_nhc, _depth(1)).where(Tumor.biobank_code == pk)
+            )
+        return union_all(*parts)
+
+    biomodels = select(_kind(Biomodel).label("kind"), Biomodel.id.label("id"))
+    if model is Tumor:
+        anchor = biomodels.add_columns(_depth(1).label("depth")).where(
+            Biomodel.tumor_biobank_code == pk
+        )
+    else:
+        parts.append(
+            select(_kind(Tumor), Tumor.biobank_code, _depth(1)).where(Tumor.patient_nhc == pk)
+        )
+        anchor = (
+            biomodels.add_columns(_depth(2).label("depth"))
+            .join(Tumor, Tumor.biobank_code == Biomodel.tumor_biobank_code)
+            .where(Tumor.patient_nhc == pk)
+        )
+    parts.append(_walked_nodes(_walk(anchor, direction, max_depth)))
+    return union_all(*parts)
+
+
+def _node_id(kind: str, value: str) -> str:
+    # UUID columns cast to text differ per backend (hex on SQLite, dashed on PostgreSQL).
+    return value if kind in (Patient.__tablename__, Tumor.__tablename__) else str(UUID(value))
+
+
+def lineage(
+    session: Session,
+    root: str,
+    item_id: str,
+    direction: Direction,
+    *,
+    max_depth: int = DEFAULT_LINEAGE_DEPTH,
+) -> dict[str, Any]:
+    """Return the ancestors or descendants of one entity, or raise 404.
+
+    ``depth`` is the distance to the farthest node, so the ancestors of a passage
+    report its generation depth below the patient.
+    """
+    model = LINEAGE_ROOTS[root]
+    pk = model_info(model).coerce_pk(item_id)
+    key = (direction, root, pk, max_depth, tuple(map(model_generation, LINEAGE_MODELS)))
+    cached = lineage_cache.get(key)
+    if cached is not None:
+        return cached
+
+    nodes = {}
+    for kind, node_id, depth in session.execute(lineage_statement(model, pk, direction, max_depth)):
+        node = (kind, _node_id(kind, node_id))
+        nodes[node] = min(depth, nodes.get(node, depth))
+    root_node = (model.__tablename__, str(pk))
+    if nodes.pop(root_node, None) is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    result = {
+        "kind": root_node[0],
+        "id": root_node[1],
+        "depth": max(nodes.values(), default=0),
+        "nodes": [
+            {"kind": kind, "id": node_id, "depth": depth}
+            for (kind, node_id), depth in sorted(nodes.items(), key=lambda item: (item[1], item[0]))
+        ],
+    }
+    lineage_cache.set(key, result)
+    return result
@@ -0,0 +1,231 @@
+"""Per-route request timings and SQL query counts, rendered for Prometheus.
+
+:class:`InstrumentationMiddleware` opens a :class:`RequestStats` for every request
+in a context variable; the cursor hooks installed by :func:`instrument_engine` add
+each executed statement to it. When the request ends, its latency and query figures
+go into the route's histograms and a ``Server-Timing`` header is added.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 25, 50, 100)
+
+
+@dataclass
+class RequestStats:
+    """Queries executed while serving one request."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated_statement(self, threshold: int) -> tuple[str, int] | None:
+        """The most repeated statement if it ran at least ``threshold`` times."""
+        if not self.statements:
+            return None
+        statement, count = self.statements.most_common(1)[0]
+        return (statement, count) if count >= threshold else None
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+    stats.db_seconds += time.perf_counter() - conn.info["query_start"].pop()
+    stats.queries += 1
+    stats.statements[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time the statements an engine runs inside instrumented requests."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition layout."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = [
+            f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts, strict=True)
+        ]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+@dataclass
+class RouteMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_BUCKETS))
+    db_seconds: float = 0.0
+    errors: int = 0
+    n_plus_one: int = 0
+
+
+class MetricsRegistry:
+    """Thread-safe per-route metrics, keyed by method and route template."""
+
+    def __init__(self, n_plus_one_threshold: int):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._lock = Lock()
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> tuple[str, int] | None:
+        """Record one request; return its repeated statement when it looks like N+1."""
+        repeated = stats.repeated_statement(self.n_plus_one_threshold)
+        with self._lock:
+            metrics = self._routes.setdefault((method, route), RouteMetrics())
+            metrics.latency.observe(seconds)
+            metrics.queries.observe(stats.queries)
+            metrics.db_seconds += stats.db_seconds
+            metrics.errors += status >= 500
+            metrics.n_plus_one += repeated is not None
+        return repeated
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        families: dict[str, tuple[str, str, list[str]]] = {
+            "http_request_duration_seconds": ("histogram", "Request latency per route.", []),
+            "db_queries_per_request": ("histogram", "SQL statements per request.", []),
+            "db_query_seconds_total": ("counter", "Time spent in SQL statements.", []),
+            "http_server_errors_total": ("counter", "Responses with a 5xx status.", []),
+            "n_plus_one_requests_total": (
+                "counter",
+                f"Requests repeating one statement {self.n_plus_one_threshold}+ times.",
+                [],
+            ),
+        }
+        with self._lock:
+            for (method, route), metrics in sorted(self._routes.items()):
+                labels = f'method="{method}",route="{route}"'
+                families["http_request_duration_seconds"][2].extend(
+                    metrics.latency.render("techconnect_http_request_duration_seconds", labels)
+                )
+                families["db_queries_per_request"][2].extend(
+                    metrics.queries.render("techconnect_db_queries_per_request", labels)
+                )
+                for name, value in (
+                    ("db_query_seconds_total", metrics.db_seconds),
+                    ("http_server_errors_total", metrics.errors),
+                    ("n_plus_one_requests_total", metrics.n_plus_one),
+                ):
+                    families[name][2].append(f"techconnect_{name}{{{labels}}} {value}")
+
+        lines = []
+        for name, (kind, help_text, samples) in families.items():
+            lines.append(f"# HELP techconnect_{name} {help_text}")
+            lines.append(f"# TYPE techconnect_{name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentationMiddleware:
+    """Time each HTTP request, attach ``Server-Timing`` and feed the registry."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry, skip_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.registry = registry
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append(
+                    SERVER_TIMING_HEADER,
+                    f"app;dur={elapsed_ms:.2f}, db;dur={stats.db_seconds * 1000:.2f};"
+                    f'desc="{stats.queries} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            route = _route_template(scope)
+            repeated = self.registry.observe(
+                scope["method"], route, status, time.perf_counter() - started, stats
+            )
+            if repeated is not None:
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    scope["method"],
+                    route,
+                    repeated[1],
+                    repeated[0],
+                )
+
+
+def _route_template(scope: dict[str, Any]) -> str:
+    """The matched path with its parameters as ``{name}``, one series per route.
+
+    Built from the path and its parameters rather than ``scope["route"].path``,
+    which lacks the prefixes of the routers the route was included through.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        for position in range(len(segments) - 1, -1, -1):
+            if segments[position] == str(value):
+                segments[position] = f"{{{name}}}"
+                break
+    return "/".join(segments)
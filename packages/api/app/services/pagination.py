@@ -0,0 +1,28 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(last_key: Any) -> str:
+    """Encode the primary key of the last row of a page as an opaque cursor."""
+    payload = json.dumps({"after": str(last_key)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Return the raw primary key encoded in a cursor, or raise 422."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded))["after"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=422, detail="Invalid cursor") from exc
+    if not isinstance(after, str):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return after
@@ -0,0 +1,158 @@
+"""Per-model table metadata, computed once and shared by services and routers."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+from models import (
+    FACS,
+    Biomodel,
+    Cryopreservation,
+    Image,
+    Implant,
+    LCTrial,
+    Measure,
+    Mouse,
+    Passage,
+    Patient,
+    PDOTrial,
+    PDXTrial,
+    Sample,
+    Trial,
+    TrialGenomicSequencing,
+    TrialMolecularData,
+    Tumor,
+    TumorGenomicSequencing,
+    TumorMolecularData,
+    UsageRecord,
+)
+from sqlalchemy import Column, Table
+from sqlalchemy import inspect as sa_inspect
+from sqlmodel import SQLModel
+
+
+@dataclass(frozen=True)
+class RelationshipInfo:
+    """One ORM relationship of a model."""
+
+    name: str
+    target: type[SQLModel]
+    uselist: bool
+
+
+@dataclass(frozen=True, eq=False)
+class ModelInfo:
+    """Columns, keys and relationships of one table model.
+
+    Built on first use by :func:`model_info` (the entity routers build it when they
+    are created), so request handlers never reflect over fields or columns.
+    """
+
+    model: type[SQLModel]
+    table: Table
+    columns: tuple[Column, ...]
+    python_types: Mapping[str, type | None]
+    pk_column: Column
+    fk_columns: tuple[Column, ...]
+    relationships: Mapping[str, RelationshipInfo]
+
+    @property
+    def name(self) -> str:
+        return self.model.__name__
+
+    @property
+    def pk_name(self) -> str:
+        return self.pk_column.key
+
+    @property
+    def column_names(self) -> tuple[str, ...]:
+        return tuple(column.key for column in self.columns)
+
+    @property
+    def filterable(self) -> tuple[str, ...]:
+        """Columns exposed as list filters: the foreign keys outside the primary key."""
+        return tuple(column.key for column in self.fk_columns)
+
+    def coerce(self, name: str, value: str) -> Any:
+        """Convert a raw query value to the Python type of a column, or raise 422."""
+        if self.python_types[name] is UUID:
+            try:
+                return UUID(value)
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=422, detail=f"Invalid UUID for {name}: {value}"
+                ) from exc
+        return value
+
+    def coerce_pk(self, item_id: str) -> Any:
+        """Convert item_id to the expected primary key type (e.g. UUID)."""
+        if self.python_types[self.pk_name] is UUID:
+            try:
+                return UUID(item_id)
+            except ValueError as exc:
+                raise HTTPException(status_code=422, detail=f"Invalid UUID: {item_id}") from exc
+        return item_id
+
+    def row(self, item: SQLModel) -> dict[str, Any]:
+        """Return the column values of a loaded entity, as a raw column select would."""
+        return {name: getattr(item, name) for name in self.column_names}
+
+
+def _python_type(column: Column) -> type | None:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+@cache
+def model_info(model: type[SQLModel]) -> ModelInfo:
+    """Return the metadata of a table model, computing it on the first call."""
+    table = model.__table__
+    columns = tuple(table.columns)
+    pk_column = next(iter(table.primary_key.columns))
+    relationships = {
+        relationship.key: RelationshipInfo(
+            relationship.key, relationship.mapper.class_, relationship.uselist
+        )
+        for relationship in sa_inspect(model).relationships
+    }
+    return ModelInfo(
+        model=model,
+        table=table,
+        columns=columns,
+        python_types={column.key: _python_type(column) for column in columns},
+        pk_column=pk_column,
+        fk_columns=tuple(
+            column for column in columns if column.foreign_keys and not column.primary_key
+        ),
+        relationships=relationships,
+    )
+
+
+# Models served by the API: (model, URL prefix, OpenAPI tag).
+ENTITIES: tuple[tuple[type[SQLModel], str, str], ...] = (
+    (Patient, "patients", "Patients"),
+    (Tumor, "tumors", "Tumors"),
+    (Sample, "samples", "Samples"),
+    (Biomodel, "biomodels", "Biomodels"),
+    (Passage, "passages", "Passages"),
+    (Trial, "trials", "Trials"),
+    (PDXTrial, "pdx-trials", "PDX Trials"),
+    (PDOTrial, "pdo-trials", "PDO Trials"),
+    (LCTrial, "lc-trials", "LC Trials"),
+    (Implant, "implants", "Implants"),
+    (Measure, "measures", "Measures"),
+    (Mouse, "mice", "Mice"),
+    (FACS, "facs", "FACS"),
+    (UsageRecord, "usage-records", "Usage Records"),
+    (Image, "images", "Images"),
+    (Cryopreservation, "cryopreservations", "Cryopreservations"),
+    (TrialGenomicSequencing, "trial-genomic-sequencings", "Trial Genomic Sequencings"),
+    (TrialMolecularData, "trial-molecular-data", "Trial Molecular Data"),
+    (TumorGenomicSequencing, "tumor-genomic-sequencings", "Tumor Genomic Sequencings"),
+    (TumorMolecularData, "tumor-molecular-data", "Tumor Molecular Data"),
+)
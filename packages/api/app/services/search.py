@@ -0,0 +1,283 @@
+"""Full-text search over the free-text fields of the biobank entities.
+
+Each searchable row has one document in the ``search_index`` shadow table holding
+its text fields. On PostgreSQL the table carries a generated ``tsvector`` column
+with a GIN index; on SQLite it is an FTS5 virtual table; other databases fall back
+to ``LIKE`` matching on the same table. Documents are written in the transaction
+that changes the row (see :mod:`app.services.crud` and
+:func:`app.services.bulk.write_rows`), and only once the index table exists.
+"""
+
+import hashlib
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal
+
+from models import (
+    Biomodel,
+    Passage,
+    PDXTrial,
+    Trial,
+    TrialGenomicSequencing,
+    TrialMolecularData,
+    Tumor,
+    TumorGenomicSequencing,
+    TumorMolecularData,
+)
+from sqlalchemy import Engine, bindparam, inspect, select, text
+from sqlmodel import Session, SQLModel
+
+from app.services.cache import database_key
+from app.services.registry import model_info
+
+SEARCH_TABLE = "search_index"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_TERMS = 16
+HIGHLIGHT = ("<mark>", "</mark>")
+
+SEARCH_FIELDS: dict[type[SQLModel], tuple[str, ...]] = {
+    Tumor: ("classification", "ap_observation"),
+    Biomodel: ("description",),
+    Passage: ("description",),
+    Trial: ("description",),
+    PDXTrial: ("ihq_data",),
+    TumorGenomicSequencing: ("data",),
+    TumorMolecularData: ("data",),
+    TrialGenomicSequencing: ("annotations",),
+    TrialMolecularData: ("annotations",),
+}
+
+SearchEntity = Literal[
+    "tumor",
+    "biomodel",
+    "passage",
+    "trial",
+    "pdx_trial",
+    "tumor_genomic_sequencing",
+    "tumor_molecular_data",
+    "trial_genomic_sequencing",
+    "trial_molecular_data",
+]
+
+
+class SearchHit(SQLModel):
+    """One matching entity with the best fragment of its text."""
+
+    entity: str
+    id: str
+    snippet: str
+    score: float
+
+
+_MODELS_BY_TABLE = {model.__tablename__: model for model in SEARCH_FIELDS}
+
+_CREATE_STATEMENTS = {
+    "postgresql": [
+        (
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "doc_key BIGINT PRIMARY KEY, entity VARCHAR(64) NOT NULL, "
+            "entity_id VARCHAR(255) NOT NULL, content TEXT NOT NULL, "
+            "document TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED)"
+        ),
+        (
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+            f"ON {SEARCH_TABLE} USING GIN (document)"
+        ),
+    ],
+    "sqlite": [
+        (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "entity UNINDEXED, entity_id UNINDEXED, content, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ),
+    ],
+}
+_CREATE_FALLBACK = [
+    (
+        f"CREATE TABLE {SEARCH_TABLE} (doc_key BIGINT PRIMARY KEY, entity VARCHAR(64) NOT NULL, "
+        "entity_id VARCHAR(255) NOT NULL, content TEXT NOT NULL)"
+    ),
+]
+
+# Whether the index table exists, per database (the sync and async engines share it).
+_enabled: dict[str, bool] = {}
+
+
+def document_key(entity: str, entity_id: Any) -> int:
+    """Stable positive 63-bit key of one document (the FTS5 rowid on SQLite)."""
+    digest = hashlib.blake2b(f"{entity}:{entity_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Create the index table if it is missing and fill it from the current rows.
+
+    Returns whether the table was created.
+    """
+    with engine.connect() as connection:
+        exists = inspect(connection).has_table(SEARCH_TABLE)
+    if not exists:
+        with Session(engine) as session:
+            for statement in _CREATE_STATEMENTS.get(engine.dialect.name, _CREATE_FALLBACK):
+                session.execute(text(statement))
+            _enabled[database_key(engine)] = True
+            rebuild_search_index(session)
+            session.commit()
+    _enabled[database_key(engine)] = True
+    return not exists
+
+
+def search_enabled(session: Session) -> bool:
+    """Whether the session's database has the index table (checked once per process)."""
+    engine = session.get_bind()
+    key = database_key(engine)
+    if key not in _enabled:
+        _enabled[key] = inspect(session.connection()).has_table(SEARCH_TABLE)
+    return _enabled[key]
+
+
+def _content(fields: Sequence[str], row: Mapping[str, Any]) -> str:
+    return "\n".join(str(row[name]) for name in fields if row.get(name))
+
+
+def index_rows(session: Session, model: type[SQLModel], rows: Iterable[Mapping[str, Any]]) -> None:
+    """Write the documents of some rows, dropping those with no text left."""
+    fields = SEARCH_FIELDS.get(model)
+    if fields is None or not search_enabled(session):
+        return
+    entity, pk_name = model.__tablename__, model_info(model).pk_name
+    documents, emptied = [], []
+    for row in rows:
+        key = document_key(entity, row[pk_name])
+        content = _content(fields, row)
+        if content:
+            documents.append(
+                {"key": key, "entity": entity, "entity_id": str(row[pk_name]), "content": content}
+            )
+        else:
+            emptied.append(key)
+    dialect = session.get_bind().dialect.name
+    if dialect != "sqlite":
+        emptied += [document["key"] for document in documents]
+    if emptied:
+        _delete_documents(session, emptied)
+    if not documents:
+        return
+    if dialect == "sqlite":
+        statement = (
+            f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, entity, entity_id, content) "
+            "VALUES (:key, :entity, :entity_id, :content)"
+        )
+    else:
+        statement = (
+            f"INSERT INTO {SEARCH_TABLE} (doc_key, entity, entity_id, content) "
+            "VALUES (:key, :entity, :entity_id, :content)"
+        )
+    _execute(session, text(statement), documents)
+
+
+def unindex_rows(session: Session, model: type[SQLModel], pks: Iterable[Any]) -> None:
+    """Remove the documents of deleted rows."""
+    if model not in SEARCH_FIELDS or not search_enabled(session):
+        return
+    _delete_documents(session, [document_key(model.__tablename__, pk) for pk in pks])
+
+
+def _delete_documents(session: Session, keys: list[int]) -> None:
+    column = "rowid" if session.get_bind().dialect.name == "sqlite" else "doc_key"
+    statement = text(f"DELETE FROM {SEARCH_TABLE} WHERE {column} IN :keys").bindparams(
+        bindparam("keys", expanding=True)
+    )
+    _execute(session, statement, {"keys": keys})
+
+
+def _execute(session: Session, statement: Any, parameters: Any) -> None:
+    # Pending ORM rows are flushed by the caller's commit, which maps its errors.
+    with session.no_autoflush:
+        session.execute(statement, parameters)
+
+
+def reindex_rows(session: Session, table_name: str, pks: Sequence[Any]) -> None:
+    """Re-read rows written by raw statements and refresh their documents."""
+    model = _MODELS_BY_TABLE.get(table_name)
+    if model is None or not pks or not search_enabled(session):
+        return
+    info = model_info(model)
+    columns = [info.pk_column, *(info.table.c[name] for name in SEARCH_FIELDS[model])]
+    rows = session.execute(select(*columns).where(info.pk_column.in_(pks))).mappings().all()
+    index_rows(session, model, rows)
+
+
+def rebuild_search_index(session: Session) -> int:
+    """Re-index every searchable row; returns the number of rows read."""
+    total = 0
+    for model, fields in SEARCH_FIELDS.items():
+        info = model_info(model)
+        columns = [info.pk_column, *(info.table.c[name] for name in fields)]
+        result = session.execute(select(*columns)).mappings()
+        while rows := result.fetchmany(1000):
+            index_rows(session, model, rows)
+            total += len(rows)
+    return total
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())[:MAX_SEARCH_TERMS]
+
+
+def search(
+    session: Session,
+    query: str,
+    *,
+    entities: Sequence[str] = (),
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> list[dict[str, Any]]:
+    """Return the best matching documents, all terms required, the last as a prefix."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    dialect = session.get_bind().dialect.name
+    params: dict[str, Any] = {"limit": limit, "entities": list(entities)}
+    entity_filter = " AND entity IN :entities" if entities else ""
+
+    if dialect == "sqlite":
+        params["match"] = " ".join(f'"{term}"' for term in terms) + "*"
+        statement = (
+            f"SELECT entity, entity_id, "
+            f"snippet({SEARCH_TABLE}, 2, '{HIGHLIGHT[0]}', '{HIGHLIGHT[1]}', '…', 12) "
+            f"AS snippet, -bm25({SEARCH_TABLE}) AS score FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH :match{entity_filter} ORDER BY score DESC LIMIT :limit"
+        )
+    elif dialect == "postgresql":
+        params["match"] = " & ".join(terms) + ":*"
+        statement = (
+            "SELECT entity, entity_id, ts_headline('simple', content, query, "
+            f"'StartSel={HIGHLIGHT[0]}, StopSel={HIGHLIGHT[1]}, MaxFragments=1') AS snippet, "
+            f"ts_rank(document, query) AS score FROM {SEARCH_TABLE}, "
+            "to_tsquery('simple', :match) AS query "
+            f"WHERE document @@ query{entity_filter} ORDER BY score DESC LIMIT :limit"
+        )
+    else:
+        conditions = []
+        for position, term in enumerate(terms):
+            params[f"term_{position}"] = f"%{term}%"
+            conditions.append(f"LOWER(content) LIKE :term_{position}")
+        statement = (
+            "SELECT entity, entity_id, content AS snippet, 0 AS score "
+            f"FROM {SEARCH_TABLE} WHERE {' AND '.join(conditions)}{entity_filter} LIMIT :limit"
+        )
+
+    compiled = text(statement)
+    if entities:
+        compiled = compiled.bindparams(bindparam("entities", expanding=True))
+    else:
+        params.pop("entities")
+    return [
+        {
+            "entity": row["entity"],
+            "id": row["entity_id"],
+            "snippet": row["snippet"],
+            "score": float(row["score"]),
+        }
+        for row in session.execute(compiled, params).mappings()
+    ]
@@ -0,0 +1,42 @@
+"""JSON encoding for responses that bypass per-row Pydantic validation."""
+
+import hashlib
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain rows to JSON; UUIDs, dates and datetimes are handled natively."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def body_etag(body: bytes) -> str:
+    """Return a strong ETag for an encoded response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def row_etag(row: Mapping[str, Any]) -> str:
+    """Return the ETag of one row; equal to the ETag of its encoded GET response."""
+    return body_etag(dumps(dict(row)))
+
+
+class RowsResponse(Response):
+    """JSON response for column rows that have already been read from the database."""
+
+    media_type = "application/json"
+
+    def __init__(self, rows: list[Mapping[str, Any]], **kwargs: Any) -> None:
+        super().__init__(content=dumps(rows), **kwargs)
+
+
+class RowResponse(Response):
+    """JSON response for a single column row, tagged with its ETag."""
+
+    media_type = "application/json"
+
+    def __init__(self, row: Mapping[str, Any], **kwargs: Any) -> None:
+        super().__init__(content=dumps(row), **kwargs)
+        self.headers["ETag"] = body_etag(self.body)
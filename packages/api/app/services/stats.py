@@ -0,0 +1,307 @@
+"""Dashboard statistics served from rollup tables refreshed after writes.
+
+Each metric is a grouped query over the entity tables. Its result is stored in
+``stats_rollup``, one row per group, so reading a dashboard costs O(groups). Every
+write to a source table appends one row per affected metric to
+``stats_rollup_change``, inside the writing transaction; writers only insert, so
+they never wait on each other. The next read re-runs the grouped query for the
+metrics with pending changes and deletes exactly the change rows it saw, so a write
+committed during a refresh stays pending rather than lost.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from models import Biomodel, Cryopreservation, LCTrial, Mouse, PDOTrial, PDXTrial, Trial, Tumor
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Engine,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
+from sqlmodel import Session, SQLModel
+
+from app.services.cache import database_key
+
+Measure = Literal["rate", "mean", "total"]
+
+STATS_METADATA = MetaData()
+ROLLUP_TABLE = Table(
+    "stats_rollup",
+    STATS_METADATA,
+    Column("metric", String(64), primary_key=True),
+    Column("position", Integer, primary_key=True),
+    Column("group_key", String(255)),
+    Column("count", Integer, nullable=False),
+    Column("hits", Integer),
+    Column("outcomes", Integer),
+    Column("value_sum", Float),
+    Column("value_count", Integer),
+)
+CHANGE_TABLE = Table(
+    "stats_rollup_change",
+    STATS_METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("metric", String(64), nullable=False, index=True),
+)
+STATE_TABLE = Table(
+    "stats_rollup_state",
+    STATS_METADATA,
+    Column("metric", String(64), primary_key=True),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A grouped query and the tables whose writes make its rollup stale.
+
+    The query selects ``group_key`` and ``count`` plus, depending on ``measures``,
+    ``hits`` and ``outcomes`` (rate = hits / outcomes) or ``value_sum`` and
+    ``value_count`` (mean and total).
+    """
+
+    description: str
+    sources: tuple[type[SQLModel], ...]
+    statement: Callable[[], Any]
+    measures: tuple[Measure, ...] = ()
+
+
+def _succeeded(column: Any) -> Any:
+    return func.sum(case((column.is_(True), 1), else_=0))
+
+
+def _biomodels_by_organ() -> Any:
+    return (
+        select(Tumor.organ.label("group_key"), func.count(Biomodel.id).label("count"))
+        .join_from(Biomodel, Tumor, Biomodel.tumor_biobank_code == Tumor.biobank_code)
+        .group_by(Tumor.organ)
+    )
+
+
+def _trial_success_by_type() -> Any:
+    trial_type = case(
+        (PDXTrial.id.is_not(None), "pdx"),
+        (PDOTrial.id.is_not(None), "pdo"),
+        (LCTrial.id.is_not(None), "lc"),
+    )
+    return (
+        select(
+            trial_type.label("group_key"),
+            func.count(Trial.id).label("count"),
+            _succeeded(Trial.success).label("hits"),
+            func.count(Trial.success).label("outcomes"),
+        )
+        .select_from(Trial)
+        .outerjoin(PDXTrial, PDXTrial.id == Trial.id)
+        .outerjoin(PDOTrial, PDOTrial.id == Trial.id)
+        .outerjoin(LCTrial, LCTrial.id == Trial.id)
+        .group_by(trial_type)
+    )
+
+
+def _pdx_trials_by_strain() -> Any:
+    trials = (
+        select(PDXTrial.id, Trial.success, PDXTrial.latency_weeks, Mouse.strain)
+        .join_from(PDXTrial, Trial, Trial.id == PDXTrial.id)
+        .outerjoin(Mouse, Mouse.pdx_trial_id == PDXTrial.id)
+        .distinct()
+        .subquery()
+    )
+    return select(
+        trials.c.strain.label("group_key"),
+        func.count(trials.c.id).label("count"),
+        _succeeded(trials.c.success).label("hits"),
+        func.count(trials.c.success).label("outcomes"),
+        func.sum(trials.c.latency_weeks).label("value_sum"),
+        func.count(trials.c.latency_weeks).label("value_count"),
+    ).group_by(trials.c.strain)
+
+
+def _cryopreservations_by_location() -> Any:
+    return select(
+        Cryopreservation.location.label("group_key"),
+        func.count(Cryopreservation.id).label("count"),
+        func.sum(Cryopreservation.vial_count).label("value_sum"),
+        func.count(Cryopreservation.vial_count).label("value_count"),
+    ).group_by(Cryopreservation.location)
+
+
+METRICS: dict[str, Metric] = {
+    "biomodels_by_organ": Metric(
+        "Biomodels per organ of their tumor.", (Biomodel, Tumor), _biomodels_by_organ
+    ),
+    "trial_success_by_type": Metric(
+        "Trials per subtype (pdx, pdo, lc or none) and their success rate.",
+        (Trial, PDXTrial, PDOTrial, LCTrial),
+        _trial_success_by_type,
+        ("rate",),
+    ),
+    "pdx_trials_by_strain": Metric(
+        "PDX trials per mouse strain, their success rate and mean latency in weeks.",
+        (Trial, PDXTrial, Mouse),
+        _pdx_trials_by_strain,
+        ("rate", "mean"),
+    ),
+    "cryopreservations_by_location": Metric(
+        "Cryopreservation records and total vials per location.",
+        (Cryopreservation,),
+        _cryopreservations_by_location,
+        ("total",),
+    ),
+}
+
+STATS_SOURCE_TABLES = frozenset(
+    model.__tablename__ for metric in METRICS.values() for model in metric.sources
+)
+
+_ROLLUP_VALUES = ("group_key", "count", "hits", "outcomes", "value_sum", "value_count")
+
+# Whether the rollup tables exist, per database.
+_enabled: dict[str, bool] = {}
+
+
+class StatsGroup(SQLModel):
+    """One group of a metric; only the metric's measures are present."""
+
+    group: str | None
+    count: int
+    rate: float | None = None
+    mean: float | None = None
+    total: float | None = None
+
+
+class StatsMetric(SQLModel):
+    description: str
+    refreshed_at: datetime | None
+    groups: list[StatsGroup]
+
+
+def ensure_stats_tables(engine: Engine) -> None:
+    """Create the rollup tables; every new metric gets a state row and a pending change."""
+    STATS_METADATA.create_all(engine)
+    with engine.begin() as connection:
+        known = set(connection.execute(select(STATE_TABLE.c.metric)).scalars())
+        missing = [{"metric": name} for name in METRICS if name not in known]
+        if missing:
+            connection.execute(insert(STATE_TABLE), missing)
+            connection.execute(insert(CHANGE_TABLE), missing)
+    _enabled[database_key(engine)] = True
+
+
+def _stats_enabled(session: Session) -> bool:
+    key = database_key(session.get_bind())
+    if key not in _enabled:
+        _enabled[key] = inspect(session.connection()).has_table(STATE_TABLE.name)
+    return _enabled[key]
+
+
+def mark_stale(session: Session, *table_names: str) -> None:
+    """Flag the metrics reading any of these tables for a refresh on the next read."""
+    names = [
+        name
+        for name, metric in METRICS.items()
+        if any(model.__tablename__ in table_names for model in metric.sources)
+    ]
+    if not names or not _stats_enabled(session):
+        return
+    # Pending ORM rows are flushed by the caller's commit, which maps its errors.
+    with session.no_autoflush:
+        session.execute(insert(CHANGE_TABLE), [{"metric": name} for name in names])
+
+
+def refresh_stats(session: Session, names: Iterable[str] | None = None) -> list[str]:
+    """Recompute the stale rollups among ``names`` (all by default); returns them.
+
+    A metric is claimed by deleting the change rows seen for it. A concurrent reader
+    deleting the same rows waits for the first one to commit and then deletes
+    nothing, so it skips the metric instead of rewriting the same rollup rows.
+    """
+    statement = select(CHANGE_TABLE.c.id, CHANGE_TABLE.c.metric)
+    if names is not None:
+        statement = statement.where(CHANGE_TABLE.c.metric.in_(list(names)))
+    pending: dict[str, list[int]] = {}
+    for change_id, name in session.execute(statement):
+        pending.setdefault(name, []).append(change_id)
+    refreshed = []
+    for name, change_ids in sorted(pending.items()):
+        claimed = session.execute(delete(CHANGE_TABLE).where(CHANGE_TABLE.c.id.in_(change_ids)))
+        if claimed.rowcount == 0 or name not in METRICS:
+            continue
+        rows = session.execute(METRICS[name].statement()).mappings().all()
+        rows = sorted(rows, key=lambda row: (-row["count"], str(row["group_key"])))
+        session.execute(delete(ROLLUP_TABLE).where(ROLLUP_TABLE.c.metric == name))
+        if rows:
+            session.execute(
+                insert(ROLLUP_TABLE),
+                [
+                    {
+                        "metric": name,
+                        "position": position,
+                        **{column: row.get(column) for column in _ROLLUP_VALUES},
+                    }
+                    for position, row in enumerate(rows)
+                ],
+            )
+        session.execute(
+            update(STATE_TABLE)
+            .where(STATE_TABLE.c.metric == name)
+            .values(refreshed_at=datetime.now(UTC))
+        )
+        refreshed.append(name)
+    return refreshed
+
+
+def _group(metric: Metric, row: Any) -> dict[str, Any]:
+    group = {"group": row.group_key, "count": row.count}
+    if "rate" in metric.measures:
+        group["rate"] = row.hits / row.outcomes if row.outcomes else None
+    if "mean" in metric.measures:
+        group["mean"] = row.value_sum / row.value_count if row.value_count else None
+    if "total" in metric.measures:
+        group["total"] = row.value_sum or 0
+    return group
+
+
+def read_stats(session: Session, names: Sequence[str] = ()) -> dict[str, Any]:
+    """Return the requested metrics (all by default), refreshing stale rollups first."""
+    unknown = set(names) - set(METRICS)
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown metrics: {', '.join(sorted(unknown))}"
+        )
+    names = list(names or METRICS)
+    if refresh_stats(session, names):
+        session.commit()
+
+    result = {
+        name: {"description": METRICS[name].description, "refreshed_at": None, "groups": []}
+        for name in names
+    }
+    states = select(STATE_TABLE.c.metric, STATE_TABLE.c.refreshed_at).where(
+        STATE_TABLE.c.metric.in_(names)
+    )
+    for name, refreshed_at in session.execute(states):
+        result[name]["refreshed_at"] = refreshed_at
+    rollups = (
+        select(ROLLUP_TABLE)
+        .where(ROLLUP_TABLE.c.metric.in_(names))
+        .order_by(ROLLUP_TABLE.c.metric, ROLLUP_TABLE.c.position)
+    )
+    for row in session.execute(rollups):
+        result[row.metric]["groups"].append(_group(METRICS[row.metric], row))
+    return result
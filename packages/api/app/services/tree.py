@@ -0,0 +1,163 @@
+"""Hierarchical entity trees loaded with batched eager loading."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException
+from models import (
+    Biomodel,
+    Implant,
+    LCTrial,
+    Mouse,
+    Passage,
+    Patient,
+    PDXTrial,
+    Trial,
+    Tumor,
+)
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, select
+
+from app.services.registry import model_info
+
+# Relationships followed when descending from each model, in output order.
+TREE_BRANCHES: dict[type[SQLModel], tuple[str, ...]] = {
+    Patient: ("tumors",),
+    Tumor: ("samples", "biomodels", "genomic_sequencing", "molecular_data"),
+    Biomodel: ("passages",),
+    Passage: ("trials",),
+    Trial: (
+        "pdx_trial",
+        "pdo_trial",
+        "lc_trial",
+        "usage_records",
+        "images",
+        "cryopreservations",
+        "genomic_sequencing",
+        "molecular_data",
+        "child_biomodels",
+        "child_passages",
+    ),
+    PDXTrial: ("mouse",),
+    LCTrial: ("facs",),
+    Mouse: ("implants",),
+    Implant: ("measures",),
+}
+
+TREE_ROOTS: dict[str, type[SQLModel]] = {
+    "patients": Patient,
+    "passages": Passage,
+    "mice": Mouse,
+}
+
+BRANCH_NAMES: frozenset[str] = frozenset(
+    name for branches in TREE_BRANCHES.values() for name in branches
+)
+
+# Branches leading from a trial back to biomodels and passages, i.e. around the cycle.
+CYCLIC_BRANCHES: frozenset[str] = frozenset({"child_biomodels", "child_passages"})
+# Derived generations one path may descend through the cyclic branches.
+MAX_TREE_GENERATIONS = 2
+# Relationships one plan may load; each is one batched query.
+MAX_TREE_RELATIONSHIPS = 256
+
+
+@dataclass(frozen=True)
+class TreePlan:
+    """Relationships to load and emit below one model, recursively."""
+
+    model: type[SQLModel]
+    branches: tuple[tuple[str, bool, "TreePlan"], ...] = field(default=())
+
+    def loader_options(self) -> list[Any]:
+        """Build nested ``selectinload`` options: one query per planned relationship."""
+        options = []
+        for name, _, child in self.branches:
+            option = selectinload(getattr(self.model, name))
+            child_options = child.loader_options()
+            if child_options:
+                option = option.options(*child_options)
+            options.append(option)
+        return options
+
+    @property
+    def size(self) -> int:
+        """Number of relationships loaded by the plan."""
+        return sum(1 + child.size for _, _, child in self.branches)
+
+
+def build_tree_plan(
+    model: type[SQLModel],
+    *,
+    depth: int,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+) -> TreePlan:
+    """Plan which relationships to load below ``model``, up to ``depth`` levels.
+
+    Trials lead back to biomodels and passages, so a path follows at most
+    :data:`MAX_TREE_GENERATIONS` of those cyclic branches, and plans loading more than
+    :data:`MAX_TREE_RELATIONSHIPS` relationships are rejected with 422.
+    """
+    include, exclude = set(include), set(exclude)
+    unknown = (include | exclude) - BRANCH_NAMES
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown tree branches: {', '.join(sorted(unknown))}"
+        )
+    plan = _plan(model, depth, MAX_TREE_GENERATIONS, include, exclude)
+    if plan.size > MAX_TREE_RELATIONSHIPS:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"Tree plan loads {plan.size} relationships, more than "
+                f"{MAX_TREE_RELATIONSHIPS}; lower depth or use include/exclude"
+            ),
+        )
+    return plan
+
+
+def _plan(
+    model: type[SQLModel], depth: int, generations: int, include: set[str], exclude: set[str]
+) -> TreePlan:
+    if depth <= 0:
+        return TreePlan(model)
+    branches = []
+    for name in TREE_BRANCHES.get(model, ()):
+        if name in exclude or (include and name not in include):
+            continue
+        remaining = generations - (name in CYCLIC_BRANCHES)
+        if remaining < 0:
+            continue
+        relationship = model_info(model).relationships[name]
+        child = _plan(relationship.target, depth - 1, remaining, include, exclude)
+        branches.append((name, relationship.uselist, child))
+    return TreePlan(model, tuple(branches))
+
+
+def load_tree(session: Session, plan: TreePlan, item_id: str) -> SQLModel:
+    """Load a root entity and its planned subgraph, or raise 404."""
+    model = plan.model
+    info = model_info(model)
+    statement = (
+        select(model)
+        .where(info.pk_column == info.coerce_pk(item_id))
+        .options(*plan.loader_options())
+    )
+    item = session.exec(statement).first()
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    return item
+
+
+def tree_document(item: SQLModel, plan: TreePlan) -> dict[str, Any]:
+    """Nest the column values of an already-loaded tree into plain dicts."""
+    document = model_info(plan.model).row(item)
+    for name, uselist, child_plan in plan.branches:
+        value = getattr(item, name)
+        if uselist:
+            document[name] = [tree_document(child, child_plan) for child in value]
+        else:
+            document[name] = None if value is None else tree_document(value, child_plan)
+    return document
@@ -0,0 +1,294 @@
+"""Trials read and written together with their PDX, PDO or LC subtype.
+
+A trial and its subtype share the primary key but live in separate tables, each with
+its own router. :func:`list_trial_details` reads a page of trials with their subtype,
+PDX mouse and LC FACS row through outer joins in a single query, and
+:func:`create_trial_detail` inserts a trial and its subtype in one transaction.
+:func:`create_trial_graph` goes further and inserts a whole trial workflow (subtype,
+mouse, implants, measures, images, cryopreservations and usage records) at once.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from models import (
+    FACS,
+    Cryopreservation,
+    Image,
+    Implant,
+    LCTrial,
+    Measure,
+    Mouse,
+    PDOTrial,
+    PDXTrial,
+    Trial,
+    UsageRecord,
+)
+from pydantic import create_model
+from sqlalchemy import select
+from sqlmodel import Session, SQLModel
+
+from app.services.cache import invalidate_model
+from app.services.crud import apply_filters, commit_or_400
+from app.services.registry import model_info
+from app.services.search import index_rows
+from app.services.stats import mark_stale
+
+TrialType = Literal["pdx", "pdo", "lc"]
+
+# Subtype tables by trial type, keyed in the output by their relationship name.
+SUBTYPES: dict[TrialType, tuple[str, type[SQLModel]]] = {
+    "pdx": ("pdx_trial", PDXTrial),
+    "pdo": ("pdo_trial", PDOTrial),
+    "lc": ("lc_trial", LCTrial),
+}
+# One-to-one children nested inside a subtype, with their foreign key to it.
+SUBTYPE_CHILDREN: dict[type[SQLModel], tuple[str, type[SQLModel], str]] = {
+    PDXTrial: ("mouse", Mouse, "pdx_trial_id"),
+    LCTrial: ("facs", FACS, "lc_trial_id"),
+}
+# Rows created under each node of a trial graph: (name, model, foreign key, many).
+GRAPH_CHILDREN: dict[type[SQLModel], tuple[tuple[str, type[SQLModel], str, bool], ...]] = {
+    Trial: (
+        *((name, model, "id", False) for name, model in SUBTYPES.values()),
+        ("images", Image, "trial_id", True),
+        ("cryopreservations", Cryopreservation, "trial_id", True),
+        ("usage_records", UsageRecord, "trial_id", True),
+    ),
+    PDXTrial: (("mouse", Mouse, "pdx_trial_id", False),),
+    LCTrial: (("facs", FACS, "lc_trial_id", False),),
+    Mouse: (("implants", Implant, "mouse_id", True),),
+    Implant: (("measures", Measure, "implant_id", True),),
+}
+
+
+def _fields(model: type[SQLModel], *, exclude: Sequence[str] = ()) -> dict[str, Any]:
+    return {
+        name: (field.annotation, field)
+        for name, field in model.model_fields.items()
+        if name not in exclude
+    }
+
+
+def _read_model(model: type[SQLModel], **nested: Any) -> type[SQLModel]:
+    return create_model(f"{model.__name__}Read", __base__=SQLModel, **_fields(model), **nested)
+
+
+_MouseRead = _read_model(Mouse)
+_FACSRead = _read_model(FACS)
+_SUBTYPE_READ = {
+    PDXTrial: _read_model(PDXTrial, mouse=(_MouseRead | None, None)),
+    PDOTrial: _read_model(PDOTrial),
+    LCTrial: _read_model(LCTrial, facs=(_FACSRead | None, None)),
+}
+
+TrialDetail = create_model(
+    "TrialDetail",
+    __base__=SQLModel,
+    __doc__="A trial with its subtype row, if any, and the subtype's mouse or FACS.",
+    **_fields(Trial),
+    type=(TrialType | None, None),
+    **{name: (_SUBTYPE_READ[model] | None, None) for name, model in SUBTYPES.values()},
+)
+
+TrialDetailCreate = create_model(
+    "TrialDetailCreate",
+    __base__=SQLModel,
+    __doc__="A trial and at most one subtype, inserted together.",
+    **_fields(Trial),
+    **{
+        name: (
+            create_model(
+                f"{model.__name__}Create", __base__=SQLModel, **_fields(model, exclude=("id",))
+            )
+            | None,
+            None,
+        )
+        for name, model in SUBTYPES.values()
+    },
+)
+
+
+def _graph_model(
+    model: type[SQLModel], suffix: str, exclude: Sequence[str] = (), doc: str | None = None
+) -> Any:
+    """Nest the :data:`GRAPH_CHILDREN` of a model; inputs omit the keys to their parent."""
+    children: dict[str, Any] = {}
+    for name, child, foreign_key, many in GRAPH_CHILDREN.get(model, ()):
+        nested = _graph_model(child, suffix, (foreign_key,) if suffix == "Create" else ())
+        children[name] = (list[nested], []) if many else (nested | None, None)
+    return create_model(
+        f"{model.__name__}Graph{suffix}",
+        __base__=SQLModel,
+        __doc__=doc,
+        **_fields(model, exclude=exclude),
+        **children,
+    )
+
+
+TrialGraph = _graph_model(Trial, "", doc="A created trial with every row created under it.")
+TrialGraphCreate = _graph_model(
+    Trial, "Create", doc="A trial and the rows created under it; ids are generated if omitted."
+)
+
+
+def _labelled(prefix: str, model: type[SQLModel]) -> list[Any]:
+    return [column.label(f"{prefix}__{column.key}") for column in model_info(model).columns]
+
+
+def trial_detail_statement(
+    *,
+    limit: int,
+    offset: int = 0,
+    filters: Mapping[str, Sequence[str]] | None = None,
+    trial_type: TrialType | None = None,
+    after: str | None = None,
+    ids: Sequence[Any] = (),
+) -> Any:
+    """Select a page of trials joined to every subtype table and their children.
+
+    The page is chosen on ``trial`` alone in a subquery, so ``LIMIT`` counts trials
+    rather than joined rows; the outer query adds the subtype columns.
+    """
+    info = model_info(Trial)
+    page = apply_filters(select(info.pk_column).order_by(info.pk_column), Trial, filters)
+    if trial_type is not None:
+        page = page.where(info.pk_column.in_(select(SUBTYPES[trial_type][1].id)))
+    if after is not None:
+        page = page.where(info.pk_column > info.coerce_pk(after))
+    if ids:
+        page = page.where(info.pk_column.in_(ids))
+    page = page.offset(offset).limit(limit).subquery("page")
+
+    columns = _labelled("trial", Trial)
+    joined = page.join(Trial, Trial.id == page.c.id)
+    for name, model in SUBTYPES.values():
+        columns += _labelled(name, model)
+        joined = joined.outerjoin(model, model.id == Trial.id)
+    for model, (name, child, foreign_key) in SUBTYPE_CHILDREN.items():
+        columns += _labelled(name, child)
+        joined = joined.outerjoin(child, getattr(child, foreign_key) == model.id)
+    return select(*columns).select_from(joined).order_by(Trial.id, Mouse.id)
+
+
+def _section(row: Mapping[str, Any], prefix: str, model: type[SQLModel]) -> dict[str, Any] | None:
+    info = model_info(model)
+    values = {name: row[f"{prefix}__{name}"] for name in info.column_names}
+    return values if values[info.pk_name] is not None else None
+
+
+def fold_trial_rows(rows: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Nest joined rows into one document per trial.
+
+    A PDX trial is modelled with a single mouse; if several exist, the first by id
+    is returned, as the trial tree does.
+    """
+    trials: dict[Any, dict[str, Any]] = {}
+    for row in rows:
+        trial_id = row["trial__id"]
+        if trial_id in trials:
+            continue
+        trial = _section(row, "trial", Trial)
+        trial["type"] = None
+        for trial_type, (name, model) in SUBTYPES.items():
+            subtype = _section(row, name, model)
+            if subtype is not None:
+                trial["type"] = trial_type
+                if model in SUBTYPE_CHILDREN:
+                    child_name, child, _ = SUBTYPE_CHILDREN[model]
+                    subtype[child_name] = _section(row, child_name, child)
+            trial[name] = subtype
+        trials[trial_id] = trial
+    return list(trials.values())
+
+
+def list_trial_details(session: Session, **page: Any) -> list[dict[str, Any]]:
+    """Read a page of trial documents; see :func:`trial_detail_statement`."""
+    rows = session.execute(trial_detail_statement(**page)).mappings().all()
+    return fold_trial_rows(rows)
+
+
+def get_trial_detail(session: Session, item_id: str) -> dict[str, Any]:
+    """Read one trial document or raise 404."""
+    pk = model_info(Trial).coerce_pk(item_id)
+    found = list_trial_details(session, limit=1, ids=[pk])
+    if not found:
+        raise HTTPException(status_code=404, detail="Trial not found")
+    return found[0]
+
+
+def _subtypes(payload: SQLModel) -> list[tuple[str, type[SQLModel]]]:
+    subtypes = [
+        (name, model) for name, model in SUBTYPES.values() if getattr(payload, name) is not None
+    ]
+    if len(subtypes) > 1:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A trial has one subtype at most, got {', '.join(n for n, _ in subtypes)}",
+        )
+    return subtypes
+
+
+def create_trial_detail(session: Session, payload: SQLModel) -> dict[str, Any]:
+    """Insert a trial and its subtype row in one transaction and return the document."""
+    subtypes = _subtypes(payload)
+    trial = Trial.model_validate(payload.model_dump(include=set(Trial.model_fields)))
+    rows: list[tuple[type[SQLModel], SQLModel]] = [(Trial, trial)]
+    for name, model in subtypes:
+        values = getattr(payload, name).model_dump()
+        rows.append((model, model.model_validate({**values, "id": trial.id})))
+
+    for model, row in rows:
+        session.add(row)
+        index_rows(session, model, [row.model_dump()])
+    mark_stale(session, *(model.__tablename__ for model, _ in rows))
+    commit_or_400(session)
+    for model, _ in rows:
+        invalidate_model(model)
+    return get_trial_detail(session, str(trial.id))
+
+
+def _graph_rows(
+    model: type[SQLModel],
+    payload: SQLModel,
+    parent: dict[str, Any],
+    rows: list[tuple[type[SQLModel], SQLModel]],
+) -> dict[str, Any]:
+    """Validate one node and its children into ``rows``, parents first; returns the node."""
+    values = payload.model_dump(include=set(model.model_fields))
+    row = model.model_validate({**values, **parent})
+    rows.append((model, row))
+    node = row.model_dump()
+    pk = node[model_info(model).pk_name]
+    for name, child, foreign_key, many in GRAPH_CHILDREN.get(model, ()):
+        value = getattr(payload, name)
+        if many:
+            node[name] = [_graph_rows(child, item, {foreign_key: pk}, rows) for item in value]
+        elif value is not None:
+            node[name] = _graph_rows(child, value, {foreign_key: pk}, rows)
+        else:
+            node[name] = None
+    return node
+
+
+def create_trial_graph(session: Session, payload: SQLModel) -> dict[str, Any]:
+    """Insert a trial and every row nested under it with one flush and one commit.
+
+    Ids left out are generated before the insert, so the children can reference their
+    parents; the unit of work orders the inserts by foreign key and batches each table.
+    Either the whole graph is stored or nothing is.
+    """
+    _subtypes(payload)
+    rows: list[tuple[type[SQLModel], SQLModel]] = []
+    graph = _graph_rows(Trial, payload, {}, rows)
+
+    session.add_all([row for _, row in rows])
+    models = list(dict.fromkeys(model for model, _ in rows))
+    for model in models:
+        index_rows(session, model, [row.model_dump() for kind, row in rows if kind is model])
+    mark_stale(session, *(model.__tablename__ for model in models))
+    commit_or_400(session)
+    for model in models:
+        invalidate_model(model)
+    return graph
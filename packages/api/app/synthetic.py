@@ -0,0 +1,324 @@
+"""Generate a large, deterministic synthetic dataset shaped like the seed graph.
+
+Usage:
+    generate-data --scale 6250            # ~1M measures
+    generate-data --scale 100 --seed 7 --shape measures_per_implant=40
+
+``--scale`` is the number of patients. Each patient gets the subtree described by
+:class:`SyntheticShape` (tumor, sample, biomodel, passages, PDX/PDO/LC trials, mice,
+implants, measures, FACS and usage records). The same ``--seed`` and scale always
+produce the same rows, whatever the chunk size, so benchmark runs are comparable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, fields, replace
+from datetime import date, timedelta
+from typing import Any
+from uuid import UUID
+
+from models import (
+    FACS,
+    Biomodel,
+    Implant,
+    LCTrial,
+    Measure,
+    Mouse,
+    Passage,
+    Patient,
+    PDOTrial,
+    PDXTrial,
+    Sample,
+    Trial,
+    Tumor,
+    UsageRecord,
+)
+from sqlmodel import Session, SQLModel
+
+from app.core.database import create_db_and_tables, get_engine
+from app.services.bulk import insert_statement, write_rows
+from app.services.cache import invalidate_model
+
+GENERATE_CHUNK_SIZE = 1000
+PATIENTS_PER_BATCH = 50
+
+ORIGIN = date(2020, 1, 6)
+ORGANS = ("Lung", "Colon", "Breast", "Pancreas", "Liver", "Kidney")
+CLASSIFICATIONS = ("Adenocarcinoma", "Carcinoma", "Sarcoma", "Melanoma")
+STRAINS = ("NSG", "NOD-SCID", "Nude")
+
+
+@dataclass(frozen=True)
+class SyntheticShape:
+    """Number of children generated per parent row."""
+
+    passages_per_biomodel: int = 2
+    mice_per_pdx_trial: int = 4
+    implants_per_mouse: int = 1
+    measures_per_implant: int = 20
+    usage_records_per_trial: int = 1
+
+    def rows_per_patient(self) -> dict[str, int]:
+        """Rows generated for one patient, by table name."""
+        passages = self.passages_per_biomodel
+        mice = passages * self.mice_per_pdx_trial
+        implants = mice * self.implants_per_mouse
+        return {
+            "patient": 1,
+            "tumor": 1,
+            "sample": 1,
+            "biomodel": 1,
+            "passage": passages,
+            "trial": passages * 3,
+            "pdx_trial": passages,
+            "pdo_trial": passages,
+            "lc_trial": passages,
+            "mouse": mice,
+            "implant": implants,
+            "measure": implants * self.measures_per_implant,
+            "facs": passages,
+            "usage_record": passages * 3 * self.usage_records_per_trial,
+        }
+
+
+DEFAULT_SHAPE = SyntheticShape()
+
+# Tables written in foreign-key order; every row of a batch has the same keys.
+GENERATED_MODELS: tuple[type[SQLModel], ...] = (
+    Patient,
+    Tumor,
+    Sample,
+    Biomodel,
+    Passage,
+    Trial,
+    PDXTrial,
+    PDOTrial,
+    LCTrial,
+    Mouse,
+    Implant,
+    Measure,
+    FACS,
+    UsageRecord,
+)
+
+
+def patient_rows(
+    index: int, *, seed: int = 0, shape: SyntheticShape = DEFAULT_SHAPE
+) -> dict[str, list[dict[str, Any]]]:
+    """Build the rows of one patient's subtree, keyed by table name.
+
+    The random stream is seeded per patient, so a patient's rows depend only on
+    ``seed`` and ``index``.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    rows: dict[str, list[dict[str, Any]]] = {model.__tablename__: [] for model in GENERATED_MODELS}
+
+    def new_id() -> UUID:
+        return UUID(int=rng.getrandbits(128), version=4)
+
+    def day(start: date, low: int, high: int) -> date:
+        return start + timedelta(days=rng.randint(low, high))
+
+    nhc = f"SYN-PAT-{index:07d}"
+    biobank_code = f"SYN-TUMOR-{index:07d}"
+    registered = day(ORIGIN, 0, 1500)
+    rows["patient"].append(
+        {
+            "nhc": nhc,
+            "sex": rng.choice(("female", "male")),
+            "birth_date": day(date(1940, 1, 1), 0, 50 * 365),
+        }
+    )
+    rows["tumor"].append(
+        {
+            "biobank_code": biobank_code,
+            "lab_code": f"LAB-SYN-{index:07d}",
+            "classification": rng.choice(CLASSIFICATIONS),
+            "grade": f"G{rng.randint(1, 3)}",
+            "organ": rng.choice(ORGANS),
+            "status": "Active",
+            "registration_date": registered,
+            "operation_date": day(registered, 1, 30),
+            "patient_nhc": nhc,
+        }
+    )
+    rows["sample"].append(
+        {
+            "id": new_id(),
+            "has_serum": rng.random() < 0.8,
+            "biopsy_date": day(registered, 1, 30),
+            "tumor_biobank_code": biobank_code,
+        }
+    )
+    biomodel_id = new_id()
+    created = day(registered, 14, 60)
+    rows["biomodel"].append(
+        {
+            "id": biomodel_id,
+            "type": "PDX",
+            "creation_date": created,
+            "status": "Active",
+            "progresses": rng.random() < 0.7,
+            "viability": round(rng.uniform(50, 100), 1),
+            "tumor_biobank_code": biobank_code,
+        }
+    )
+
+    for number in range(1, shape.passages_per_biomodel + 1):
+        passage_id = new_id()
+        rows["passage"].append({"id": passage_id, "number": number, "biomodel_id": biomodel_id})
+        trial_start = day(created, 30 * number, 30 * number + 20)
+        trial_ids = [new_id() for _ in range(3)]
+        for trial_id in trial_ids:
+            rows["trial"].append(
+                {
+                    "id": trial_id,
+                    "success": rng.random() < 0.6,
+                    "creation_date": trial_start,
+                    "passage_id": passage_id,
+                }
+            )
+            for _ in range(shape.usage_records_per_trial):
+                rows["usage_record"].append(
+                    {
+                        "id": new_id(),
+                        "record_type": "Synthetic",
+                        "record_date": day(trial_start, 1, 60),
+                        "trial_id": trial_id,
+                    }
+                )
+        pdx_id, pdo_id, lc_id = trial_ids
+        rows["pdx_trial"].append({"id": pdx_id, "ffpe": rng.random() < 0.5})
+        rows["pdo_trial"].append({"id": pdo_id, "organoid_count": rng.randint(10, 200)})
+        rows["lc_trial"].append({"id": lc_id, "confluence": round(rng.uniform(20, 100), 1)})
+        rows["facs"].append(
+            {
+                "id": new_id(),
+                "measure": "FITC",
+                "measure_value": round(rng.uniform(0, 10), 2),
+                "lc_trial_id": lc_id,
+            }
+        )
+
+        for _ in range(shape.mice_per_pdx_trial):
+            mouse_id = new_id()
+            rows["mouse"].append(
+                {
+                    "id": mouse_id,
+                    "birth_date": day(trial_start, -120, -60),
+                    "strain": rng.choice(STRAINS),
+                    "sex": rng.choice(("female", "male")),
+                    "pdx_trial_id": pdx_id,
+                }
+            )
+            for _ in range(shape.implants_per_mouse):
+                implant_id = new_id()
+                rows["implant"].append(
+                    {
+                        "id": implant_id,
+                        "implant_location": "Flank",
+                        "type": "Subcutaneous",
+                        "mouse_id": mouse_id,
+                    }
+                )
+                # Exponential growth with noise, measured twice a week.
+                volume = rng.uniform(20, 80)
+                rate = rng.uniform(0.02, 0.12)
+                measured = day(trial_start, 3, 10)
+                for _ in range(shape.measures_per_implant):
+                    rows["measure"].append(
+                        {
+                            "id": new_id(),
+                            "measure_date": measured,
+                            "measure_value": round(volume, 2),
+                            "implant_id": implant_id,
+                        }
+                    )
+                    step = rng.choice((3, 4))
+                    measured += timedelta(days=step)
+                    volume *= (1 + rate) ** step * rng.uniform(0.95, 1.05)
+    return rows
+
+
+def generate(
+    session: Session,
+    scale: int,
+    *,
+    seed: int = 0,
+    shape: SyntheticShape = DEFAULT_SHAPE,
+    chunk_size: int = GENERATE_CHUNK_SIZE,
+) -> dict[str, int]:
+    """Insert ``scale`` synthetic patient subtrees and return rows written per table.
+
+    Patients are generated and committed in batches, each batch written table by
+    table with multi-row inserts, so memory stays bounded at any scale. Rows that
+    already exist are skipped, so rerunning with the same seed is a no-op.
+    """
+    statements = {
+        model.__tablename__: insert_statement(session, model, "ignore")
+        for model in GENERATED_MODELS
+    }
+    written = dict.fromkeys(statements, 0)
+    for first in range(0, scale, PATIENTS_PER_BATCH):
+        batch: dict[str, list[dict[str, Any]]] = {name: [] for name in statements}
+        for index in range(first, min(first + PATIENTS_PER_BATCH, scale)):
+            for name, rows in patient_rows(index, seed=seed, shape=shape).items():
+                batch[name].extend(rows)
+        for name, statement in statements.items():
+            accepted, errors = write_rows(
+                session, statement, list(enumerate(batch[name])), chunk_size=chunk_size
+            )
+            if errors:
+                raise RuntimeError(f"{name}: {errors[0].detail}")
+            written[name] += accepted
+        session.commit()
+    for model in GENERATED_MODELS:
+        invalidate_model(model)
+    return written
+
+
+def _parse_shape(overrides: Sequence[str]) -> SyntheticShape:
+    names = {field.name for field in fields(SyntheticShape)}
+    values = {}
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in names or not value.isdigit():
+            raise SystemExit(f"Invalid --shape {override!r}; use one of {sorted(names)}=N")
+        values[name] = int(value)
+    return replace(DEFAULT_SHAPE, **values)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset")
+    parser.add_argument("--scale", type=int, default=100, help="Patients to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--shape",
+        action="append",
+        default=[],
+        metavar="NAME=N",
+        help="Override a SyntheticShape count, e.g. measures_per_implant=40",
+    )
+    parser.add_argument("--chunk-size", type=int, default=GENERATE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    shape = _parse_shape(args.shape)
+    create_db_and_tables()
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        written = generate(
+            session, args.scale, seed=args.seed, shape=shape, chunk_size=args.chunk_size
+        )
+    seconds = time.perf_counter() - started
+    total = sum(written.values())
+    for name, count in written.items():
+        print(f"{name}: {count}")
+    print(f"Generated {total} rows in {seconds:.1f}s ({total / seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare validated and fast list serialization on an in-memory database.
+
+Usage:
+    uv run python benchmarks/bench_serialization.py --rows 100 --repeat 500
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from uuid import UUID
+
+from models import Biomodel, Implant, Measure, Mouse, Passage, Patient, PDXTrial, Trial, Tumor
+from pydantic import TypeAdapter
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.services.crud import list_items, list_rows
+from app.services.serialization import dumps
+
+
+def build_database(rows: int) -> Session:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(0)
+    ids = [UUID(int=rng.getrandbits(128)) for _ in range(8)]
+    session = Session(engine)
+    session.add_all(
+        [
+            Patient(nhc="P1"),
+            Tumor(biobank_code="T1", patient_nhc="P1"),
+            Biomodel(id=ids[0], tumor_biobank_code="T1"),
+            Passage(id=ids[1], biomodel_id=ids[0]),
+            Trial(id=ids[2], passage_id=ids[1]),
+            PDXTrial(id=ids[2]),
+            Mouse(id=ids[3], pdx_trial_id=ids[2]),
+            Implant(id=ids[4], mouse_id=ids[3]),
+        ]
+    )
+    session.add_all(
+        Measure(
+            id=UUID(int=rng.getrandbits(128)),
+            implant_id=ids[4],
+            measure_date=date(2024, 1, 1) + timedelta(days=index),
+            measure_value=rng.uniform(50, 1500),
+        )
+        for index in range(rows)
+    )
+    session.commit()
+    return session
+
+
+def time_path(label: str, render, repeat: int) -> dict[str, float | str]:
+    render()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    elapsed = time.perf_counter() - start
+    return {"path": label, "ms_per_page": round(elapsed / repeat * 1000, 4)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page (default: 100)")
+    parser.add_argument("--repeat", type=int, default=500, help="Pages rendered per path")
+    args = parser.parse_args()
+
+    session = build_database(args.rows)
+    adapter = TypeAdapter(list[Measure])
+
+    def validated() -> bytes:
+        # What FastAPI does with response_model=list[Measure]: validate, then dump.
+        items = list_items(session, Measure, offset=0, limit=args.rows)
+        validated_items = adapter.validate_python(items, from_attributes=True)
+        return adapter.dump_json(validated_items)
+
+    def fast() -> bytes:
+        return dumps(list_rows(session, Measure, offset=0, limit=args.rows))
+
+    assert json.loads(validated()) == json.loads(fast())
+    results = [time_path("validated", validated, args.repeat), time_path("fast", fast, args.repeat)]
+    speedup = results[0]["ms_per_page"] / results[1]["ms_per_page"]
+    print(
+        json.dumps({"rows": args.rows, "results": results, "speedup": round(speedup, 2)}, indent=2)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Point the app at a throwaway SQLite database before any app module reads settings.
+_db_dir = tempfile.mkdtemp(prefix="techconnect-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'test.db'}"
+# The response cache is off by default; the tests run in one process, so enable it.
+os.environ.setdefault("RESPONSE_CACHE_SIZE", "2048")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.seed import seed_database  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def seeded_client():
+    """Client backed by a database holding the deterministic seed dataset."""
+    with TestClient(app) as client:
+        seed_database()
+        yield client
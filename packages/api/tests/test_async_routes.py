@@ -0,0 +1,54 @@
+import inspect
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models import Patient
+
+from app.api.endpoints.entities import build_entity_router
+from app.core.database import get_async_database_url
+
+
+@pytest.fixture(scope="module")
+def async_client(seeded_client):
+    app = FastAPI()
+    app.include_router(
+        build_entity_router(Patient, prefix="patients", tag="Patients", async_session=True)
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_routes_are_coroutines():
+    router = build_entity_router(Patient, prefix="patients", tag="Patients", async_session=True)
+    handlers = {route.name: route.endpoint for route in router.routes}
+    crud_handlers = ("read_items", "read_item", "create_entity", "update_entity", "delete_entity")
+    assert all(inspect.iscoroutinefunction(handlers[name]) for name in crud_handlers)
+
+
+def test_async_crud_round_trip(async_client):
+    created = async_client.post("/patients", json={"nhc": "ASYNC-001", "sex": "female"})
+    assert created.status_code == 200
+
+    updated = async_client.patch("/patients/ASYNC-001", json={"nhc": "ASYNC-001", "sex": "male"})
+    assert updated.json()["sex"] == "male"
+
+    listed = async_client.get("/patients", params={"limit": 100})
+    assert "ASYNC-001" in {row["nhc"] for row in listed.json()}
+
+    assert async_client.delete("/patients/ASYNC-001").json() == {"ok": True}
+    assert async_client.get("/patients/ASYNC-001").status_code == 404
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("sqlite:///techconnect.db", "sqlite+aiosqlite:///techconnect.db"),
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("mysql+pymysql://u:p@db/app", "mysql+aiomysql://u:p@db/app"),
+        ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert get_async_database_url(url) == expected
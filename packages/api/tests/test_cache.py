@@ -0,0 +1,162 @@
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models import Patient
+from sqlalchemy import event
+
+from app.api.endpoints.entities import build_entity_router
+from app.core.database import get_engine
+from app.services.cache import (
+    TTLCache,
+    get_response_store,
+    invalidate_model,
+    model_generation,
+    set_response_store,
+)
+from app.services.serialization import body_etag
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_of_size_zero_stores_nothing():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_model_bumps_generation():
+    before = model_generation(Patient)
+    invalidate_model(Patient)
+    assert model_generation(Patient) == before + 1
+
+
+def count_statements(client, url, **kwargs):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    try:
+        response = client.get(url, **kwargs)
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", record)
+    return response, len(statements)
+
+
+def test_get_is_served_from_cache_with_etag(seeded_client):
+    first, _ = count_statements(seeded_client, "/api/patients/SEED-PAT-002")
+    second, queries = count_statements(seeded_client, "/api/patients/SEED-PAT-002")
+    assert queries == 0
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    not_modified, queries = count_statements(
+        seeded_client,
+        "/api/patients/SEED-PAT-002",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert queries == 0
+
+
+def test_write_invalidates_cached_list(seeded_client):
+    params = {"limit": 100}
+    before = seeded_client.get("/api/tumors", params=params)
+    etag = before.headers["ETag"]
+    assert (
+        seeded_client.get("/api/tumors", params=params, headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+
+    tumor = before.json()[0]
+    seeded_client.patch(f"/api/tumors/{tumor['biobank_code']}", json={"classification": "Revised"})
+    after = seeded_client.get("/api/tumors", params=params, headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert after.json()[0]["classification"] == "Revised"
+
+
+def test_response_store_is_pluggable(seeded_client):
+    class DictStore:
+        def __init__(self):
+            self.entries = {}
+
+        def get(self, key):
+            return self.entries.get(key)
+
+        def set(self, key, value):
+            self.entries[key] = value
+
+    store = DictStore()
+    previous = get_response_store()
+    set_response_store(store)
+    try:
+        seeded_client.get("/api/patients/SEED-PAT-001")
+    finally:
+        set_response_store(previous)
+    assert [key.split(":", 2)[2] for key in store.entries] == ["/api/patients/SEED-PAT-001?"]
+
+
+@pytest.fixture(params=[True, False], ids=["cached", "uncached"])
+def patient_client(request, seeded_client):
+    """Client for patient routes built with the response cache on or off."""
+    api = FastAPI()
+    api.include_router(
+        build_entity_router(
+            Patient, prefix="patients", tag="patients", cache_responses=request.param
+        ),
+        prefix="/api",
+    )
+    with TestClient(api) as client:
+        yield client
+
+
+def test_etag_matches_body_sent(patient_client):
+    response = patient_client.get("/api/patients/SEED-PAT-001")
+    assert response.headers["ETag"] == body_etag(response.content)
+
+    not_modified = patient_client.get(
+        "/api/patients/SEED-PAT-001", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == response.headers["ETag"]
+
+
+def test_if_match_accepts_etag_of_body_sent(patient_client):
+    nhc = f"ETAG-{uuid4().hex[:8]}"
+    patient_client.post("/api/patients", json={"nhc": nhc, "sex": "female"})
+    etag = patient_client.get(f"/api/patients/{nhc}").headers["ETag"]
+
+    updated = patient_client.patch(
+        f"/api/patients/{nhc}", json={"sex": "male"}, headers={"If-Match": etag}
+    )
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] == body_etag(updated.content)
+    assert updated.headers["ETag"] == patient_client.get(f"/api/patients/{nhc}").headers["ETag"]
+
+    stale = patient_client.patch(
+        f"/api/patients/{nhc}", json={"sex": "female"}, headers={"If-Match": etag}
+    )
+    assert stale.status_code == 412
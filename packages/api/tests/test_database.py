@@ -0,0 +1,35 @@
+import pytest
+from database import get_engine_options
+from pydantic import ValidationError
+from sqlalchemy import text
+
+from app.core.config import Settings
+from app.core.database import engine_tuning, get_engine
+
+
+def test_sqlite_pragmas_applied():
+    with get_engine().connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_engine_options_for_postgres_statement_timeout():
+    settings = Settings(db_pool_size=20, db_statement_timeout_ms=15000)
+    options = get_engine_options("postgresql://user:pass@db/app", engine_tuning(settings))
+    assert options["pool_size"] == 20
+    assert options["connect_args"] == {"options": "-c statement_timeout=15000"}
+
+    async_options = get_engine_options(
+        "postgresql+asyncpg://user:pass@db/app", engine_tuning(settings)
+    )
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "15000"}}
+
+
+def test_engine_options_for_in_memory_sqlite_skip_pool_sizing():
+    options = get_engine_options("sqlite://", engine_tuning(Settings()))
+    assert "pool_size" not in options
+
+
+def test_sqlite_pragma_settings_reject_unknown_modes():
+    with pytest.raises(ValidationError):
+        Settings(sqlite_journal_mode="WAL; DROP TABLE patient")
@@ -0,0 +1,222 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import get_engine
+
+TRIAL_PDX_ID = "40000000-0000-0000-0000-000000000001"
+TRIAL_PDO_ID = "40000000-0000-0000-0000-000000000002"
+
+
+def test_list_filters_by_foreign_key(seeded_client):
+    response = seeded_client.get("/api/usage-records", params={"trial_id": TRIAL_PDX_ID})
+    assert response.status_code == 200
+    assert [row["trial_id"] for row in response.json()] == [TRIAL_PDX_ID]
+
+
+def test_list_filters_with_repeated_values(seeded_client):
+    response = seeded_client.get(
+        "/api/usage-records", params=[("trial_id", TRIAL_PDX_ID), ("trial_id", TRIAL_PDO_ID)]
+    )
+    assert response.status_code == 200
+    assert sorted(row["trial_id"] for row in response.json()) == [TRIAL_PDX_ID, TRIAL_PDO_ID]
+
+
+def test_list_filters_by_string_foreign_key(seeded_client):
+    assert seeded_client.post("/api/patients", json={"nhc": "FILTER-PAT"}).status_code == 200
+    tumor = {"biobank_code": "FILTER-T1", "patient_nhc": "FILTER-PAT"}
+    assert seeded_client.post("/api/tumors", json=tumor).status_code == 200
+
+    response = seeded_client.get("/api/tumors", params={"patient_nhc": "SEED-PAT-001"})
+    assert response.status_code == 200
+    codes = {row["biobank_code"] for row in response.json()}
+    assert "SEED-TUMOR-001" in codes and "FILTER-T1" not in codes
+    assert {row["patient_nhc"] for row in response.json()} == {"SEED-PAT-001"}
+
+    response = seeded_client.get("/api/tumors", params={"patient_nhc": "FILTER-PAT"})
+    assert [row["biobank_code"] for row in response.json()] == ["FILTER-T1"]
+
+
+def test_list_filter_rejects_invalid_uuid(seeded_client):
+    response = seeded_client.get("/api/mice", params={"pdx_trial_id": "not-a-uuid"})
+    assert response.status_code == 422
+
+
+def test_filters_are_documented(seeded_client):
+    spec = seeded_client.get("/openapi.json").json()
+    parameters = spec["paths"]["/api/implants"]["get"]["parameters"]
+    assert "mouse_id" in {parameter["name"] for parameter in parameters}
+
+
+def test_cursor_pagination_walks_all_rows_once(seeded_client):
+    expected = [row["id"] for row in seeded_client.get("/api/usage-records").json()]
+    assert expected == sorted(expected)
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = seeded_client.get("/api/usage-records", params=params)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+    assert seen == expected
+
+
+def test_cursor_pagination_rejects_bad_cursor(seeded_client):
+    response = seeded_client.get("/api/usage-records", params={"cursor": "%%%"})
+    assert response.status_code == 422
+
+
+def test_bulk_create_reports_row_errors_without_aborting(seeded_client):
+    rows = [
+        {"nhc": "BULK-001", "sex": "female"},
+        {"sex": "missing primary key"},
+        {"nhc": "SEED-PAT-001"},
+        {"nhc": "BULK-002"},
+    ]
+    response = seeded_client.post("/api/patients/bulk", json=rows)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 2
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert seeded_client.get("/api/patients/BULK-002").status_code == 200
+
+
+def test_bulk_upsert_from_ndjson(seeded_client):
+    body = '{"nhc": "BULK-003", "sex": "male"}\n{"nhc": "BULK-003", "sex": "female"}\n'
+    response = seeded_client.post(
+        "/api/patients/bulk",
+        params={"on_conflict": "update"},
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"accepted": 2, "errors": []}
+    assert seeded_client.get("/api/patients/BULK-003").json()["sex"] == "female"
+
+
+def test_export_ndjson_honors_filters(seeded_client):
+    response = seeded_client.get(
+        "/api/usage-records/export", params={"format": "ndjson", "trial_id": TRIAL_PDX_ID}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["trial_id"] for row in rows] == [TRIAL_PDX_ID]
+
+
+def test_export_csv_has_header_and_rows(seeded_client):
+    response = seeded_client.get("/api/usage-records/export", params={"format": "csv"})
+    assert response.status_code == 200
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames[:2] == ["id", "record_type"]
+    assert len(list(reader)) == 3
+
+
+def test_export_parquet(seeded_client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = seeded_client.get("/api/measures/export", params={"format": "parquet"})
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("measure_value").to_pylist() == [365.0]
+
+
+def test_total_count_header_tracks_filters_and_writes(seeded_client):
+    params = {"trial_id": TRIAL_PDX_ID, "include_total": True}
+    assert seeded_client.get("/api/images", params=params).headers["X-Total-Count"] == "1"
+
+    created = seeded_client.post("/api/images", json={"trial_id": TRIAL_PDX_ID, "type": "IHC"})
+    assert created.status_code == 200
+    assert seeded_client.get("/api/images", params=params).headers["X-Total-Count"] == "2"
+
+    seeded_client.delete(f"/api/images/{created.json()['id']}")
+    assert seeded_client.get("/api/images", params=params).headers["X-Total-Count"] == "1"
+
+
+def test_total_count_header_is_opt_in(seeded_client):
+    assert "X-Total-Count" not in seeded_client.get("/api/images").headers
+
+
+def test_patch_validates_only_sent_fields_in_one_statement(seeded_client):
+    seeded_client.post("/api/patients", json={"nhc": "PATCH-001", "sex": "female"})
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    try:
+        response = seeded_client.patch("/api/patients/PATCH-001", json={"birth_date": "1990-02-03"})
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == {"nhc": "PATCH-001", "sex": "female", "birth_date": "1990-02-03"}
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+
+
+def test_patch_rejects_invalid_field_and_missing_item(seeded_client):
+    invalid = seeded_client.patch("/api/patients/SEED-PAT-001", json={"birth_date": "soon"})
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"][:2] == ["body", "birth_date"]
+
+    missing = seeded_client.patch("/api/patients/NOPE", json={"sex": "male"})
+    assert missing.status_code == 404
+
+
+def test_patch_if_match_rejects_stale_etag(seeded_client):
+    seeded_client.post("/api/patients", json={"nhc": "PATCH-002", "sex": "female"})
+    etag = seeded_client.get("/api/patients/PATCH-002").headers["ETag"]
+
+    first = seeded_client.patch(
+        "/api/patients/PATCH-002", json={"sex": "male"}, headers={"If-Match": etag}
+    )
+    assert first.status_code == 200
+    assert first.headers["ETag"] != etag
+    assert first.headers["ETag"] == seeded_client.get("/api/patients/PATCH-002").headers["ETag"]
+
+    stale = seeded_client.patch(
+        "/api/patients/PATCH-002", json={"sex": "female"}, headers={"If-Match": etag}
+    )
+    assert stale.status_code == 412
+    assert seeded_client.get("/api/patients/PATCH-002").json()["sex"] == "male"
+
+
+def test_list_by_ids_keeps_request_order_and_reports_misses(seeded_client):
+    response = seeded_client.get(
+        "/api/patients", params={"ids": "SEED-PAT-002,NOPE,SEED-PAT-001", "limit": 1}
+    )
+    assert [row["nhc"] for row in response.json()] == ["SEED-PAT-002", "SEED-PAT-001"]
+    assert response.headers["X-Missing-Ids"] == "NOPE"
+
+
+def test_batch_get_coerces_uuids_in_one_query(seeded_client):
+    missing_id = "40000000-0000-0000-0000-0000000000ff"
+    ids = [TRIAL_PDO_ID, missing_id, TRIAL_PDX_ID.upper(), TRIAL_PDO_ID]
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", record)
+    try:
+        response = seeded_client.post("/api/trials/batch-get", json={"ids": ids})
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["id"] for row in body["items"]] == [TRIAL_PDO_ID, TRIAL_PDX_ID]
+    assert body["missing"] == [missing_id]
+    assert len(statements) == 1
+
+
+def test_batch_get_rejects_invalid_ids(seeded_client):
+    assert seeded_client.post("/api/trials/batch-get", json={"ids": ["x"]}).status_code == 422
+    too_many = {"ids": ",".join(f"P{i}" for i in range(501))}
+    assert seeded_client.get("/api/patients", params=too_many).status_code == 422
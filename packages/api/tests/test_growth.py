@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import pytest
+
+MOUSE_ID = "50000000-0000-0000-0000-000000000003"
+PDX_TRIAL_ID = "40000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture(scope="module")
+def growing_implant(seeded_client):
+    """An implant whose volume doubles weekly from 25 mm3, starting 2024-03-05."""
+    implant = seeded_client.post("/api/implants", json={"mouse_id": MOUSE_ID}).json()
+    start = date(2024, 3, 5)
+    measures = [
+        {
+            "implant_id": implant["id"],
+            "measure_date": (start + timedelta(days=day)).isoformat(),
+            "measure_value": 25.0 * 2 ** (day / 7),
+        }
+        for day in range(0, 43, 3)
+    ]
+    assert seeded_client.post("/api/measures/bulk", json=measures).json()["errors"] == []
+    return implant["id"]
+
+
+def test_growth_series_grouped_and_sorted(seeded_client, growing_implant):
+    response = seeded_client.get("/api/growth", params={"mouse_id": MOUSE_ID})
+    assert response.status_code == 200
+    series = {item["implant_id"]: item for item in response.json()}
+    assert set(series) == {growing_implant, "50000000-0000-0000-0000-000000000001"}
+
+    growing = series[growing_implant]
+    assert growing["dates"] == sorted(growing["dates"])
+    assert len(growing["dates"]) == len(growing["values"]) == 15
+    assert growing["doubling_time_days"] == pytest.approx(7)
+    # 100 mm3 is first measured at day 15 after the trial creation date
+    assert growing["latency_weeks"] == pytest.approx(15 / 7)
+
+
+def test_growth_series_weekly_means_and_downsampling(seeded_client, growing_implant):
+    weekly = seeded_client.get(
+        "/api/growth", params={"implant_id": growing_implant, "aggregate": "week"}
+    ).json()[0]
+    assert weekly["dates"][:2] == ["2024-03-05", "2024-03-12"]
+    assert weekly["values"][0] == pytest.approx((25 + 25 * 2 ** (3 / 7) + 25 * 2 ** (6 / 7)) / 3)
+
+    sampled = seeded_client.get(
+        "/api/growth", params={"implant_id": growing_implant, "max_points": 4}
+    ).json()[0]
+    assert sampled["dates"] == ["2024-03-05", "2024-03-20", "2024-04-01", "2024-04-16"]
+
+
+def test_growth_requires_a_selection(seeded_client):
+    assert seeded_client.get("/api/growth").status_code == 422
+
+
+def test_estimate_latency_updates_pdx_trial(seeded_client, growing_implant):
+    response = seeded_client.post(f"/api/growth/pdx-trials/{PDX_TRIAL_ID}/latency")
+    assert response.json()["updated"] is True
+    assert response.json()["latency_weeks"] == pytest.approx(15 / 7)
+    stored = seeded_client.get(f"/api/pdx-trials/{PDX_TRIAL_ID}").json()
+    assert stored["latency_weeks"] == pytest.approx(15 / 7)
+
+    unreached = seeded_client.post(
+        f"/api/growth/pdx-trials/{PDX_TRIAL_ID}/latency", params={"threshold": 1e6}
+    )
+    assert unreached.json() == {
+        "pdx_trial_id": PDX_TRIAL_ID,
+        "latency_weeks": None,
+        "updated": False,
+    }
@@ -0,0 +1,159 @@
+import csv
+
+import pytest
+from models import Biomodel, Passage, Patient, Trial, Tumor
+
+from app.importer import import_files, main
+
+BIOMODEL_ID = "60000000-0000-0000-0000-000000000001"
+PASSAGE_ID = "60000000-0000-0000-0000-000000000002"
+TRIAL_ID = "60000000-0000-0000-0000-000000000003"
+IMPLANT_ID = "50000000-0000-0000-0000-000000000001"
+
+
+def write_csv(path, rows):
+    with path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def test_import_orders_tables_validates_and_resolves_cycles(seeded_client, tmp_path):
+    files = [
+        # Given child-first on purpose: the importer sorts by foreign-key order.
+        (Trial, write_csv(tmp_path / "trial.csv", [{"id": TRIAL_ID, "passage_id": PASSAGE_ID}])),
+        (
+            Biomodel,
+            write_csv(
+                tmp_path / "biomodel.csv",
+                [{"id": BIOMODEL_ID, "tumor_biobank_code": "IMP-T1", "parent_trial_id": TRIAL_ID}],
+            ),
+        ),
+        (
+            Passage,
+            write_csv(
+                tmp_path / "passage.csv",
+                [{"id": PASSAGE_ID, "number": "1", "biomodel_id": BIOMODEL_ID}],
+            ),
+        ),
+        (
+            Tumor,
+            write_csv(
+                tmp_path / "tumor.csv",
+                [
+                    {"biobank_code": "IMP-T1", "patient_nhc": "IMP-001"},
+                    {"biobank_code": "IMP-T2", "patient_nhc": "UNKNOWN"},
+                ],
+            ),
+        ),
+        (
+            Patient,
+            write_csv(
+                tmp_path / "patients.csv",
+                [
+                    {"nhc": "IMP-001", "sex": "female", "birth_date": "1970-01-02"},
+                    {"nhc": "IMP-002", "sex": "", "birth_date": "soon"},
+                ],
+            ),
+        ),
+    ]
+
+    reports, problems = import_files(files, chunk_size=1)
+
+    assert [report.table for report in reports] == [
+        "patient",
+        "tumor",
+        "biomodel",
+        "passage",
+        "trial",
+    ]
+    patient, tumor, *rest = reports
+    assert (patient.read, patient.written) == (2, 1)
+    assert patient.errors[0].index == 1 and "birth_date" in patient.errors[0].detail
+    assert (tumor.written, tumor.errors[0].detail) == (1, "patient_nhc: unknown reference UNKNOWN")
+    assert all(report.written == 1 and not report.errors for report in rest)
+    assert problems == []
+
+    biomodel = seeded_client.get(f"/api/biomodels/{BIOMODEL_ID}").json()
+    assert biomodel["parent_trial_id"] == TRIAL_ID
+    assert seeded_client.get("/api/patients/IMP-001").json()["birth_date"] == "1970-01-02"
+
+
+def test_invalid_cells_reject_only_their_rows(seeded_client, tmp_path):
+    rows = [
+        {"nhc": "CHUNK-001", "birth_date": "1980-03-04"},
+        {"nhc": "CHUNK-002", "birth_date": "not a date"},
+        {"nhc": "CHUNK-003", "birth_date": "1990-05-06"},
+    ]
+    path = write_csv(tmp_path / "patient.csv", rows)
+
+    [report], problems = import_files([(Patient, path)], chunk_size=1000)
+
+    assert (report.read, report.written) == (3, 2)
+    assert [error.index for error in report.errors] == [1]
+    assert problems == []
+    assert seeded_client.get("/api/patients/CHUNK-001").json()["birth_date"] == "1980-03-04"
+    assert seeded_client.get("/api/patients/CHUNK-003").json()["birth_date"] == "1990-05-06"
+    assert seeded_client.get("/api/patients/CHUNK-002").status_code == 404
+
+
+def test_update_keeps_columns_missing_from_the_file(seeded_client, tmp_path):
+    patient = {"nhc": "UPD-001", "sex": "female", "birth_date": "1960-07-08"}
+    assert seeded_client.post("/api/patients", json=patient).status_code == 200
+    tumor = {"biobank_code": "UPD-T1", "patient_nhc": "UPD-001"}
+    assert seeded_client.post("/api/tumors", json=tumor).status_code == 200
+    origin = seeded_client.post("/api/biomodels", json={"tumor_biobank_code": "UPD-T1"}).json()
+    passage = seeded_client.post("/api/passages", json={"biomodel_id": origin["id"]}).json()
+    trial = seeded_client.post("/api/trials", json={"passage_id": passage["id"]}).json()
+    derived = seeded_client.post(
+        "/api/biomodels",
+        json={"tumor_biobank_code": "UPD-T1", "parent_trial_id": trial["id"], "status": "ok"},
+    ).json()
+
+    files = [
+        (Patient, write_csv(tmp_path / "patient.csv", [{"nhc": "UPD-001", "sex": "F"}])),
+        (
+            Biomodel,
+            write_csv(
+                tmp_path / "biomodel.csv",
+                [{"id": derived["id"], "tumor_biobank_code": "UPD-T1", "description": "Revised"}],
+            ),
+        ),
+    ]
+    reports, problems = import_files(files, on_conflict="update", chunk_size=1000)
+
+    assert [report.written for report in reports] == [1, 1] and problems == []
+    assert seeded_client.get("/api/patients/UPD-001").json() == {
+        "nhc": "UPD-001",
+        "sex": "F",
+        "birth_date": "1960-07-08",
+    }
+    updated = seeded_client.get(f"/api/biomodels/{derived['id']}").json()
+    assert updated["description"] == "Revised"
+    assert (updated["status"], updated["parent_trial_id"]) == ("ok", trial["id"])
+
+
+def test_import_parquet_with_generated_ids(seeded_client, tmp_path, capsys):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "implant_id": [IMPLANT_ID] * 3,
+            "measure_date": ["2024-05-01", "2024-05-08", "2024-05-15"],
+            "measure_value": [120.0, 180.5, 260.0],
+        }
+    )
+    pq.write_table(table, tmp_path / "measures.parquet")
+
+    main([str(tmp_path / "measures.parquet")])
+
+    assert "measure: read=3 written=3 rejected=0" in capsys.readouterr().out
+    rows = seeded_client.get("/api/measures", params={"implant_id": IMPLANT_ID}).json()
+    assert {row["measure_value"] for row in rows} >= {120.0, 180.5, 260.0}
+
+
+def test_import_rejects_unknown_columns(tmp_path):
+    path = write_csv(tmp_path / "patient.csv", [{"nhc": "X", "colour": "blue"}])
+    with pytest.raises(SystemExit, match="unknown columns"):
+        main([str(path)])
@@ -0,0 +1,91 @@
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.services import lineage as lineage_service
+from app.services.cache import TTLCache
+
+TUMOR = "SEED-TUMOR-001"
+PATIENT = "SEED-PAT-001"
+OTHER_PATIENT = "SEED-PAT-002"
+BIOMODEL_ID = "20000000-0000-0000-0000-000000000001"
+PASSAGE_ID = "30000000-0000-0000-0000-000000000001"
+PDO_TRIAL_ID = "40000000-0000-0000-0000-000000000002"
+MOUSE_ID = "50000000-0000-0000-0000-000000000003"
+
+
+def _nodes(client, path, **params):
+    response = client.get(f"/api/lineage/{path}", params=params)
+    assert response.status_code == 200
+    return {(node["kind"], node["id"]): node["depth"] for node in response.json()["nodes"]}
+
+
+def test_mouse_ancestors_reach_the_patient(seeded_client):
+    response = seeded_client.get(f"/api/lineage/mice/{MOUSE_ID}/ancestors")
+    assert response.json()["depth"] == 5
+    assert [(node["kind"], node["depth"]) for node in response.json()["nodes"]] == [
+        ("trial", 1),
+        ("passage", 2),
+        ("biomodel", 3),
+        ("tumor", 4),
+        ("patient", 5),
+    ]
+    assert _nodes(seeded_client, f"tumors/{TUMOR}/ancestors") == {("patient", PATIENT): 1}
+
+
+def test_derived_generations_are_followed_and_cached_per_write(seeded_client):
+    before = _nodes(seeded_client, f"passages/{PASSAGE_ID}/descendants")
+    assert before[("trial", PDO_TRIAL_ID)] == 1
+    assert before[("mouse", MOUSE_ID)] == 2
+
+    tumor = {"biobank_code": "LINEAGE-TUMOR-002", "patient_nhc": OTHER_PATIENT}
+    assert seeded_client.post("/api/tumors", json=tumor).status_code == 200
+    biomodel = seeded_client.post(
+        "/api/biomodels",
+        json={"tumor_biobank_code": tumor["biobank_code"], "parent_trial_id": PDO_TRIAL_ID},
+    ).json()
+    passage = seeded_client.post("/api/passages", json={"biomodel_id": biomodel["id"]}).json()
+    trial = seeded_client.post("/api/trials", json={"passage_id": passage["id"]}).json()
+
+    after = _nodes(seeded_client, f"passages/{PASSAGE_ID}/descendants")
+    assert after[("biomodel", biomodel["id"])] == 2
+    assert after[("trial", trial["id"])] == 4
+
+    ancestors = _nodes(seeded_client, f"trials/{trial['id']}/ancestors")
+    assert ancestors[("trial", PDO_TRIAL_ID)] == 3
+    assert ancestors[("biomodel", BIOMODEL_ID)] == 5
+    assert ancestors[("tumor", tumor["biobank_code"])] == 3
+    assert ancestors[("tumor", TUMOR)] == 6
+    assert ancestors[("patient", OTHER_PATIENT)] == 4
+    assert ancestors[("patient", PATIENT)] == 7
+
+    assert _nodes(seeded_client, f"patients/{PATIENT}/descendants")[("passage", passage["id"])] == 6
+    assert _nodes(seeded_client, f"patients/{OTHER_PATIENT}/descendants") == {
+        ("tumor", tumor["biobank_code"]): 1,
+        ("biomodel", biomodel["id"]): 2,
+        ("passage", passage["id"]): 3,
+        ("trial", trial["id"]): 4,
+    }
+    limited = _nodes(seeded_client, f"trials/{trial['id']}/ancestors", max_depth=2)
+    assert max(limited.values()) == 4
+    assert ("biomodel", BIOMODEL_ID) not in limited
+
+
+def test_unknown_entity_is_404(seeded_client):
+    missing = "30000000-0000-0000-0000-00000000ffff"
+    assert seeded_client.get(f"/api/lineage/passages/{missing}/ancestors").status_code == 404
+    assert seeded_client.get("/api/lineage/patients/NOPE/descendants").status_code == 404
+    assert seeded_client.get("/api/lineage/passages/nope/ancestors").status_code == 422
+
+
+def test_lineage_cache_is_off_by_default_and_dropped_on_write(seeded_client, monkeypatch):
+    assert lineage_service.lineage_cache.maxsize == 0
+    cache = TTLCache(maxsize=16, ttl=60)
+    monkeypatch.setattr(lineage_service, "lineage_cache", cache)
+    with Session(get_engine()) as session:
+        first = lineage_service.lineage(session, "mice", MOUSE_ID, "ancestors")
+        assert lineage_service.lineage(session, "mice", MOUSE_ID, "ancestors") is first
+        assert len(cache) == 1
+
+    assert seeded_client.patch(f"/api/mice/{MOUSE_ID}", json={"sex": "F"}).status_code == 200
+    with Session(get_engine()) as session:
+        assert lineage_service.lineage(session, "mice", MOUSE_ID, "ancestors") is not first
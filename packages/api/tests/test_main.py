@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+
 from app.main import app
 
 client = TestClient(app)
@@ -14,3 +15,11 @@ def test_read_health():
     response = client.get("/api/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+
+def test_read_db_pool_metrics():
+    response = client.get("/api/health/db-pool")
+    assert response.status_code == 200
+    sync_pool = response.json()["sync"]
+    assert sync_pool["pool"] == "QueuePool"
+    assert sync_pool["size"] == 5
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import get_engine
+from app.main import create_application
+from app.services.metrics import MetricsRegistry, RequestStats, _request_stats, instrument_engine
+
+
+def test_instrumented_app_reports_timings_and_metrics(seeded_client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_enabled", True)
+    client = TestClient(create_application())
+
+    response = client.get("/api/patients/SEED-PAT-001")
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("app;dur=") and 'desc="1 queries"' in timing
+
+    body = client.get("/api/metrics").text
+    labels = 'method="GET",route="/api/patients/{item_id}"'
+    assert f"techconnect_http_request_duration_seconds_count{{{labels}}} 1" in body
+    assert f'techconnect_db_queries_per_request_bucket{{{labels},le="1"}} 1' in body
+    assert "/api/metrics" not in body
+
+
+def test_metrics_endpoint_is_absent_by_default(seeded_client):
+    assert seeded_client.get("/api/metrics").status_code == 404
+    assert "Server-Timing" not in seeded_client.get("/api/health").headers
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(seeded_client):
+    engine = get_engine()
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            for nhc in ("SEED-PAT-001", "SEED-PAT-002", "BULK-001"):
+                connection.execute(text("SELECT * FROM patient WHERE nhc = :nhc"), {"nhc": nhc})
+    finally:
+        _request_stats.reset(token)
+
+    assert stats.queries == 3 and stats.db_seconds > 0
+    registry = MetricsRegistry(n_plus_one_threshold=3)
+    repeated = registry.observe("GET", "/api/things", 200, 0.01, stats)
+    assert repeated == ("SELECT * FROM patient WHERE nhc = ?", 3)
+    assert 'techconnect_n_plus_one_requests_total{method="GET",route="/api/things"} 1' in (
+        registry.render()
+    )
+    assert MetricsRegistry(n_plus_one_threshold=4).observe("GET", "/x", 200, 0.01, stats) is None
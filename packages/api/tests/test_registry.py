@@ -0,0 +1,29 @@
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from models import Measure, Patient, Trial
+
+from app.services.registry import model_info
+
+
+def test_model_info_is_computed_once():
+    assert model_info(Trial) is model_info(Trial)
+
+
+def test_primary_key_metadata():
+    assert model_info(Patient).pk_name == "nhc"
+    assert model_info(Patient).coerce_pk("SEED-PAT-001") == "SEED-PAT-001"
+    trial_id = "40000000-0000-0000-0000-000000000001"
+    assert model_info(Trial).coerce_pk(trial_id) == UUID(trial_id)
+    with pytest.raises(HTTPException) as error:
+        model_info(Trial).coerce_pk("not-a-uuid")
+    assert error.value.status_code == 422
+
+
+def test_columns_filters_and_relationships():
+    info = model_info(Measure)
+    assert info.column_names == ("id", "measure_date", "measure_value", "implant_id")
+    assert info.filterable == ("implant_id",)
+    assert info.relationships["implant"].uselist is False
+    assert model_info(Trial).relationships["usage_records"].uselist is True
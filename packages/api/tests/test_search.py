@@ -0,0 +1,53 @@
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.services.search import rebuild_search_index
+
+BIOMODEL_ID = "20000000-0000-0000-0000-000000000001"
+PASSAGE_ID = "30000000-0000-0000-0000-000000000001"
+
+
+def _hits(client, q, **params):
+    response = client.get("/api/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(hit["entity"], hit["id"]) for hit in response.json()]
+
+
+def test_seed_rows_are_searchable_by_prefix_and_accent(seeded_client):
+    assert ("biomodel", BIOMODEL_ID) in _hits(seeded_client, "xenog")
+    (hit,) = seeded_client.get("/api/search", params={"q": "drug scr"}).json()
+    assert hit["entity"] == "trial"
+    assert hit["snippet"] == "PDO <mark>drug</mark> <mark>screen</mark>"
+    assert _hits(seeded_client, "confluénce") == _hits(seeded_client, "confluence")
+    assert _hits(seeded_client, "xenograft", entity="trial") == []
+    assert _hits(seeded_client, "!!") == []
+
+
+def test_writes_keep_the_index_current(seeded_client):
+    created = seeded_client.post(
+        "/api/trials", json={"passage_id": PASSAGE_ID, "description": "Orthotopic glioma arm"}
+    ).json()
+    assert _hits(seeded_client, "glioma orthot") == [("trial", created["id"])]
+
+    seeded_client.patch(f"/api/trials/{created['id']}", json={"description": "Subcutaneous arm"})
+    assert _hits(seeded_client, "glioma") == []
+    assert _hits(seeded_client, "subcutaneous") == [("trial", created["id"])]
+
+    seeded_client.delete(f"/api/trials/{created['id']}")
+    assert _hits(seeded_client, "subcutaneous") == []
+
+
+def test_bulk_writes_are_indexed(seeded_client):
+    rows = [{"passage_id": PASSAGE_ID, "description": f"Bulk sarcoma cohort {n}"} for n in range(3)]
+    response = seeded_client.post("/api/trials/bulk", json=rows)
+    assert response.json()["errors"] == []
+    assert len(_hits(seeded_client, "sarcoma cohort")) == 3
+    assert len(_hits(seeded_client, "sarcoma", limit=2)) == 2
+
+
+def test_rebuild_matches_incremental_index(seeded_client):
+    before = _hits(seeded_client, "sample")
+    with Session(get_engine()) as session:
+        rebuild_search_index(session)
+        session.commit()
+    assert sorted(_hits(seeded_client, "sample")) == sorted(before)
@@ -0,0 +1,46 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints.entities import build_entity_router
+from app.services.registry import ENTITIES
+
+
+def _client(fast_serialization: bool) -> TestClient:
+    app = FastAPI()
+    for model, prefix, tag in ENTITIES:
+        app.include_router(
+            build_entity_router(
+                model, prefix=prefix, tag=tag, fast_serialization=fast_serialization
+            )
+        )
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def clients(seeded_client):
+    return _client(fast_serialization=False), _client(fast_serialization=True)
+
+
+@pytest.mark.parametrize("prefix", [prefix for _, prefix, _ in ENTITIES])
+def test_fast_list_matches_validated_list(clients, prefix):
+    validated, fast = clients
+    expected = validated.get(f"/{prefix}", params={"limit": 2})
+    actual = fast.get(f"/{prefix}", params={"limit": 2})
+    assert actual.status_code == expected.status_code == 200
+    assert actual.json() == expected.json()
+    assert actual.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+
+
+def test_fast_serialization_keeps_openapi_schema(clients):
+    validated, fast = clients
+    assert fast.get("/openapi.json").json() == validated.get("/openapi.json").json()
+
+
+def test_fast_batch_get_matches_validated(clients):
+    validated, fast = clients
+    body = {"ids": ["SEED-PAT-002", "NOPE", "SEED-PAT-001"]}
+    expected = validated.post("/patients/batch-get", json=body)
+    actual = fast.post("/patients/batch-get", json=body)
+    assert actual.status_code == expected.status_code == 200
+    assert actual.json() == expected.json()
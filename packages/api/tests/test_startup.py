@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.core.config import get_settings
+from app.core.database import (
+    SCHEMA_VERSION_TABLE,
+    create_db_and_tables,
+    get_engine,
+    schema_fingerprint,
+    stored_schema_fingerprint,
+)
+from app.main import create_application
+
+# Seconds `import app.main` may take on top of its third-party dependencies.
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "2.5"))
+
+
+def test_create_tables_is_skipped_while_the_schema_marker_matches(seeded_client):
+    with get_engine().connect() as connection:
+        assert stored_schema_fingerprint(connection) == schema_fingerprint()
+    assert create_db_and_tables() is False
+
+    with get_engine().begin() as connection:
+        connection.execute(delete(SCHEMA_VERSION_TABLE))
+    assert create_db_and_tables() is True
+    assert create_db_and_tables() is False
+
+
+def test_openapi_is_built_lazily_and_cached_on_disk(seeded_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "openapi_cache_dir", str(tmp_path))
+    first = create_application()
+    assert first.openapi_schema is None
+    document = TestClient(first).get("/openapi.json").json()
+    (cached,) = tmp_path.glob("openapi-*.json")
+
+    second = create_application()
+    with TestClient(second) as client:
+        assert client.get("/openapi.json").json() == document
+        phases = client.get("/api/health/startup").json()
+    assert list(phases) == ["import", "application", "create_tables", "openapi"]
+    assert list(tmp_path.glob("openapi-*.json")) == [cached]
+
+
+def test_import_time_stays_within_budget():
+    code = (
+        "import time, fastapi, numpy, orjson, sqlmodel\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "assert app.main.app.openapi_schema is None\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    api_root = Path(__file__).resolve().parent.parent
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=api_root,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    seconds = float(result.stdout.strip().splitlines()[-1])
+    assert seconds < IMPORT_TIME_BUDGET, f"import app.main took {seconds:.2f}s"
@@ -0,0 +1,82 @@
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.services.stats import CHANGE_TABLE, STATE_TABLE, refresh_stats
+
+PDX_TRIAL_ID = "40000000-0000-0000-0000-000000000001"
+
+
+def _groups(client, metric):
+    response = client.get("/api/stats", params={"metric": metric})
+    assert response.status_code == 200
+    return {group["group"]: group for group in response.json()[metric]["groups"]}
+
+
+def test_seed_statistics(seeded_client):
+    stats = seeded_client.get("/api/stats").json()
+    assert set(stats) == {
+        "biomodels_by_organ",
+        "trial_success_by_type",
+        "pdx_trials_by_strain",
+        "cryopreservations_by_location",
+    }
+    strains = {group["group"]: group for group in stats["pdx_trials_by_strain"]["groups"]}
+    assert strains["NSG"]["count"] >= 1
+    assert 0 <= strains["NSG"]["rate"] <= 1
+    assert strains["NSG"]["mean"] > 0
+    assert stats["biomodels_by_organ"]["groups"][0]["count"] >= 1
+
+
+def test_writes_refresh_only_the_affected_rollups(seeded_client):
+    seeded_client.get("/api/stats")
+    with Session(get_engine()) as session:
+        assert refresh_stats(session) == []
+    before = seeded_client.get("/api/stats").json()
+
+    for vials in (5, 7):
+        record = {"trial_id": PDX_TRIAL_ID, "location": "Tank-Stats", "vial_count": vials}
+        assert seeded_client.post("/api/cryopreservations", json=record).status_code == 200
+    after = seeded_client.get("/api/stats").json()
+
+    tank = {g["group"]: g for g in after["cryopreservations_by_location"]["groups"]}["Tank-Stats"]
+    assert (tank["count"], tank["total"]) == (2, 12)
+    assert (
+        after["cryopreservations_by_location"]["refreshed_at"]
+        > (before["cryopreservations_by_location"]["refreshed_at"])
+    )
+    assert after["biomodels_by_organ"] == before["biomodels_by_organ"]
+
+
+def test_bulk_writes_mark_rollups_stale(seeded_client):
+    before = _groups(seeded_client, "trial_success_by_type").get(None, {"count": 0})["count"]
+    rows = [{"passage_id": "30000000-0000-0000-0000-000000000001", "success": True}] * 3
+    assert seeded_client.post("/api/trials/bulk", json=rows).json()["errors"] == []
+    assert _groups(seeded_client, "trial_success_by_type")[None]["count"] == before + 3
+
+
+def test_unknown_metric_is_rejected(seeded_client):
+    assert seeded_client.get("/api/stats", params={"metric": "nope"}).status_code == 422
+
+
+def test_writes_only_append_changes(seeded_client):
+    seeded_client.get("/api/stats")
+
+    def snapshot():
+        with Session(get_engine()) as session:
+            changes = session.execute(
+                select(CHANGE_TABLE.c.metric, func.count()).group_by(CHANGE_TABLE.c.metric)
+            ).all()
+            states = session.execute(select(STATE_TABLE)).all()
+        return dict(changes), states
+
+    assert snapshot()[0] == {}
+    states = snapshot()[1]
+    record = {"trial_id": PDX_TRIAL_ID, "location": "Tank-Log", "vial_count": 1}
+    assert seeded_client.post("/api/cryopreservations", json=record).status_code == 200
+    assert snapshot() == ({"cryopreservations_by_location": 1}, states)
+
+    seeded_client.get("/api/stats", params={"metric": "biomodels_by_organ"})
+    assert snapshot()[0] == {"cryopreservations_by_location": 1}
+    seeded_client.get("/api/stats", params={"metric": "cryopreservations_by_location"})
+    assert snapshot()[0] == {}
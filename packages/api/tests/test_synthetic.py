@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.synthetic import GENERATED_MODELS, SyntheticShape, generate, main, patient_rows
+
+
+def memory_session() -> Session:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+
+def table_counts(session: Session) -> dict[str, int]:
+    return {
+        model.__tablename__: session.execute(select(func.count()).select_from(model)).scalar_one()
+        for model in GENERATED_MODELS
+    }
+
+
+def test_generate_writes_the_shape_times_the_scale():
+    shape = SyntheticShape(measures_per_implant=5)
+    with memory_session() as session:
+        written = generate(session, 3, seed=1, shape=shape, chunk_size=7)
+        expected = {name: count * 3 for name, count in shape.rows_per_patient().items()}
+        assert written == expected
+        assert table_counts(session) == expected
+
+        # Same seed again: every row already exists and nothing is duplicated.
+        generate(session, 3, seed=1, shape=shape)
+        assert table_counts(session) == expected
+
+
+def test_patient_rows_are_deterministic_per_seed_and_index():
+    assert patient_rows(4, seed=2) == patient_rows(4, seed=2)
+    assert patient_rows(4, seed=2) != patient_rows(4, seed=3)
+    measures = patient_rows(0)["measure"]
+    assert len({row["implant_id"] for row in measures}) == 8
+    assert all(row["measure_value"] > 0 for row in measures)
+
+
+def test_main_rejects_unknown_shape_fields():
+    with pytest.raises(SystemExit, match="wings_per_mouse"):
+        main(["--shape", "wings_per_mouse=2"])
@@ -0,0 +1,85 @@
+from sqlalchemy import event
+
+from app.core.database import get_engine
+from app.services import tree
+from app.services.tree import CYCLIC_BRANCHES, MAX_TREE_GENERATIONS, TREE_ROOTS, build_tree_plan
+
+PASSAGE_ID = "30000000-0000-0000-0000-000000000001"
+MOUSE_ID = "50000000-0000-0000-0000-000000000003"
+
+
+def _count_queries(callback):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = callback()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+def test_patient_tree_nests_full_lineage(seeded_client):
+    response = seeded_client.get("/api/tree/patients/SEED-PAT-001")
+    assert response.status_code == 200
+    tree = response.json()
+    tumor = tree["tumors"][0]
+    trials = tumor["biomodels"][0]["passages"][0]["trials"]
+    pdx = next(trial for trial in trials if trial["pdx_trial"] is not None)
+    measures = pdx["pdx_trial"]["mouse"]["implants"][0]["measures"]
+    assert measures[0]["measure_value"] == 365.0
+
+
+def test_tree_query_count_is_bounded_by_plan(seeded_client):
+    response, queries = _count_queries(
+        lambda: seeded_client.get(f"/api/tree/passages/{PASSAGE_ID}", params={"depth": 4})
+    )
+    assert response.status_code == 200
+
+    def relationships(plan):
+        return sum(1 + relationships(child) for _, _, child in plan.branches)
+
+    # One root query plus at most one batched query per planned relationship.
+    plan = build_tree_plan(TREE_ROOTS["passages"], depth=4)
+    assert queries <= 1 + relationships(plan)
+
+
+def test_tree_depth_and_exclude(seeded_client):
+    shallow = seeded_client.get(f"/api/tree/mice/{MOUSE_ID}", params={"depth": 0}).json()
+    assert "implants" not in shallow
+
+    pruned = seeded_client.get(f"/api/tree/mice/{MOUSE_ID}", params={"exclude": "measures"}).json()
+    assert "measures" not in pruned["implants"][0]
+
+
+def test_tree_rejects_unknown_branch(seeded_client):
+    response = seeded_client.get("/api/tree/patients/SEED-PAT-001", params={"include": "nonsense"})
+    assert response.status_code == 422
+
+
+def test_tree_missing_root(seeded_client):
+    response = seeded_client.get("/api/tree/patients/UNKNOWN")
+    assert response.status_code == 404
+
+
+def test_cyclic_branches_are_followed_for_bounded_generations():
+    def generations(plan):
+        return max(
+            ((name in CYCLIC_BRANCHES) + generations(child) for name, _, child in plan.branches),
+            default=0,
+        )
+
+    plan = build_tree_plan(TREE_ROOTS["passages"], depth=16)
+    assert generations(plan) == MAX_TREE_GENERATIONS
+    assert plan.size == build_tree_plan(TREE_ROOTS["passages"], depth=32).size
+
+
+def test_tree_rejects_oversized_plans(seeded_client, monkeypatch):
+    monkeypatch.setattr(tree, "MAX_TREE_RELATIONSHIPS", 10)
+    response = seeded_client.get(f"/api/tree/passages/{PASSAGE_ID}")
+    assert response.status_code == 422
+    assert "relationships" in response.json()["detail"]
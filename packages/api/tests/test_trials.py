@@ -0,0 +1,143 @@
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.services.trials import list_trial_details
+
+PASSAGE_ID = "30000000-0000-0000-0000-000000000001"
+PDX_TRIAL_ID = "40000000-0000-0000-0000-000000000001"
+LC_TRIAL_ID = "40000000-0000-0000-0000-000000000003"
+MOUSE_ID = "50000000-0000-0000-0000-000000000003"
+
+
+def test_trials_are_listed_with_subtypes_in_one_query(seeded_client):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as session:
+            trials = list_trial_details(session, limit=100, filters={"passage_id": [PASSAGE_ID]})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(statements) == 1
+
+    by_id = {str(trial["id"]): trial for trial in trials}
+    assert by_id[PDX_TRIAL_ID]["type"] == "pdx"
+    assert str(by_id[PDX_TRIAL_ID]["pdx_trial"]["mouse"]["id"]) == MOUSE_ID
+    assert by_id[PDX_TRIAL_ID]["lc_trial"] is None
+    assert by_id[LC_TRIAL_ID]["lc_trial"]["facs"]["measure"] == "FITC"
+
+
+def test_trial_details_filter_by_type_and_paginate(seeded_client):
+    response = seeded_client.get("/api/trial-details", params={"type": "lc"})
+    assert [trial["id"] for trial in response.json()] == [LC_TRIAL_ID]
+
+    first = seeded_client.get("/api/trial-details", params={"limit": 1})
+    second = seeded_client.get(
+        "/api/trial-details", params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]}
+    )
+    assert second.json()[0]["id"] > first.json()[0]["id"]
+
+    detail = seeded_client.get(f"/api/trial-details/{PDX_TRIAL_ID}")
+    assert detail.json()["pdx_trial"]["ihq_data"] == "Ki67 and p53 available"
+    assert "ETag" in detail.headers
+    assert seeded_client.get(f"/api/trial-details/{MOUSE_ID}").status_code == 404
+
+
+def test_combined_create_inserts_trial_and_subtype_together(seeded_client):
+    response = seeded_client.post(
+        "/api/trial-details",
+        json={
+            "passage_id": PASSAGE_ID,
+            "description": "Organoid screen",
+            "pdo_trial": {"drop_count": 4},
+        },
+    )
+    assert response.status_code == 200
+    created = response.json()
+    assert created["type"] == "pdo"
+    assert created["pdo_trial"] == {**created["pdo_trial"], "id": created["id"], "drop_count": 4}
+    assert seeded_client.get(f"/api/pdo-trials/{created['id']}").status_code == 200
+
+    both = seeded_client.post(
+        "/api/trial-details", json={"passage_id": PASSAGE_ID, "pdo_trial": {}, "lc_trial": {}}
+    )
+    assert both.status_code == 422
+
+    duplicate = seeded_client.post(
+        "/api/trial-details", json={"id": created["id"], "passage_id": PASSAGE_ID, "lc_trial": {}}
+    )
+    assert duplicate.status_code == 400
+    assert seeded_client.get(f"/api/lc-trials/{created['id']}").status_code == 404
+
+
+def test_trial_graph_is_created_with_one_commit(seeded_client):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    mouse_id = "50000000-0000-0000-0000-0000000000aa"
+    graph = {
+        "passage_id": PASSAGE_ID,
+        "description": "Full PDX workflow",
+        "pdx_trial": {
+            "latency_weeks": 3.0,
+            "mouse": {
+                "id": mouse_id,
+                "strain": "NOD-SCID",
+                "implants": [
+                    {"implant_location": "Left flank", "measures": [{"measure_value": 40.0}]},
+                    {"implant_location": "Right flank"},
+                ],
+            },
+        },
+        "images": [{"type": "HE"}],
+        "cryopreservations": [{"location": "Tank-Graph", "vial_count": 3}],
+        "usage_records": [{"record_type": "Shipment"}],
+    }
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = seeded_client.post("/api/trial-details/graph", json=graph)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert statements.count("COMMIT") <= 1
+
+    created = response.json()
+    mouse = created["pdx_trial"]["mouse"]
+    assert created["pdx_trial"]["id"] == created["id"]
+    assert (mouse["id"], mouse["pdx_trial_id"]) == (mouse_id, created["id"])
+    assert [implant["mouse_id"] for implant in mouse["implants"]] == [mouse_id] * 2
+    measure = mouse["implants"][0]["measures"][0]
+    assert measure["implant_id"] == mouse["implants"][0]["id"]
+    assert created["usage_records"][0]["trial_id"] == created["id"]
+    assert created["lc_trial"] is None
+
+    detail = seeded_client.get(f"/api/trial-details/{created['id']}").json()
+    assert detail["pdx_trial"]["mouse"]["strain"] == "NOD-SCID"
+    implants = seeded_client.get("/api/implants", params={"mouse_id": mouse_id}).json()
+    assert len(implants) == 2
+
+
+def test_failed_trial_graph_stores_nothing(seeded_client):
+    usage = seeded_client.post(
+        "/api/usage-records", json={"trial_id": PDX_TRIAL_ID, "record_type": "Shipment"}
+    ).json()
+    trial_id = "40000000-0000-0000-0000-0000000000bb"
+    graph = {
+        "id": trial_id,
+        "passage_id": PASSAGE_ID,
+        "pdx_trial": {"mouse": {"implants": [{}]}},
+        "usage_records": [{"id": usage["id"]}],
+    }
+    assert seeded_client.post("/api/trial-details/graph", json=graph).status_code == 400
+    assert seeded_client.get(f"/api/trials/{trial_id}").status_code == 404
+
+    both = {"passage_id": PASSAGE_ID, "pdx_trial": {}, "pdo_trial": {}}
+    assert seeded_client.post("/api/trial-details/graph", json=both).status_code == 422
@@ -28,6 +28,8 @@ CREATE TABLE tumor (
 	FOREIGN KEY(patient_nhc) REFERENCES patient (nhc)
 );
 
+CREATE INDEX ix_tumor_patient_nhc ON tumor (patient_nhc);
+
 CREATE TABLE biomodel (
 	id UUID NOT NULL, 
 	type VARCHAR(50), 
@@ -42,6 +44,10 @@ CREATE TABLE biomodel (
 	FOREIGN KEY(tumor_biobank_code) REFERENCES tumor (biobank_code)
 );
 
+CREATE INDEX ix_biomodel_parent_trial_id ON biomodel (parent_trial_id);
+
+CREATE INDEX ix_biomodel_tumor_biobank_code_creation_date ON biomodel (tumor_biobank_code, creation_date);
+
 CREATE TABLE sample (
 	id UUID NOT NULL, 
 	has_serum BOOLEAN, 
@@ -53,6 +59,8 @@ CREATE TABLE sample (
 	FOREIGN KEY(tumor_biobank_code) REFERENCES tumor (biobank_code)
 );
 
+CREATE INDEX ix_sample_tumor_biobank_code ON sample (tumor_biobank_code);
+
 CREATE TABLE tumor_genomic_sequencing (
 	id UUID NOT NULL, 
 	has_data BOOLEAN, 
@@ -83,6 +91,10 @@ CREATE TABLE passage (
 	FOREIGN KEY(biomodel_id) REFERENCES biomodel (id)
 );
 
+CREATE INDEX ix_passage_biomodel_id ON passage (biomodel_id);
+
+CREATE INDEX ix_passage_parent_trial_id ON passage (parent_trial_id);
+
 CREATE TABLE trial (
 	id UUID NOT NULL, 
 	success BOOLEAN, 
@@ -97,6 +109,8 @@ CREATE TABLE trial (
 	FOREIGN KEY(passage_id) REFERENCES passage (id)
 );
 
+CREATE INDEX ix_trial_passage_id ON trial (passage_id);
+
 CREATE TABLE cryopreservation (
 	id UUID NOT NULL, 
 	location VARCHAR(100), 
@@ -107,6 +121,8 @@ CREATE TABLE cryopreservation (
 	FOREIGN KEY(trial_id) REFERENCES trial (id)
 );
 
+CREATE INDEX ix_cryopreservation_trial_id ON cryopreservation (trial_id);
+
 CREATE TABLE image (
 	id UUID NOT NULL, 
 	image_date DATE, 
@@ -118,6 +134,8 @@ CREATE TABLE image (
 	FOREIGN KEY(trial_id) REFERENCES trial (id)
 );
 
+CREATE INDEX ix_image_trial_id ON image (trial_id);
+
 CREATE TABLE lc_trial (
 	id UUID NOT NULL, 
 	confluence FLOAT, 
@@ -179,6 +197,8 @@ CREATE TABLE usage_record (
 	FOREIGN KEY(trial_id) REFERENCES trial (id)
 );
 
+CREATE INDEX ix_usage_record_trial_id ON usage_record (trial_id);
+
 CREATE TABLE facs (
 	id UUID NOT NULL, 
 	measure VARCHAR(100), 
@@ -203,6 +223,8 @@ CREATE TABLE mouse (
 	FOREIGN KEY(pdx_trial_id) REFERENCES pdx_trial (id)
 );
 
+CREATE INDEX ix_mouse_pdx_trial_id ON mouse (pdx_trial_id);
+
 CREATE TABLE implant (
 	id UUID NOT NULL, 
 	implant_location VARCHAR(100), 
@@ -212,6 +234,8 @@ CREATE TABLE implant (
 	FOREIGN KEY(mouse_id) REFERENCES mouse (id)
 );
 
+CREATE INDEX ix_implant_mouse_id ON implant (mouse_id);
+
 CREATE TABLE measure (
 	id UUID NOT NULL, 
 	measure_date DATE, 
@@ -221,3 +245,4 @@ CREATE TABLE measure (
 	FOREIGN KEY(implant_id) REFERENCES implant (id)
 );
 
+CREATE INDEX ix_measure_implant_id_measure_date ON measure (implant_id, measure_date);
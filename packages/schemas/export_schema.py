@@ -12,7 +12,7 @@ Usage:
 """
 
 import argparse
-from sqlalchemy.schema import CreateTable
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.dialects import postgresql, mysql, sqlite
 
 from sqlmodel import SQLModel
@@ -36,6 +36,11 @@ def get_create_table_sql(table, dialect) -> str:
     return str(CreateTable(table).compile(dialect=dialect))
 
 
+def get_create_index_sql(index, dialect) -> str:
+    """Generate CREATE INDEX SQL for a single index."""
+    return str(CreateIndex(index).compile(dialect=dialect))
+
+
 def export_schema(dialect_name: str) -> str:
     """
     Export the complete schema as SQL DDL statements.
@@ -65,15 +70,21 @@ def export_schema(dialect_name: str) -> str:
         "",
     ]
 
-    # Generate CREATE TABLE statements in correct order (respecting foreign keys)
+    # Generate CREATE TABLE statements in correct order (respecting foreign keys),
+    # each followed by the CREATE INDEX statements for that table
     for table in metadata.sorted_tables:
-        sql = get_create_table_sql(table, dialect)
-        # Clean up and format
-        sql = sql.strip()
-        if not sql.endswith(";"):
-            sql += ";"
-        lines.append(sql)
-        lines.append("")
+        statements = [get_create_table_sql(table, dialect)]
+        statements += [
+            get_create_index_sql(index, dialect)
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        ]
+        for sql in statements:
+            # Clean up and format
+            sql = sql.strip()
+            if not sql.endswith(";"):
+                sql += ";"
+            lines.append(sql)
+            lines.append("")
 
     return "\n".join(lines)
 
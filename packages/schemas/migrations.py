@@ -0,0 +1,554 @@
+"""
+Schema migrations: diff SQLModel metadata against a live database, apply the DDL,
+and backfill data in resumable batches.
+
+The diff covers new tables, columns and indexes (plus renames given explicitly).
+Columns, indexes and tables that exist only in the database are reported as
+destructive operations and applied only with ``--allow-drop``. Changes are made in
+an online-friendly order:
+
+1. New tables and nullable columns (a metadata-only change on PostgreSQL/MySQL).
+2. Indexes, built with ``CREATE INDEX CONCURRENTLY`` on PostgreSQL and
+   ``ALGORITHM=INPLACE, LOCK=NONE`` on MySQL/MariaDB so writes keep flowing.
+3. Backfills, in primary-key batches with one commit each (see :func:`run_backfill`).
+4. ``NOT NULL`` on new columns, once their backfill has run (``apply --not-null``).
+
+Usage (``migrate-db`` once installed):
+    python migrations.py plan                      # DDL for DATABASE_URL
+    python migrations.py plan --dialect mysql      # rendered for another dialect
+    python migrations.py apply --rename usage_record.record_type=project_code
+    python migrations.py backfill trial --set "status=true" --where "status IS NULL"
+    python migrations.py apply --not-null
+    python migrations.py status
+"""
+
+import argparse
+import hashlib
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.schema import AddConstraint, CreateIndex, CreateTable
+from sqlmodel import SQLModel
+
+from export_schema import DIALECTS
+
+OperationKind = Literal[
+    "create_table",
+    "add_column",
+    "rename_column",
+    "create_index",
+    "set_not_null",
+    "drop_index",
+    "drop_column",
+    "drop_table",
+]
+
+DESTRUCTIVE_KINDS = ("drop_index", "drop_column", "drop_table")
+
+# Longest backfill name stored; longer ones are shortened by :func:`progress_name`.
+MAX_BACKFILL_NAME = 200
+
+# Bookkeeping tables that are not part of the models and never diffed.
+PROGRESS_TABLE = Table(
+    "schema_migration_progress",
+    MetaData(),
+    Column("name", String(MAX_BACKFILL_NAME), primary_key=True),
+    Column("last_key", Text),
+    Column("rows_done", Integer, nullable=False, default=0),
+    Column("finished", Integer, nullable=False, default=0),
+)
+IGNORED_TABLES = {PROGRESS_TABLE.name, "techconnect_schema_version"}
+# Tables the API maintains itself: the full-text index (with the shadow tables FTS5
+# creates next to it on SQLite) and the statistics rollups.
+IGNORED_TABLE_PREFIXES = ("search_index", "stats_rollup")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class Operation:
+    """One schema change.
+
+    ``target`` is the model ``Table`` for ``create_table``, the model ``Column`` for
+    ``add_column``/``set_not_null``, the model ``Index`` for ``create_index``, an
+    ``(old, new)`` pair for ``rename_column`` and the database name of the object
+    for the ``drop_*`` kinds.
+    """
+
+    kind: OperationKind
+    table: str
+    target: Any
+
+    @property
+    def destructive(self) -> bool:
+        return self.kind in DESTRUCTIVE_KINDS
+
+    def describe(self) -> str:
+        if self.kind == "rename_column":
+            return f"rename column {self.table}.{self.target[0]} to {self.target[1]}"
+        action = self.kind.replace("_", " ")
+        if self.kind in ("create_table", "drop_table"):
+            return f"{action} {self.table}"
+        return f"{action} {self.table}.{getattr(self.target, 'name', self.target)}"
+
+
+def _model_metadata() -> MetaData:
+    # Import models package for side effects (SQLModel.metadata registration)
+    import models  # noqa: F401
+
+    return SQLModel.metadata
+
+
+def diff_schema(
+    connection: Connection,
+    metadata: MetaData | None = None,
+    renames: dict[tuple[str, str], str] | None = None,
+) -> list[Operation]:
+    """
+    Compare model metadata with the database schema.
+
+    Args:
+        connection: Connection to the live database
+        metadata: Metadata to migrate to (defaults to the SQLModel models)
+        renames: ``{(table, old_column): new_column}`` for columns renamed in the
+            models; without it a rename looks like a drop plus an add
+
+    Returns:
+        Operations in the order they must be applied
+    """
+    metadata = metadata if metadata is not None else _model_metadata()
+    renames = renames or {}
+    inspector = inspect(connection)
+    existing_tables = {
+        name
+        for name in inspector.get_table_names()
+        if name not in IGNORED_TABLES and not name.startswith(IGNORED_TABLE_PREFIXES)
+    }
+    operations: list[Operation] = []
+    indexes: list[Operation] = []
+    later: list[Operation] = []
+
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            operations.append(Operation("create_table", table.name, table))
+            continue
+
+        live_columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+        renamed = {
+            new: old
+            for (table_name, old), new in renames.items()
+            if table_name == table.name and old in live_columns
+        }
+        for column in table.columns:
+            if column.name in live_columns:
+                if not column.nullable and live_columns[column.name]["nullable"]:
+                    later.append(Operation("set_not_null", table.name, column))
+            elif column.name in renamed:
+                operations.append(
+                    Operation("rename_column", table.name, (renamed[column.name], column.name))
+                )
+            else:
+                operations.append(Operation("add_column", table.name, column))
+                if not column.nullable:
+                    later.append(Operation("set_not_null", table.name, column))
+        for name in sorted(set(live_columns) - set(table.columns.keys()) - set(renamed.values())):
+            later.append(Operation("drop_column", table.name, name))
+
+        # PostgreSQL and MySQL also report the indexes backing UNIQUE constraints.
+        unique_constraints = {
+            constraint["name"] for constraint in inspector.get_unique_constraints(table.name)
+        }
+        live_indexes = {
+            index["name"]
+            for index in inspector.get_indexes(table.name)
+            if not index.get("duplicates_constraint") and index["name"] not in unique_constraints
+        }
+        model_indexes = {index.name for index in table.indexes}
+        indexes += [
+            Operation("create_index", table.name, index)
+            for index in sorted(table.indexes, key=lambda index: index.name)
+            if index.name not in live_indexes
+        ]
+        later += [
+            Operation("drop_index", table.name, name)
+            for name in sorted(live_indexes - model_indexes)
+            if name and not name.startswith("sqlite_autoindex")
+        ]
+
+    later += [
+        Operation("drop_table", name, name)
+        for name in sorted(existing_tables - set(metadata.tables))
+    ]
+    return operations + indexes + later
+
+
+def operation_ddl(operation: Operation, dialect: Dialect) -> list[str]:
+    """
+    Render the DDL statements for one operation in a dialect.
+
+    Args:
+        operation: Operation returned by :func:`diff_schema`
+        dialect: Target SQLAlchemy dialect
+
+    Returns:
+        SQL statements, in order
+    """
+    quote = dialect.identifier_preparer.quote
+    table = quote(operation.table)
+    mysql = dialect.name in ("mysql", "mariadb")
+
+    if operation.kind == "create_table":
+        return [str(CreateTable(operation.target).compile(dialect=dialect)).strip()] + [
+            _create_index_sql(index, dialect)
+            for index in sorted(operation.target.indexes, key=lambda index: index.name)
+        ]
+    if operation.kind == "add_column":
+        column: Column = operation.target
+        # Added as nullable: the NOT NULL constraint follows the backfill.
+        spec = dialect.ddl_compiler(dialect, None).get_column_specification(column)
+        spec = spec.replace(" NOT NULL", "")
+        statements = [f"ALTER TABLE {table} ADD COLUMN {spec}"]
+        for constraint in column.table.foreign_key_constraints:
+            if column.name not in constraint.column_keys:
+                continue
+            if dialect.name == "sqlite":
+                target = next(iter(column.foreign_keys)).column
+                statements[0] += f" REFERENCES {quote(target.table.name)} ({quote(target.name)})"
+            else:
+                statements.append(str(AddConstraint(constraint).compile(dialect=dialect)))
+        if column.unique:
+            statements.append(
+                f"CREATE UNIQUE INDEX {quote(f'uq_{operation.table}_{column.name}')} "
+                f"ON {table} ({quote(column.name)})"
+            )
+        return statements
+    if operation.kind == "rename_column":
+        old, new = operation.target
+        return [f"ALTER TABLE {table} RENAME COLUMN {quote(old)} TO {quote(new)}"]
+    if operation.kind == "create_index":
+        return [_create_index_sql(operation.target, dialect, online=True)]
+    if operation.kind == "set_not_null":
+        column = operation.target
+        if dialect.name == "postgresql":
+            return [f"ALTER TABLE {table} ALTER COLUMN {quote(column.name)} SET NOT NULL"]
+        if mysql:
+            spec = dialect.ddl_compiler(dialect, None).get_column_specification(column)
+            return [f"ALTER TABLE {table} MODIFY COLUMN {spec}"]
+        return []  # SQLite cannot add NOT NULL to an existing column
+    if operation.kind == "drop_index":
+        suffix = f" ON {table}" if mysql else ""
+        return [f"DROP INDEX {quote(operation.target)}{suffix}"]
+    if operation.kind == "drop_column":
+        return [f"ALTER TABLE {table} DROP COLUMN {quote(operation.target)}"]
+    return [f"DROP TABLE {table}"]
+
+
+def _create_index_sql(index: Index, dialect: Dialect, online: bool = False) -> str:
+    sql = str(CreateIndex(index).compile(dialect=dialect)).strip()
+    if online and dialect.name == "postgresql":
+        sql = sql.replace("INDEX", "INDEX CONCURRENTLY", 1)
+    elif online and dialect.name in ("mysql", "mariadb"):
+        sql += " ALGORITHM=INPLACE LOCK=NONE"
+    return sql
+
+
+def render_plan(operations: Iterable[Operation], dialect: Dialect) -> str:
+    """Render operations as a commented SQL script."""
+    lines = []
+    for operation in operations:
+        marker = " (destructive)" if operation.destructive else ""
+        lines.append(f"-- {operation.describe()}{marker}")
+        statements = operation_ddl(operation, dialect)
+        lines += [f"{statement};" for statement in statements] or ["-- not supported, skipped"]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def apply_operations(
+    engine: Engine,
+    operations: Sequence[Operation],
+    *,
+    allow_drop: bool = False,
+    report: Callable[[str], None] = print,
+) -> list[Operation]:
+    """
+    Apply operations one statement at a time.
+
+    Each statement runs in its own transaction, except PostgreSQL concurrent index
+    builds, which must run outside one. Destructive operations are skipped unless
+    ``allow_drop`` is set.
+
+    Returns:
+        The operations that were applied
+    """
+    applied = []
+    for operation in operations:
+        if operation.destructive and not allow_drop:
+            report(f"skipped {operation.describe()} (use --allow-drop)")
+            continue
+        for statement in operation_ddl(operation, engine.dialect):
+            if "CONCURRENTLY" in statement:
+                with engine.connect() as connection:
+                    connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+                        text(statement)
+                    )
+            else:
+                with engine.begin() as connection:
+                    connection.execute(text(statement))
+        report(operation.describe())
+        applied.append(operation)
+    return applied
+
+
+@dataclass
+class Backfill:
+    """
+    A data backfill over one table, run in primary-key order.
+
+    Attributes:
+        name: Unique name under which progress is stored (resume key)
+        table: Table to update
+        values: Column name -> value or SQL expression (may reference other columns
+            of the row or use a correlated subquery)
+        where: Optional SQL condition restricting the rows to update
+        batch_size: Rows updated and committed per batch
+    """
+
+    name: str
+    table: Table
+    values: dict[str, Any]
+    where: Any = None
+    batch_size: int = DEFAULT_BATCH_SIZE
+    rows_done: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.name = progress_name(self.name)
+
+
+def progress_name(name: str) -> str:
+    """Fit a backfill name in the progress table, keeping long names distinct.
+
+    Names over :data:`MAX_BACKFILL_NAME` characters are cut and end with a hash of
+    the full name, so the same long name always maps to the same resume key.
+    """
+    if len(name) <= MAX_BACKFILL_NAME:
+        return name
+    digest = hashlib.blake2b(name.encode(), digest_size=8).hexdigest()
+    return f"{name[: MAX_BACKFILL_NAME - len(digest) - 1]}~{digest}"
+
+
+@dataclass
+class BackfillProgress:
+    """Progress reported after every committed batch."""
+
+    name: str
+    rows_done: int
+    rows_total: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_done / self.seconds if self.seconds else 0.0
+
+    def describe(self) -> str:
+        percent = 100 * self.rows_done / self.rows_total if self.rows_total else 100.0
+        return (
+            f"{self.name}: {self.rows_done}/{self.rows_total} rows ({percent:.1f}%, "
+            f"{self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def run_backfill(
+    engine: Engine,
+    backfill: Backfill,
+    *,
+    report: Callable[[BackfillProgress], None] | None = None,
+) -> int:
+    """
+    Run a backfill in batches, resuming after the last committed batch.
+
+    Each batch selects the next ``batch_size`` primary keys after the stored
+    position, updates those rows and records the new position in the same
+    transaction. Locks are therefore held for one batch at a time, and an
+    interrupted run continues where it stopped when called again with the same
+    ``backfill.name``.
+
+    Returns:
+        The number of rows updated by this call
+    """
+    table = backfill.table
+    pk = next(iter(table.primary_key.columns))
+    condition = backfill.where if backfill.where is not None else true()
+    with engine.begin() as connection:
+        PROGRESS_TABLE.create(connection, checkfirst=True)
+        state = connection.execute(
+            select(PROGRESS_TABLE).where(PROGRESS_TABLE.c.name == backfill.name)
+        ).first()
+        if state is None:
+            connection.execute(PROGRESS_TABLE.insert().values(name=backfill.name))
+        elif state.finished:
+            return 0
+        last_key = _key_value(pk, state.last_key) if state and state.last_key else None
+        rows_before = state.rows_done if state else 0
+        remaining = select(func.count()).select_from(table).where(condition)
+        if last_key is not None:
+            remaining = remaining.where(pk > last_key)
+        rows_total = rows_before + connection.execute(remaining).scalar_one()
+
+    started = time.perf_counter()
+    updated = 0
+    while True:
+        with engine.begin() as connection:
+            batch = select(pk).where(condition).order_by(pk).limit(backfill.batch_size)
+            if last_key is not None:
+                batch = batch.where(pk > last_key)
+            keys = connection.execute(batch).scalars().all()
+            if keys:
+                connection.execute(update(table).where(pk.in_(keys)).values(backfill.values))
+                last_key = keys[-1]
+                updated += len(keys)
+            connection.execute(
+                PROGRESS_TABLE.update()
+                .where(PROGRESS_TABLE.c.name == backfill.name)
+                .values(
+                    last_key=None if last_key is None else str(last_key),
+                    rows_done=rows_before + updated,
+                    finished=int(len(keys) < backfill.batch_size),
+                )
+            )
+        if report is not None:
+            report(
+                BackfillProgress(
+                    backfill.name, rows_before + updated, rows_total, time.perf_counter() - started
+                )
+            )
+        if len(keys) < backfill.batch_size:
+            backfill.rows_done = rows_before + updated
+            return updated
+
+
+def _key_value(column: Column, stored: str) -> Any:
+    """Convert a stored batch position back to the primary key's type."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return stored
+    if python_type in (UUID, int):
+        return python_type(stored)
+    return stored
+
+
+def backfill_status(engine: Engine) -> list[dict[str, Any]]:
+    """Return the stored progress of every backfill."""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(PROGRESS_TABLE.name):
+            return []
+        rows = connection.execute(select(PROGRESS_TABLE).order_by(PROGRESS_TABLE.c.name))
+        return [dict(row._mapping) for row in rows]
+
+
+def _parse_renames(values: Sequence[str]) -> dict[tuple[str, str], str]:
+    renames = {}
+    for value in values:
+        source, _, new = value.partition("=")
+        table, _, old = source.partition(".")
+        if not (table and old and new):
+            raise SystemExit(f"Invalid --rename {value!r}; use TABLE.OLD=NEW")
+        renames[(table, old)] = new
+    return renames
+
+
+def main(argv: Sequence[str] | None = None):
+    """Entry point for the migrate-db script."""
+    from database import get_engine
+
+    parser = argparse.ArgumentParser(description="Diff, migrate and backfill the database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Print the DDL that apply would run")
+    plan.add_argument("--dialect", "-d", choices=list(DIALECTS), help="Render for this dialect")
+    apply = commands.add_parser("apply", help="Apply the schema changes")
+    apply.add_argument("--allow-drop", action="store_true", help="Also drop extra objects")
+    apply.add_argument(
+        "--not-null",
+        action="store_true",
+        help="Only add the NOT NULL constraints (run after the backfills)",
+    )
+    for command in (plan, apply):
+        command.add_argument("--rename", action="append", default=[], metavar="TABLE.OLD=NEW")
+
+    backfill = commands.add_parser("backfill", help="Update a table in resumable batches")
+    backfill.add_argument("table")
+    backfill.add_argument(
+        "--set", action="append", required=True, metavar="COLUMN=SQL", dest="values"
+    )
+    backfill.add_argument("--where", help="SQL condition selecting the rows to update")
+    backfill.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    backfill.add_argument("--name", help="Progress key (default: derived from the arguments)")
+    commands.add_parser("status", help="Show backfill progress")
+
+    args = parser.parse_args(argv)
+    engine = get_engine()
+
+    if args.command == "status":
+        for row in backfill_status(engine):
+            state = "done" if row["finished"] else f"at {row['last_key']}"
+            print(f"{row['name']}: {row['rows_done']} rows, {state}")
+        return
+
+    if args.command == "backfill":
+        metadata = _model_metadata()
+        if args.table not in metadata.tables:
+            raise SystemExit(f"Unknown table: {args.table}")
+        values = {}
+        for assignment in args.values:
+            column, _, expression = assignment.partition("=")
+            values[column.strip()] = text(expression)
+        where = f" where {args.where}" if args.where else ""
+        name = args.name or f"{args.table}: {'; '.join(args.values)}{where}"
+        job = Backfill(
+            name=name,
+            table=metadata.tables[args.table],
+            values=values,
+            where=text(args.where) if args.where else None,
+            batch_size=args.batch_size,
+        )
+        run_backfill(engine, job, report=lambda progress: print(progress.describe()))
+        return
+
+    with engine.connect() as connection:
+        operations = diff_schema(connection, renames=_parse_renames(args.rename))
+    if args.command == "plan":
+        dialect = DIALECTS[args.dialect] if args.dialect else engine.dialect
+        print(render_plan(operations, dialect) or "-- Schema is up to date")
+        return
+
+    if args.not_null:
+        operations = [operation for operation in operations if operation.kind == "set_not_null"]
+    else:
+        operations = [operation for operation in operations if operation.kind != "set_not_null"]
+    applied = apply_operations(engine, operations, allow_drop=args.allow_drop)
+    print(f"✅ Applied {len(applied)} operation(s)")
+
+
+if __name__ == "__main__":
+    main()
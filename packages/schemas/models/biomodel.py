@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Optional, Union
 from uuid import UUID, uuid4
 
 from sqlmodel import Field, Relationship, SQLModel
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 if TYPE_CHECKING:
     from .tumor import Tumor
@@ -29,6 +29,11 @@ class Biomodel(SQLModel, table=True):
     """
     
     __tablename__ = "biomodel"
+    # Biomodels are listed per tumor by creation date; the composite index also
+    # serves plain tumor_biobank_code lookups.
+    __table_args__ = (
+        Index("ix_biomodel_tumor_biobank_code_creation_date", "tumor_biobank_code", "creation_date"),
+    )
     
     # Primary key
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -49,6 +54,7 @@ class Biomodel(SQLModel, table=True):
     
     parent_trial_id: Optional[UUID] = Field(
         default=None,
+        index=True,
         sa_column_args=[ForeignKey("trial.id", name="fk_biomodel_parent_trial_id", use_alter=True)],
         description="FK to parent Trial"
     )
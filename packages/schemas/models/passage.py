@@ -32,10 +32,11 @@ class Passage(SQLModel, table=True):
     description: Optional[str] = Field(default=None)  # text field
     
     # Foreign keys (required - 1:0..2 relationship with Biomodel)
-    biomodel_id: UUID = Field(foreign_key="biomodel.id", description="FK to Biomodel")
+    biomodel_id: UUID = Field(foreign_key="biomodel.id", index=True, description="FK to Biomodel")
     
     parent_trial_id: Optional[UUID] = Field(
         default=None,
+        index=True,
         sa_column_args=[ForeignKey("trial.id", name="fk_passage_parent_trial_id", use_alter=True)],
         description="FK to parent Trial"
     )
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Optional, Union
 from uuid import UUID, uuid4
 
 from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import Index
 
 if TYPE_CHECKING:
     from .trial import PDXTrial
@@ -31,7 +32,7 @@ class Implant(SQLModel, table=True):
     implant_location: Optional[str] = Field(default=None, max_length=100)
     type: Optional[str] = Field(default=None, max_length=50)
     # Foreign keys (required - 1:N relationship with Mouse)
-    mouse_id: UUID = Field(foreign_key="mouse.id", description="FK to Mouse")
+    mouse_id: UUID = Field(foreign_key="mouse.id", index=True, description="FK to Mouse")
     
     # Relationships
     mouse: Optional["Mouse"] = Relationship(back_populates="implants")
@@ -50,6 +51,9 @@ class Measure(SQLModel, table=True):
     """
     
     __tablename__ = "measure"
+    # Growth curves read an implant's measures in date order; the composite index
+    # also serves plain implant_id lookups.
+    __table_args__ = (Index("ix_measure_implant_id_measure_date", "implant_id", "measure_date"),)
     
     # Primary key
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -94,7 +98,7 @@ class Mouse(SQLModel, table=True):
     death_date: Union[date, None] = Field(default=None)
     
     # Foreign keys (required - 1:1 relationship with PDXTrial)
-    pdx_trial_id: UUID = Field(foreign_key="pdx_trial.id", description="FK to PDXTrial")
+    pdx_trial_id: UUID = Field(foreign_key="pdx_trial.id", index=True, description="FK to PDXTrial")
     
     # Relationships
     pdx_trial: Optional["PDXTrial"] = Relationship(back_populates="mouse")
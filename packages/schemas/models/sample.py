@@ -38,6 +38,7 @@ class Sample(SQLModel, table=True):
     tumor_biobank_code: Optional[str] = Field(
         default=None, 
         foreign_key="tumor.biobank_code",
+        index=True,
         description="FK to Tumor"
     )
     
@@ -55,7 +55,7 @@ class Trial(SQLModel, table=True):
     biobank_arrival_date: Union[date, None] = Field(default=None)
     
     # Foreign keys (required - 1:N relationship with Passage)
-    passage_id: UUID = Field(foreign_key="passage.id", description="FK to Passage")
+    passage_id: UUID = Field(foreign_key="passage.id", index=True, description="FK to Passage")
     
     # Relationships
     passage: Optional["Passage"] = Relationship(
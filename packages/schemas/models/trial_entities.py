@@ -33,7 +33,7 @@ class UsageRecord(SQLModel, table=True):
     record_date: Union[date, None] = Field(default=None)
     
     # Foreign keys (required - 1:0..N relationship with Trial)
-    trial_id: UUID = Field(foreign_key="trial.id", description="FK to Trial")
+    trial_id: UUID = Field(foreign_key="trial.id", index=True, description="FK to Trial")
     
     # Relationships
     trial: Optional["Trial"] = Relationship(back_populates="usage_records")
@@ -64,7 +64,7 @@ class Image(SQLModel, table=True):
     ap_review: Optional[bool] = Field(default=None)
     
     # Foreign keys (required - 1:0..N relationship with Trial)
-    trial_id: UUID = Field(foreign_key="trial.id", description="FK to Trial")
+    trial_id: UUID = Field(foreign_key="trial.id", index=True, description="FK to Trial")
     
     # Relationships
     trial: Optional["Trial"] = Relationship(back_populates="images")
@@ -93,7 +93,7 @@ class Cryopreservation(SQLModel, table=True):
     vial_count: Optional[int] = Field(default=None)
     
     # Foreign keys (required - 1:0..N relationship with Trial)
-    trial_id: UUID = Field(foreign_key="trial.id", description="FK to Trial")
+    trial_id: UUID = Field(foreign_key="trial.id", index=True, description="FK to Trial")
     
     # Relationships
     trial: Optional["Trial"] = Relationship(back_populates="cryopreservations")
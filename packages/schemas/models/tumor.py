@@ -47,7 +47,7 @@ class Tumor(SQLModel, table=True):
     operation_date: Union[date, None] = Field(default=None)
     
     # Foreign keys
-    patient_nhc: str = Field(foreign_key="patient.nhc", description="FK to Patient")
+    patient_nhc: str = Field(foreign_key="patient.nhc", index=True, description="FK to Patient")
     
     # Relationships
     patient: Optional["Patient"] = Relationship(back_populates="tumors")
@@ -0,0 +1,53 @@
+"""Check that hot foreign-key lookups are served by indexes."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlmodel import SQLModel
+
+import models  # noqa: F401
+from export_schema import DIALECTS, export_schema
+
+HOT_LOOKUPS = [
+    ("SELECT * FROM tumor WHERE patient_nhc = 'P'", "ix_tumor_patient_nhc"),
+    ("SELECT * FROM passage WHERE biomodel_id = 'x'", "ix_passage_biomodel_id"),
+    ("SELECT * FROM trial WHERE passage_id = 'x'", "ix_trial_passage_id"),
+    ("SELECT * FROM mouse WHERE pdx_trial_id = 'x'", "ix_mouse_pdx_trial_id"),
+    ("SELECT * FROM implant WHERE mouse_id = 'x'", "ix_implant_mouse_id"),
+    ("SELECT * FROM usage_record WHERE trial_id = 'x'", "ix_usage_record_trial_id"),
+    ("SELECT * FROM measure WHERE implant_id = 'x'", "ix_measure_implant_id_measure_date"),
+    (
+        "SELECT * FROM measure WHERE implant_id = 'x' ORDER BY measure_date",
+        "ix_measure_implant_id_measure_date",
+    ),
+    (
+        "SELECT * FROM biomodel WHERE tumor_biobank_code = 'T' ORDER BY creation_date",
+        "ix_biomodel_tumor_biobank_code_creation_date",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.mark.parametrize(("query", "index_name"), HOT_LOOKUPS)
+def test_hot_lookup_uses_index(connection, query, index_name):
+    plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {query}"))]
+    # A single index search, with no table scan and no extra sort step
+    assert len(plan) == 1
+    assert plan[0].startswith("SEARCH")
+    assert f"USING INDEX {index_name} " in plan[0]
+
+
+@pytest.mark.parametrize("dialect_name", sorted(DIALECTS))
+def test_export_schema_creates_indexes(dialect_name):
+    sql = export_schema(dialect_name)
+    assert "CREATE INDEX ix_trial_passage_id ON trial (passage_id);" in sql.replace("`", "")
+    assert (
+        "CREATE INDEX ix_measure_implant_id_measure_date ON measure (implant_id, measure_date);"
+        in sql.replace("`", "")
+    )
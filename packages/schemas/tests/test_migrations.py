@@ -0,0 +1,176 @@
+"""Check schema diffs, generated DDL and resumable backfills."""
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlmodel import SQLModel
+
+import migrations
+import models  # noqa: F401
+from export_schema import DIALECTS
+from migrations import (
+    MAX_BACKFILL_NAME,
+    Backfill,
+    Operation,
+    apply_operations,
+    backfill_status,
+    diff_schema,
+    progress_name,
+    render_plan,
+    run_backfill,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def test_up_to_date_database_has_no_operations(engine):
+    with engine.connect() as connection:
+        assert diff_schema(connection) == []
+
+
+def test_diff_and_apply_bring_an_old_database_up_to_date(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE facs"))
+        connection.execute(text("DROP INDEX ix_trial_passage_id"))
+        connection.execute(text("ALTER TABLE usage_record DROP COLUMN description"))
+        connection.execute(text("ALTER TABLE image ADD COLUMN legacy_code VARCHAR(10)"))
+
+    with engine.connect() as connection:
+        operations = diff_schema(connection)
+    assert [operation.describe() for operation in operations] == [
+        "add column usage_record.description",
+        "create table facs",
+        "create index trial.ix_trial_passage_id",
+        "drop column image.legacy_code",
+    ]
+    assert operations[-1].destructive
+
+    apply_operations(engine, operations, report=lambda _: None)
+    with engine.connect() as connection:
+        assert [operation.kind for operation in diff_schema(connection)] == ["drop_column"]
+    apply_operations(engine, operations[-1:], allow_drop=True, report=lambda _: None)
+    with engine.connect() as connection:
+        assert diff_schema(connection) == []
+
+
+class _ServerInspector:
+    """Report UNIQUE constraints as indexes, as PostgreSQL and MySQL inspectors do."""
+
+    def __init__(self, inspector):
+        self._inspector = inspector
+
+    def __getattr__(self, name):
+        return getattr(self._inspector, name)
+
+    def get_indexes(self, table_name):
+        indexes = list(self._inspector.get_indexes(table_name))
+        if table_name == "facs":
+            # PostgreSQL: the index behind the constraint, flagged as its duplicate.
+            indexes.append(
+                {
+                    "name": "facs_lc_trial_id_key",
+                    "column_names": ["lc_trial_id"],
+                    "unique": True,
+                    "duplicates_constraint": "facs_lc_trial_id_key",
+                }
+            )
+        if table_name == "trial_molecular_data":
+            # MySQL: a plain unique index named after the constraint.
+            indexes.append({"name": "trial_id", "column_names": ["trial_id"], "unique": True})
+        return indexes
+
+    def get_unique_constraints(self, table_name):
+        constraints = list(self._inspector.get_unique_constraints(table_name))
+        if table_name == "trial_molecular_data":
+            constraints.append({"name": "trial_id", "column_names": ["trial_id"]})
+        return constraints
+
+
+def test_unique_constraint_indexes_are_not_dropped(engine, monkeypatch):
+    monkeypatch.setattr(migrations, "inspect", lambda bind: _ServerInspector(inspect(bind)))
+    with engine.connect() as connection:
+        assert diff_schema(connection) == []
+
+
+def test_renames_become_rename_column(engine):
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE usage_record RENAME COLUMN record_type TO kind"))
+
+    renames = {("usage_record", "kind"): "record_type"}
+    with engine.connect() as connection:
+        operations = diff_schema(connection, renames=renames)
+    assert [operation.describe() for operation in operations] == [
+        "rename column usage_record.kind to record_type"
+    ]
+    apply_operations(engine, operations, report=lambda _: None)
+    columns = {column["name"] for column in inspect(engine).get_columns("usage_record")}
+    assert "record_type" in columns and "kind" not in columns
+
+
+def test_plan_uses_online_ddl_per_dialect(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_trial_passage_id"))
+    with engine.connect() as connection:
+        operations = diff_schema(connection)
+    column = SQLModel.metadata.tables["mouse"].c.pdx_trial_id
+    operations += [
+        Operation("add_column", "mouse", column),
+        Operation("set_not_null", "mouse", column),
+    ]
+
+    postgres = render_plan(operations, DIALECTS["postgres"])
+    assert "CREATE INDEX CONCURRENTLY ix_trial_passage_id ON trial (passage_id);" in postgres
+    assert "ALTER TABLE mouse ADD COLUMN pdx_trial_id UUID;" in postgres
+    assert "FOREIGN KEY(pdx_trial_id) REFERENCES pdx_trial (id)" in postgres
+    assert "ALTER TABLE mouse ALTER COLUMN pdx_trial_id SET NOT NULL;" in postgres
+
+    mysql = render_plan(operations, DIALECTS["mysql"])
+    assert "ALGORITHM=INPLACE LOCK=NONE;" in mysql
+    assert "ALTER TABLE mouse MODIFY COLUMN pdx_trial_id CHAR(32) NOT NULL;" in mysql
+
+
+def test_backfill_runs_in_batches_and_resumes(engine):
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO patient (nhc, sex) VALUES "
+                + ", ".join(f"('P{number:02d}', NULL)" for number in range(7))
+            )
+        )
+    table = SQLModel.metadata.tables["patient"]
+    progress = []
+
+    def stop_after_first_batch(update):
+        progress.append(update.rows_done)
+        if len(progress) == 1:
+            raise KeyboardInterrupt
+
+    backfill = Backfill("patient sex", table, {"sex": text("'unknown'")}, batch_size=3)
+    with pytest.raises(KeyboardInterrupt):
+        run_backfill(engine, backfill, report=stop_after_first_batch)
+    assert backfill_status(engine)[0]["rows_done"] == 3
+
+    assert run_backfill(engine, backfill, report=stop_after_first_batch) == 4
+    assert progress == [3, 6, 7]
+    with engine.connect() as connection:
+        assert set(connection.execute(select(table.c.sex)).scalars()) == {"unknown"}
+    assert backfill_status(engine) == [
+        {"name": "patient sex", "last_key": "P06", "rows_done": 7, "finished": 1}
+    ]
+    assert run_backfill(engine, backfill) == 0
+
+
+def test_long_backfill_names_are_shortened_consistently(engine):
+    table = SQLModel.metadata.tables["patient"]
+    where = " OR ".join(f"nhc = 'P{number:03d}'" for number in range(40))
+    backfill = Backfill(f"patient: sex='x' where {where}", table, {"sex": text("'x'")})
+    assert len(backfill.name) == MAX_BACKFILL_NAME
+    assert backfill.name == progress_name(f"patient: sex='x' where {where}")
+    assert backfill.name != progress_name(f"patient: sex='y' where {where}")
+
+    run_backfill(engine, backfill)
+    assert [row["name"] for row in backfill_status(engine)] == [backfill.name]